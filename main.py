@@ -4,30 +4,22 @@ import pygame
 # Import des autres programmes
 from src.programs.game import Game
 
-# Initialisation de pygame
-pygame.init()
-
-# Création et initialisation de la fenêtre
-screen_size = (1080, 720)  # Dimensions de la fenêtre
-screen = pygame.display.set_mode(screen_size, pygame.RESIZABLE)  # Création de la fenêtre
-
-# création de l'instance Game, il s'agit du conteneur du jeu
-game = Game(screen)
-game.update()
-
-# boucle permettant au jeu de fonctionner, boucle infinie sous condition
-while not game.do_quit:
+# les processus de résolution (ParallelSolver) importent ce fichier, le jeu ne doit être lancé que par le processus principal
+if __name__ == "__main__":
+    # Initialisation de pygame
+    pygame.init()
     
-    # Limitation à 60 images par seconde
-    pygame.time.Clock().tick(60)
-
-    # Si la souris est immobile, ne pas mettre à jour l'affichage du jeu
-    do_display = pygame.mouse.get_rel() != (0, 0)
-
-    # Mettre à jour le jeu
-    game.update(do_display)
-
-# fermeture de la fenêtre
-pygame.quit()
-# message console indiquant la fermeture de la fenêtre
-print("Program closed")
\ No newline at end of file
+    # Création et initialisation de la fenêtre
+    screen_size = (1080, 720)  # Dimensions de la fenêtre
+    screen = pygame.display.set_mode(screen_size, pygame.RESIZABLE)  # Création de la fenêtre
+    
+    # création de l'instance Game, il s'agit du conteneur du jeu
+    game = Game(screen)
+    
+    # boucle permettant au jeu de fonctionner, jusqu'à la fermeture de la fenêtre
+    game.run()
+    
+    # fermeture de la fenêtre
+    pygame.quit()
+    # message console indiquant la fermeture de la fenêtre
+    print("Program closed")
\ No newline at end of file
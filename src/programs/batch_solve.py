@@ -0,0 +1,239 @@
+# import des librairies
+import argparse
+import csv
+import json
+import sys
+import time
+
+# nos modules
+from src.programs.difficulty_rater import rate_grid
+from src.programs.grid import Grid
+from src.programs.puzzle_files import iter_puzzles
+from src.programs.solver import Solver
+
+# colonnes des résultats, dans l'ordre d'écriture (format csv)
+all_result_fields = ["name", "size", "status", "stop_reason", "solutions_count", "nodes", "time_ms", "rating", "technique", "solution"]
+
+
+def solve_puzzle(
+    name: str, puzzle: tuple[int, list[list[str]], list[list[str]]], engine: str, do_check_unicity: bool, do_rate: bool = False,
+    timeout: float = 0.0, max_nodes: int = 0, statistics_file = None
+) -> dict:
+    """
+    Résout une grille lue par iter_puzzles, sans interface
+    Renvoi le résultat : statut ("solved", "unsolvable", "unknown" si une limite a arrêté la résolution, ou "invalid"),
+    raison de l'arrêt, solution sur une ligne, noeuds et temps de résolution
+    :param do_check_unicity: compte aussi les solutions (limité à 2), permet de vérifier que la grille a une solution unique
+    :param do_rate: note aussi la difficulté de la grille (voir difficulty_rater), hors du temps de résolution
+    :param timeout: durée maximale (s) du comptage et de la résolution de la grille (0 = aucune limite)
+    :param max_nodes: nombre maximal de noeuds du comptage et de la résolution de la grille (0 = aucune limite)
+    :param statistics_file: fichier ouvert où les statistiques de la résolution (voir SolverStatistics) sont écrites,
+    une ligne JSON par grille (None = non écrites)
+    """
+    
+    grid_size, all_values, all_states = puzzle
+    
+    try:
+        grid = Grid(grid_size)
+        grid.set_content(all_values, all_states)
+    except (AssertionError, KeyError) as error:
+        return {"name": name, "size": grid_size, "status": "invalid", "error": str(error) or repr(error)}
+    
+    rating = rate_grid(grid.values, grid_size) if do_rate else None
+    
+    solver = Solver(grid, engine)
+    solutions_count = None
+    
+    starting_time = time.perf_counter()
+    
+    # limites communes au comptage et à la résolution
+    solver.set_limits(max_nodes, timeout)
+    
+    if do_check_unicity:
+        solutions_count = solver.count_solutions(2)
+    
+    # le comptage a prouvé que la grille n'a pas de solution : une résolution échouerait aussi, en autant de noeuds
+    is_solved = not solver.is_cancelled and solutions_count != 0 and solver.solve()
+    
+    executing_time = time.perf_counter() - starting_time
+    status = "solved" if is_solved else "unknown" if solver.stop_reason else "unsolvable"
+    
+    if statistics_file is not None:
+        statistics_file.write(json.dumps({
+            "name": name, "size": grid_size, "status": status, "engine": engine,
+            **solver.get_statistics(executing_time).to_dict()
+        }) + "\n")
+    
+    return {
+        "name": name,
+        "size": grid_size,
+        "status": status,
+        "stop_reason": solver.stop_reason or None,
+        "solutions_count": solutions_count if solutions_count != -1 else None,
+        "nodes": solver.nodes_count,
+        "time_ms": round(executing_time * 1000, 3),
+        "rating": rating.score if rating else None,
+        "technique": rating.hardest_technique if rating else None,
+        "solution": "".join(grid.symbols[code] for code in grid.values) if is_solved else None
+    }
+
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float:
+    """
+    Renvoi le centile "percentile" (entre 0 et 100) d'une liste de valeurs triées, méthode du rang le plus proche
+    """
+    
+    if not sorted_values:
+        return 0
+    
+    rank = max(round(percentile / 100 * len(sorted_values)), 1)
+    
+    return sorted_values[rank - 1]
+
+
+def print_report(all_latencies: list[float], all_status_counts: dict[str, int], nodes_count: int, executing_time: float):
+    """
+    Affiche le résumé de la résolution par lots sur la sortie d'erreur : débit, latences et noeuds
+    """
+    
+    all_latencies.sort()
+    puzzles_count = sum(all_status_counts.values())
+    timed_count = len(all_latencies)
+    
+    print(
+        f"\n{puzzles_count} puzzles "
+        f"({', '.join(f'{count} {status}' for status, count in all_status_counts.items())}) "
+        f"in {executing_time:.2f}s",
+        file=sys.stderr
+    )
+    print(f"throughput : {puzzles_count / executing_time if executing_time else 0:.1f} puzzles/s", file=sys.stderr)
+    print(
+        f"latency    : p50 {get_percentile(all_latencies, 50) * 1000:.3f} ms, "
+        f"p99 {get_percentile(all_latencies, 99) * 1000:.3f} ms, "
+        f"max {(all_latencies[-1] if all_latencies else 0) * 1000:.3f} ms",
+        file=sys.stderr
+    )
+    print(
+        f"nodes      : {nodes_count} total, {nodes_count / timed_count if timed_count else 0:.1f} per puzzle",
+        file=sys.stderr
+    )
+
+
+def batch_solve(
+    all_paths: list[str], output_file, output_format: str, engine: str, do_check_unicity: bool, do_rate: bool = False,
+    timeout: float = 0.0, max_nodes: int = 0, statistics_file = None
+) -> dict[str, int]:
+    """
+    Résout au fur et à mesure toutes les grilles des chemins "all_paths" et écrit chaque résultat dans "output_file"
+    Chaque grille est limitée à "timeout" secondes et "max_nodes" noeuds, ses statistiques sont écrites dans
+    "statistics_file" s'il est ouvert (voir solve_puzzle)
+    Renvoi le nombre de grilles par statut
+    """
+    
+    if output_format == "csv":
+        writer = csv.DictWriter(output_file, all_result_fields + ["error"])
+        writer.writeheader()
+        write_result = writer.writerow
+    else:
+        def write_result(result: dict):
+            output_file.write(json.dumps(result) + "\n")
+    
+    # latences (s) des grilles résolues ou sans solution
+    all_latencies = []
+    all_status_counts = {"solved": 0, "unsolvable": 0, "unknown": 0, "invalid": 0}
+    nodes_count = 0
+    
+    starting_time = time.perf_counter()
+    
+    for name, puzzle, error in iter_puzzles(all_paths):
+        if puzzle is None:
+            result = {"name": name, "status": "invalid", "error": error}
+        else:
+            result = solve_puzzle(name, puzzle, engine, do_check_unicity, do_rate, timeout, max_nodes, statistics_file)
+        
+        all_status_counts[result["status"]] += 1
+        
+        if result["status"] != "invalid":
+            all_latencies.append(result["time_ms"] / 1000)
+            nodes_count += result["nodes"]
+        
+        write_result(result)
+    
+    print_report(all_latencies, all_status_counts, nodes_count, time.perf_counter() - starting_time)
+    
+    return all_status_counts
+
+
+def main(all_arguments: list[str] = None):
+    """
+    Point d'entrée en ligne de commande : python -m src.programs.batch_solve [options] chemins...
+    """
+    
+    parser = argparse.ArgumentParser(
+        prog="python -m src.programs.batch_solve",
+        description="Solve sudoku puzzles in batch, without the graphical interface"
+    )
+    parser.add_argument(
+        "paths", nargs="+",
+        help='.sdk files, one-puzzle-per-line text files, directories (.sdk and .txt files) or "-" for standard input'
+    )
+    parser.add_argument("-o", "--output", help="output file (default : standard output)")
+    parser.add_argument(
+        "-f", "--format", choices=["jsonl", "csv"],
+        help='output format (default : deduced from the output file extension, "jsonl" otherwise)'
+    )
+    parser.add_argument("-e", "--engine", choices=["backtracking", "dancing_links"], default="backtracking")
+    parser.add_argument(
+        "-u", "--check-unicity", action="store_true",
+        help="also count the solutions (up to 2) to check that each puzzle has a unique solution"
+    )
+    parser.add_argument(
+        "-r", "--rate", action="store_true",
+        help="also rate the difficulty of each puzzle with human solving techniques (rating and hardest technique)"
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, default=0.0,
+        help='maximal time (s) per puzzle, the status of a puzzle stopped by a limit is "unknown" (default : no limit)'
+    )
+    parser.add_argument(
+        "-n", "--max-nodes", type=int, default=0,
+        help="maximal number of search nodes per puzzle (default : no limit)"
+    )
+    parser.add_argument(
+        "-s", "--stats-log",
+        help="file where the solver statistics of each puzzle are appended, one JSON object per line "
+             "(decisions, backtracks, max depth, propagation eliminations, time per phase...)"
+    )
+    arguments = parser.parse_args(all_arguments)
+    
+    if arguments.timeout < 0 or arguments.max_nodes < 0:
+        parser.error("the limits must be positive")
+    
+    output_format = arguments.format
+    if output_format is None:
+        output_format = "csv" if arguments.output and arguments.output.endswith(".csv") else "jsonl"
+    
+    statistics_file = open(arguments.stats_log, "a") if arguments.stats_log else None
+    
+    try:
+        if arguments.output:
+            with open(arguments.output, "w", newline="") as output_file:
+                all_status_counts = batch_solve(
+                    arguments.paths, output_file, output_format, arguments.engine, arguments.check_unicity, arguments.rate,
+                    arguments.timeout, arguments.max_nodes, statistics_file
+                )
+        else:
+            all_status_counts = batch_solve(
+                arguments.paths, sys.stdout, output_format, arguments.engine, arguments.check_unicity, arguments.rate,
+                arguments.timeout, arguments.max_nodes, statistics_file
+            )
+    finally:
+        if statistics_file is not None:
+            statistics_file.close()
+    
+    # code de sortie non nul si au moins une grille n'a pas pu être résolue
+    return 0 if all_status_counts["solved"] == sum(all_status_counts.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,573 @@
+# import des librairies
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# nos modules
+from src.programs.difficulty_rater import rate_grid
+from src.programs.grid import Grid
+from src.programs.parallel_solver import ParallelSolver
+from src.programs.puzzle_files import read_sdk_file
+from src.programs.solver import Solver
+from src.programs.test_errors import all_validation_levels, get_validation_level, set_validation_level
+from src.programs.transformations import get_random_variant
+
+
+def benchmark_solving(folder: str = "src/save_folder"):
+    """
+    Mesure le nombre de noeuds (cases posées ou retirées) par seconde lors de la résolution des grilles du dossier "folder"
+    Affiche aussi les décisions, retours en arrière et la profondeur maximale de la recherche (voir SolverStatistics)
+    """
+    
+    print(
+        f"{'grille':<24}{'taille':>8}{'noeuds':>10}{'temps (s)':>12}{'noeuds/s':>12}"
+        f"{'décisions':>11}{'retours':>9}{'profondeur':>12}"
+    )
+    
+    for filename in sorted(os.listdir(folder)):
+        if not filename.endswith(".sdk"):
+            continue
+        
+        grid_size, all_values, all_states = read_sdk_file(os.path.join(folder, filename))
+        
+        grid = Grid(grid_size)
+        grid.set_content(all_values, all_states)
+        solver = Solver(grid)
+        
+        result = solver.run("solve")
+        statistics = result.statistics
+        
+        assert result.status == "solved", f"The grid {filename} could not be solved"
+        
+        nodes_per_second = statistics.nodes_count / statistics.executing_time if statistics.executing_time else 0
+        print(
+            f"{filename:<24}{grid_size:>8}{statistics.nodes_count:>10}"
+            f"{statistics.executing_time:>12.3f}{nodes_per_second:>12.0f}"
+            f"{statistics.decisions_count:>11}{statistics.backtracks_count:>9}{statistics.max_depth:>12}"
+        )
+
+
+def benchmark_generation(repetitions: int = 5, seed: int = 0):
+    """
+    Mesure le temps de génération d'une grille à solution unique pour chaque taille et plusieurs difficultés
+    Affiche le temps moyen et maximal sur "repetitions" générations, et le nombre moyen de cases restantes
+    """
+    
+    random.seed(seed)
+    
+    print(f"{'taille':<8}{'difficulté':>12}{'symétrie':>10}{'moyenne (s)':>14}{'max (s)':>10}{'cases restantes':>18}")
+    
+    for grid_size in [4, 9, 16, 25]:
+        for difficulty in [0.3, 0.5, 0.7]:
+            for do_use_symmetry in [False, True]:
+                all_times = []
+                all_clues_counts = []
+                
+                for _ in range(repetitions):
+                    grid = Grid(grid_size)
+                    
+                    starting_time = time.perf_counter()
+                    removed_cells_count = Solver(grid).generate(difficulty, do_use_symmetry)
+                    all_times.append(time.perf_counter() - starting_time)
+                    all_clues_counts.append(grid.cells_count - removed_cells_count)
+                
+                print(
+                    f"{grid_size:<8}{difficulty:>12}{'oui' if do_use_symmetry else 'non':>10}"
+                    f"{sum(all_times) / repetitions:>14.3f}{max(all_times):>10.3f}{sum(all_clues_counts) / repetitions:>18.1f}"
+                )
+
+
+def benchmark_variants(variants_count: int = 2000, seed: int = 0):
+    """
+    Compare le temps d'obtention d'une nouvelle grille par transformation d'une grille existante (variante)
+    et par génération complète, pour chaque taille, à la difficulté maximale
+    """
+    
+    random.seed(seed)
+    
+    print(f"{'taille':<8}{'génération (ms)':>18}{'variante (µs)':>16}")
+    
+    for grid_size in [4, 9, 16, 25]:
+        grid = Grid(grid_size)
+        
+        starting_time = time.perf_counter()
+        Solver(grid).generate(0.7)
+        generation_time = time.perf_counter() - starting_time
+        
+        values = bytes(grid.values)
+        
+        starting_time = time.perf_counter()
+        for _ in range(variants_count):
+            get_random_variant(values, grid_size)
+        variant_time = (time.perf_counter() - starting_time) / variants_count
+        
+        print(f"{grid_size:<8}{generation_time * 1000:>18.2f}{variant_time * 1000000:>16.1f}")
+
+
+def benchmark_rating(repetitions: int = 20, seed: int = 0):
+    """
+    Mesure le temps de notation de la difficulté (voir difficulty_rater) de grilles générées, pour chaque taille
+    Affiche le temps moyen et maximal sur "repetitions" grilles, et la technique la plus difficile la plus fréquente
+    """
+    
+    random.seed(seed)
+    
+    print(f"{'taille':<8}{'moyenne (ms)':>14}{'max (ms)':>10}{'technique la plus fréquente':>30}")
+    
+    for grid_size in [4, 9, 16]:
+        all_times = []
+        all_techniques = []
+        
+        for _ in range(repetitions):
+            grid = Grid(grid_size)
+            Solver(grid).generate(0.7)
+            
+            starting_time = time.perf_counter()
+            rating = rate_grid(grid.values, grid_size)
+            all_times.append(time.perf_counter() - starting_time)
+            all_techniques.append(rating.hardest_technique)
+        
+        print(
+            f"{grid_size:<8}{sum(all_times) / repetitions * 1000:>14.2f}{max(all_times) * 1000:>10.2f}"
+            f"{max(all_techniques, key=all_techniques.count):>30}"
+        )
+
+
+def benchmark_grid_copy(copies_count: int = 500):
+    """
+    Mesure la mémoire occupée et le temps de copie d'une grille (Grid.copy), tel que stockée dans l'historique
+    """
+    
+    print(f"{'taille':>8}{'mémoire / grille (o)':>24}{'copie (µs)':>14}")
+    
+    for grid_size, filename in [(9, "Grille difficile.sdk"), (16, "Grille_16x16.sdk")]:
+        grid = Grid(grid_size)
+        grid.set_content(*read_sdk_file(os.path.join("src/save_folder", filename))[1:])
+        
+        # mémoire occupée par "copies_count" copies de la grille
+        tracemalloc.start()
+        all_copies = [grid.copy() for _ in range(copies_count)]
+        memory_per_grid = tracemalloc.get_traced_memory()[0] / copies_count
+        tracemalloc.stop()
+        
+        # temps moyen d'une copie
+        starting_time = time.perf_counter()
+        for _ in range(copies_count):
+            grid.copy()
+        copy_time = (time.perf_counter() - starting_time) / copies_count
+        
+        print(f"{grid_size:>8}{memory_per_grid:>24.0f}{copy_time * 1e6:>14.1f}")
+        
+        del all_copies
+
+
+def benchmark_validation(filename: str = "Grille difficile.sdk", repetitions: int = 50):
+    """
+    Mesure la part du temps de résolution passée dans les vérifications (test_errors) pour chaque niveau de validation
+    La part est calculée par rapport au temps de résolution sans aucune vérification (niveau "none")
+    """
+    
+    grid_size, all_values, all_states = read_sdk_file(os.path.join("src/save_folder", filename))
+    initial_validation_level = get_validation_level()
+    solving_times = dict()
+    
+    for validation_level in all_validation_levels:
+        set_validation_level(validation_level)
+        
+        # temps total de plusieurs résolutions, une seule résolution est trop courte pour être mesurée
+        solving_times[validation_level] = 0
+        for _ in range(repetitions):
+            grid = Grid(grid_size)
+            grid.set_content(all_values, all_states)
+            
+            # temps processeur, moins sensible aux autres processus que le temps réel
+            starting_time = time.process_time()
+            Solver(grid).solve()
+            solving_times[validation_level] += time.process_time() - starting_time
+    
+    set_validation_level(initial_validation_level)
+    
+    print(f"{'niveau':<14}{'temps (s)':>12}{'part vérifications':>22}")
+    
+    for validation_level, solving_time in solving_times.items():
+        validation_share = 1 - solving_times["none"] / solving_time
+        print(f"{validation_level:<14}{solving_time:>12.3f}{validation_share:>21.1%}")
+
+
+def benchmark_parallel_counting(workers_count: int = 0, seed: int = 0):
+    """
+    Compare la vérification d'unicité (comptage limité à 2 solutions) d'une grille 16x16 dont 70% des cases ont été retirées,
+    comme lors de la génération, dans le processus courant et répartie sur "workers_count" processus (0 = tous les processeurs)
+    """
+    
+    # grille 16x16 complète aléatoire, générée rapidement par les liens dansants
+    random.seed(seed)
+    grid = Grid(16)
+    Solver(grid, "dancing_links").solve(do_choice_randomly = True)
+    
+    for index in random.sample(range(grid.cells_count), round(0.7 * grid.cells_count)):
+        grid.set_cell_code_unchecked(index, 0)
+    
+    print(f"{'mode':<14}{'solutions':>10}{'noeuds':>10}{'temps (s)':>12}")
+    
+    for mode in ["séquentiel", "parallèle"]:
+        if mode == "séquentiel":
+            solver = Solver(grid.copy())
+        else:
+            solver = ParallelSolver(grid.copy(), workers_count=workers_count)
+            # démarrage des processus, exclu de la mesure
+            solver.get_executor().submit(int).result()
+        
+        starting_time = time.perf_counter()
+        solutions_count = solver.count_solutions(2)
+        executing_time = time.perf_counter() - starting_time
+        
+        solver.close()
+        
+        print(f"{mode:<14}{solutions_count:>10}{solver.nodes_count:>10}{executing_time:>12.3f}")
+
+
+def benchmark_conflicts(edits_count: int = 3000, seed: int = 0):
+    """
+    Mesure le temps moyen d'une modification de case (Grid.set_cell_value), mise à jour des conflits comprise,
+    lors d'une saisie aléatoire dans les grilles 9x9 et 16x16
+    """
+    
+    print(f"{'taille':>8}{'modification (µs)':>20}{'cases en conflit':>20}")
+    
+    for grid_size, filename in [(9, "Grille difficile.sdk"), (16, "Grille_16x16.sdk")]:
+        grid = Grid(grid_size)
+        grid.set_content(*read_sdk_file(os.path.join("src/save_folder", filename))[1:])
+        
+        random.seed(seed)
+        all_edits = [
+            ((random.randrange(grid_size), random.randrange(grid_size)), random.choice(grid.symbols))
+            for _ in range(edits_count)
+        ]
+        
+        starting_time = time.process_time()
+        for coordinates, value in all_edits:
+            grid.set_cell_value(coordinates, value)
+        edit_time = (time.process_time() - starting_time) / edits_count
+        
+        print(f"{grid_size:>8}{edit_time * 1e6:>20.1f}{len(grid.get_conflicting_cells()):>20}")
+
+
+def create_headless_game(screen_size: tuple[int, int] = (1080, 720)):
+    """
+    Créé une instance Game sans fenêtre ni son (pilotes SDL "dummy"), pour mesurer l'affichage
+    Les stocks de grilles sont vides et jamais complétés : aucun processus de génération en arrière-plan ne fausse
+    les mesures, et les stocks du joueur (dossier par défaut) ne sont ni lus ni modifiés
+    """
+    
+    # pilotes sans fenêtre ni son, à définir avant l'initialisation de pygame
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    
+    import pygame
+    from src.programs.game import Game
+    from src.programs.puzzle_pool import PuzzlePool
+    
+    pygame.init()
+    
+    # dossier vide, jamais créé : un stock de profondeur 0 n'écrit aucune grille
+    puzzle_pool = PuzzlePool(0, os.path.join(tempfile.gettempdir(), "sudoku_benchmark_puzzles"))
+    
+    return Game(pygame.display.set_mode(screen_size), puzzle_pool)
+
+
+def benchmark_rendering(frames_count: int = 200, seed: int = 0):
+    """
+    Mesure le temps d'affichage d'une image du menu de jeu sans fenêtre (pilote vidéo SDL "dummy") :
+    image entièrement redessinée, image sans modification (mouvement de la souris) et mise à jour d'une case (résolution affichée)
+    Indique aussi la part de la fenêtre envoyée à l'écran (pygame.display.flip / update) pour chaque image
+    """
+    
+    import pygame
+    
+    game = create_headless_game()
+    game.current_menu = "game"
+    
+    # surface envoyée à l'écran, en pixels, depuis la dernière mesure
+    all_updated_areas = [0]
+    display_flip, display_update = pygame.display.flip, pygame.display.update
+    
+    def flip():
+        all_updated_areas[0] += game.screen.get_width() * game.screen.get_height()
+        display_flip()
+    
+    def update(rects):
+        all_updated_areas[0] += sum(rect.width * rect.height for rect in rects)
+        display_update(rects)
+    
+    pygame.display.flip, pygame.display.update = flip, update
+    
+    print(f"{'taille':>8}{'affichage':>22}{'image (ms)':>14}{'part de la fenêtre':>20}")
+    
+    for grid_size, filename in [(9, "Grille difficile.sdk"), (16, "Grille_16x16.sdk")]:
+        game.sudoku.grid.reset_attributes(grid_size, *read_sdk_file(os.path.join("src/save_folder", filename))[1:])
+        game.graphism.update_grid_attributes(grid_size)
+        game.graphism.display_game_elements()
+        
+        random.seed(seed)
+        all_empty_cells = game.sudoku.grid.get_all_empty_cells()
+        all_cell_updates = [random.choice(all_empty_cells) for _ in range(frames_count)]
+        
+        def display_full_frame(frame: int):
+            game.graphism.invalidate_display()
+            game.graphism.display_game_elements()
+        
+        def display_cell_frame(frame: int):
+            # une valeur est posée puis retirée de la case, comme lors d'un retour en arrière de la résolution
+            coordinates = all_cell_updates[frame // 2]
+            game.sudoku.grid.set_cell_value_unchecked(coordinates, "0" if frame % 2 else "1")
+            game.graphism.display_cell_elements(coordinates)
+        
+        for display_name, display_frame in [
+            ("complet", display_full_frame),
+            ("sans modification", lambda frame: game.graphism.display_game_elements()),
+            ("une case", display_cell_frame)
+        ]:
+            all_updated_areas[0] = 0
+            
+            starting_time = time.process_time()
+            for frame in range(frames_count):
+                display_frame(frame)
+            frame_time = (time.process_time() - starting_time) / frames_count
+            
+            updated_share = all_updated_areas[0] / frames_count / (game.screen.get_width() * game.screen.get_height())
+            print(f"{grid_size:>8}{display_name:>22}{frame_time * 1000:>14.3f}{updated_share:>20.2%}")
+    
+    pygame.display.flip, pygame.display.update = display_flip, display_update
+    pygame.quit()
+
+
+def benchmark_resizing(steps_count: int = 20):
+    """
+    Mesure le temps de mise à jour des images (Graphism.update_rect) lors du redimensionnement de la fenêtre,
+    pour des dimensions jamais affichées puis pour des dimensions dont les images sont dans le cache
+    """
+    
+    import pygame
+    
+    game = create_headless_game()
+    image_cache = game.graphism.image_cache
+    
+    # redimensionnement progressif, comme lorsque l'utilisateur tire le bord de la fenêtre
+    all_screen_sizes = [(1080 + step * 6, 720 + step * 4) for step in range(steps_count)]
+    
+    print(f"{'dimensions':<20}{'mise à jour (ms)':>18}{'images calculées':>18}{'cache (Mo)':>12}")
+    
+    # retour en arrière sur les dernières dimensions, dont les images sont encore dans le cache
+    for sizes_name, all_tested_sizes in [("nouvelles", all_screen_sizes), ("déjà affichées", all_screen_sizes[:-5:-1])]:
+        misses_count = image_cache.misses_count
+        
+        starting_time = time.process_time()
+        for screen_size in all_tested_sizes:
+            game.screen = game.graphism.screen = pygame.display.set_mode(screen_size)
+            game.graphism.update_rect()
+        update_time = (time.process_time() - starting_time) / len(all_tested_sizes)
+        
+        print(
+            f"{sizes_name:<20}{update_time * 1000:>18.3f}{image_cache.misses_count - misses_count:>18}"
+            f"{image_cache.scaled_bytes / 1024 ** 2:>12.1f}"
+        )
+    
+    pygame.quit()
+
+
+def benchmark_idle(duration: int = 3000):
+    """
+    Mesure l'utilisation du processeur par la boucle principale (Game.run) pendant "duration" ms, sans fenêtre :
+    fenêtre ouverte sans action de l'utilisateur, puis avec un évènement toutes les millisecondes (souris déplacée en continu)
+    """
+    
+    import pygame
+    
+    game = create_headless_game()
+    game.current_menu = "game"
+    
+    # compte les mises à jour du jeu effectuées par la boucle principale
+    all_updates_counts = [0]
+    game_update = game.update
+    
+    def update(all_events: list, do_display: bool = True):
+        all_updates_counts[0] += 1
+        game_update(all_events, do_display)
+    
+    game.update = update
+    
+    print(f"{'évènements':<22}{'processeur':>12}{'mises à jour / s':>18}")
+    
+    for events_name, events_interval in [("aucun", 0), ("un par milliseconde", 1)]:
+        game.do_quit = False
+        all_updates_counts[0] = 0
+        
+        # évènements réguliers, puis fermeture de la fenêtre après "duration" ms
+        pygame.time.set_timer(pygame.USEREVENT, events_interval)
+        pygame.time.set_timer(pygame.QUIT, duration, 1)
+        
+        starting_time, starting_process_time = time.perf_counter(), time.process_time()
+        game.run()
+        executing_time = time.perf_counter() - starting_time
+        process_share = (time.process_time() - starting_process_time) / executing_time
+        
+        pygame.time.set_timer(pygame.USEREVENT, 0)
+        print(f"{events_name:<22}{process_share:>12.1%}{all_updates_counts[0] / executing_time:>18.1f}")
+    
+    pygame.quit()
+
+
+def benchmark_solving_display(
+    puzzle: str = "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9"
+):
+    """
+    Mesure la vitesse de la résolution affichée, sans fenêtre : sans affichage, en affichant chaque case modifiée
+    (ancien affichage), puis par le calcul en arrière-plan dont la grille est affichée au plus 30 fois par seconde
+    :param puzzle: grille 9x9 sur une ligne ("." = case vide), demandant beaucoup de noeuds pour être mesurable
+    """
+    
+    import src.programs.sudoku
+    
+    all_values = [[puzzle[x * 9 + y].replace(".", "0") for y in range(9)] for x in range(9)]
+    all_states = [["unlocked" if value == "0" else "superlocked" for value in line] for line in all_values]
+    
+    game = create_headless_game()
+    game.current_menu = "game"
+    sudoku = game.sudoku
+    # pas de message à la fin de la résolution
+    src.programs.sudoku.showinfo = lambda *arguments: None
+    
+    print(f"{'affichage':<22}{'temps (s)':>12}{'noeuds/s':>12}{'images':>10}")
+    
+    for display_name in ["aucun", "chaque case", "30 images / s"]:
+        sudoku.grid.set_content(all_values, all_states)
+        game.graphism.display_game_elements()
+        
+        # compte les images affichées pendant la résolution
+        all_frames_counts = [0]
+        end_display = game.graphism.end_display
+        
+        def count_frame():
+            all_frames_counts[0] += 1
+            end_display()
+        
+        game.graphism.end_display = count_frame
+        starting_time = time.perf_counter()
+        
+        if display_name == "aucun":
+            solver = Solver(sudoku.grid)
+            solver.solve()
+            nodes_count = solver.nodes_count
+        
+        elif display_name == "chaque case":
+            with sudoku.get_solver(True) as solver:
+                solver.solve()
+                nodes_count = solver.nodes_count
+        
+        else:
+            sudoku.solve_grid(True)
+            worker = sudoku.worker
+            
+            # boucle principale du jeu, limitée à "frame_rate" images par seconde pendant le calcul
+            # (sans fenêtre, la fenêtre n'a jamais le focus : l'affichage est appelé directement)
+            clock = time.perf_counter()
+            while sudoku.worker is not None:
+                sudoku.update_worker()
+                game.graphism.display_game_elements()
+                clock += 1 / game.frame_rate
+                time.sleep(max(clock - time.perf_counter(), 0))
+            
+            nodes_count = worker.solver.nodes_count
+        
+        executing_time = time.perf_counter() - starting_time
+        game.graphism.end_display = end_display
+        
+        print(f"{display_name:<22}{executing_time:>12.3f}{nodes_count / executing_time:>12.0f}{all_frames_counts[0]:>10}")
+    
+    game.do_quit = True
+
+
+# programme exécuté dans un nouveau processus par benchmark_startup : affiche la première image du jeu, sans fenêtre,
+# en utilisant le cache des images du dossier passé en argument, puis écrit le temps écoulé et les statistiques du cache
+startup_code = """
+import time
+starting_time = time.perf_counter()
+
+import sys
+import src.programs.graphism
+src.programs.graphism.textures_cache_folder = sys.argv[1]
+from src.programs.benchmark import create_headless_game
+
+game = create_headless_game()
+game.graphism.display_start_elements()
+first_frame_time = time.perf_counter() - starting_time
+
+game.graphism.load_menu("game")
+game.graphism.load_menu("options")
+all_menus_time = time.perf_counter() - starting_time
+
+image_cache = game.graphism.image_cache
+print(first_frame_time, all_menus_time, image_cache.disk_hits_count, image_cache.misses_count)
+"""
+
+
+def benchmark_startup(repetitions: int = 3):
+    """
+    Mesure le temps d'affichage de la première image (menu de démarrage) d'un nouveau processus, sans fenêtre,
+    puis le temps de chargement des autres menus, avec le cache des images sur le disque vide (démarrage à froid)
+    puis rempli par le démarrage précédent (démarrage à chaud). Le meilleur temps des "repetitions" démarrages est gardé
+    """
+    
+    print(f"{'démarrage':<12}{'première image (ms)':>22}{'tous les menus (ms)':>22}{'lues':>8}{'calculées':>12}")
+    
+    for startup_name in ["à froid", "à chaud"]:
+        all_results = []
+        
+        for _ in range(repetitions):
+            with tempfile.TemporaryDirectory() as cache_folder:
+                # le démarrage à chaud utilise le cache rempli par un premier démarrage
+                if startup_name == "à chaud":
+                    subprocess.run([sys.executable, "-c", startup_code, cache_folder], capture_output=True, check=True)
+                
+                output = subprocess.run(
+                    [sys.executable, "-c", startup_code, cache_folder], capture_output=True, check=True, text=True
+                ).stdout
+            
+            first_frame_time, all_menus_time, disk_hits_count, misses_count = output.split()[-4:]
+            all_results.append((float(first_frame_time), float(all_menus_time), int(disk_hits_count), int(misses_count)))
+        
+        first_frame_time, all_menus_time, disk_hits_count, misses_count = min(all_results)
+        print(
+            f"{startup_name:<12}{first_frame_time * 1000:>22.1f}{all_menus_time * 1000:>22.1f}"
+            f"{disk_hits_count:>8}{misses_count:>12}"
+        )
+
+
+# liste des mesures disponibles, nom -> fonction
+all_benchmarks = {
+    "solving": benchmark_solving,
+    "generation": benchmark_generation,
+    "variants": benchmark_variants,
+    "rating": benchmark_rating,
+    "grid_copy": benchmark_grid_copy,
+    "validation": benchmark_validation,
+    "conflicts": benchmark_conflicts,
+    "parallel_counting": benchmark_parallel_counting,
+    "rendering": benchmark_rendering,
+    "resizing": benchmark_resizing,
+    "startup": benchmark_startup,
+    "idle": benchmark_idle,
+    "solving_display": benchmark_solving_display
+}
+
+
+if __name__ == "__main__":
+    # exécute les mesures passées en argument, ou toutes si aucune n'est spécifiée
+    for benchmark_name in sys.argv[1:] or all_benchmarks:
+        print(f"\n== {benchmark_name} ==")
+        all_benchmarks[benchmark_name]()
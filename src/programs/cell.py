@@ -2,46 +2,46 @@ from src.programs.test_errors import test_errors
 
 class Cell:
     """
-    La classe Cell contient les données relatives aux cases (valeur, état, etc...)
+    La classe Cell est une vue sur une case de la grille (valeur, état, etc...)
+    Les données sont stockées dans la grille, la vue ne contient que la grille et les coordonnées de la case
     """
     
-    def __init__(self, value: str, state: str, sudoku_size: int):
+    __slots__ = ("grid", "coordinates")
+    
+    def __init__(self, grid, coordinates: tuple[int, int]):
         
         # Test préconditions
-        test_errors(sudoku_size, value=value, state=state)
-        
-        self.value = value
-        self.state = state
-        self.sudoku_size = sudoku_size
+        test_errors(grid.size, coordinates=coordinates)
         
-        self.is_in_conflict = False
+        self.grid = grid
+        self.coordinates = coordinates
+    
+    @property
+    def value(self) -> str:
+        return self.grid.get_cell_value(self.coordinates)
+    
+    @property
+    def state(self) -> str:
+        return self.grid.get_cell_state(self.coordinates)
+    
+    @property
+    def sudoku_size(self) -> int:
+        return self.grid.size
+    
+    @property
+    def is_in_conflict(self) -> bool:
+        return self.grid.is_cell_in_conflict(self.coordinates)
     
     def set_value(self, value: str):
         """
         Met la valeur de la case à "value"
         """
         
-        # Test préconditions
-        test_errors(self.sudoku_size, value=value)
-        
-        self.value = value
-
+        self.grid.set_cell_value(self.coordinates, value)
+    
     def set_state(self, state: str):
         """
         Met l'état de la case à "state"
         """
         
-        # Test préconditions
-        test_errors(state=state)
-        
-        self.state = state
-        
-    def set_conflicting_state(self, conflicting_state: bool):
-        """
-        Met la variable "is_in_conflict" à "conflicting_state"
-        """
-        
-        # Test préconditions
-        test_errors(boolean=conflicting_state)
-        
-        self.is_in_conflict = conflicting_state
\ No newline at end of file
+        self.grid.set_cell_state(self.coordinates, state)
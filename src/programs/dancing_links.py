@@ -0,0 +1,292 @@
+# import des librairies
+import random
+
+# nombre de noeuds entre deux appels de la fonction d'arrêt (voir DancingLinks)
+stop_check_interval = 256
+
+
+class DancingLinks:
+    """
+    La classe "DancingLinks" résout une grille de sudoku en la transformant en un problème de couverture exacte
+    (algorithme X de Knuth, implémenté avec des "liens dansants")
+    Chaque ligne de la matrice correspond à une case et une valeur, chaque colonne à une contrainte :
+    case remplie, valeur présente sur la ligne, valeur présente sur la colonne, valeur présente dans le carré
+    Fonctionne pour toute taille de grille n² (4, 9, 16, ...)
+    """
+    
+    def __init__(self, size: int, values, do_choice_randomly: bool = False, stop_callback = None):
+        """
+        :param size: taille de la grille
+        :param values: codes des valeurs de la grille (0 = case vide, 1 à size = valeur), la case (x, y) se trouve à l'index "x * size + y"
+        :param do_choice_randomly: mélange l'ordre des candidats, permet de générer des grilles complètes aléatoires
+        :param stop_callback: fonction appelée tous les "stop_check_interval" noeuds avec le nombre de noeuds,
+        elle renvoi True si la recherche doit être arrêtée (None = aucune vérification)
+        """
+        
+        assert len(values) == size ** 2, f'The "values" argument must have a length of {size ** 2} (length : {len(values)})'
+        
+        self.size = size
+        self.square_size = int(size ** 0.5)
+        self.values = bytes(values)
+        self.stop_callback = stop_callback
+        
+        # nombre de lignes de la matrice choisies pendant la recherche (noeuds de l'arbre de recherche)
+        self.nodes_count = 0
+        
+        # indique si les valeurs déjà présentes dans la grille sont incompatibles entre elles
+        self.is_contradictory = False
+        
+        self.build_matrix(do_choice_randomly)
+    
+    def get_constraints(self, index: int, code: int) -> tuple[int, int, int, int]:
+        """
+        Renvoi les numéros des 4 contraintes satisfaites en plaçant la valeur "code" dans la case d'index "index"
+        """
+        
+        x, y = divmod(index, self.size)
+        square = (x // self.square_size) * self.square_size + y // self.square_size
+        value = code - 1
+        cells_count = self.size ** 2
+        
+        return (
+            index,
+            cells_count + x * self.size + value,
+            cells_count * 2 + y * self.size + value,
+            cells_count * 3 + square * self.size + value
+        )
+    
+    def build_matrix(self, do_choice_randomly: bool):
+        """
+        Construit la matrice creuse des liens dansants
+        Les contraintes déjà satisfaites par les valeurs de la grille ne sont pas ajoutées,
+        et seuls les candidats compatibles avec ces valeurs sont ajoutés comme lignes
+        """
+        
+        # contraintes satisfaites par les valeurs déjà présentes dans la grille
+        satisfied_constraints = set()
+        
+        for index, code in enumerate(self.values):
+            if not code:
+                continue
+            
+            for constraint in self.get_constraints(index, code):
+                # deux valeurs identiques dans un même groupe, la grille n'a pas de solution
+                if constraint in satisfied_constraints:
+                    self.is_contradictory = True
+                
+                satisfied_constraints.add(constraint)
+        
+        # lignes de la matrice : (index de la case, code de la valeur, contraintes satisfaites)
+        all_rows = []
+        
+        for index, code in enumerate(self.values):
+            if code:
+                continue
+            
+            for candidate in range(1, self.size + 1):
+                constraints = self.get_constraints(index, candidate)
+                
+                if not satisfied_constraints.intersection(constraints):
+                    all_rows.append((index, candidate, constraints))
+        
+        if do_choice_randomly:
+            random.shuffle(all_rows)
+        
+        # numéro de colonne (à partir de 1, 0 est la racine) de chaque contrainte restant à satisfaire
+        columns = dict()
+        for constraint in range(4 * self.size ** 2):
+            if constraint not in satisfied_constraints:
+                columns[constraint] = len(columns) + 1
+        
+        columns_count = len(columns)
+        
+        # liens gauche, droite, haut, bas, colonne de chaque noeud, les noeuds 0 à columns_count sont la racine et les en-têtes de colonnes
+        self.left = [node - 1 for node in range(columns_count + 1)]
+        self.right = [node + 1 for node in range(columns_count + 1)]
+        self.left[0] = columns_count
+        self.right[columns_count] = 0
+        self.up = list(range(columns_count + 1))
+        self.down = list(range(columns_count + 1))
+        self.column = list(range(columns_count + 1))
+        # nombre de noeuds dans chaque colonne
+        self.column_size = [0] * (columns_count + 1)
+        # ligne de la matrice de chaque noeud (None pour les en-têtes)
+        self.row = [None] * (columns_count + 1)
+        
+        self.all_rows = all_rows
+        
+        for row_number, (index, code, constraints) in enumerate(all_rows):
+            first_node = len(self.left)
+            
+            for position, constraint in enumerate(constraints):
+                column = columns[constraint]
+                node = first_node + position
+                
+                # insertion horizontale, la ligne est circulaire
+                self.left.append(first_node + (position - 1) % 4)
+                self.right.append(first_node + (position + 1) % 4)
+                
+                # insertion verticale en bas de la colonne
+                self.up.append(self.up[column])
+                self.down.append(column)
+                self.down[self.up[column]] = node
+                self.up[column] = node
+                
+                self.column.append(column)
+                self.row.append(row_number)
+                self.column_size[column] += 1
+    
+    def search(self):
+        """
+        Générateur itératif (pile explicite) renvoyant chaque solution sous forme de liste de numéros de lignes de la matrice
+        S'arrête sans erreur si "stop_callback" le demande, la matrice n'est alors plus utilisable
+        """
+        
+        if self.is_contradictory:
+            return
+        
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column_of, column_size, row_of = self.column, self.column_size, self.row
+        
+        def cover(column: int):
+            right[left[column]] = right[column]
+            left[right[column]] = left[column]
+            
+            i = down[column]
+            while i != column:
+                j = right[i]
+                while j != i:
+                    down[up[j]] = down[j]
+                    up[down[j]] = up[j]
+                    column_size[column_of[j]] -= 1
+                    j = right[j]
+                i = down[i]
+        
+        def uncover(column: int):
+            i = up[column]
+            while i != column:
+                j = left[i]
+                while j != i:
+                    column_size[column_of[j]] += 1
+                    down[up[j]] = j
+                    up[down[j]] = j
+                    j = left[j]
+                i = up[i]
+            
+            right[left[column]] = column
+            left[right[column]] = column
+        
+        def select(node: int):
+            # choisit la ligne du noeud "node" : couvre les autres colonnes de la ligne
+            stack.append(node)
+            self.nodes_count += 1
+            
+            j = right[node]
+            while j != node:
+                cover(column_of[j])
+                j = right[j]
+        
+        # noeuds choisis à chaque niveau de la recherche
+        stack = []
+        # nombre de noeuds du prochain appel de la fonction d'arrêt
+        next_stop_check = stop_check_interval
+        
+        while True:
+            # arrêt demandé : la recherche se termine sans renvoyer d'autre solution
+            if self.stop_callback is not None and self.nodes_count >= next_stop_check:
+                next_stop_check = self.nodes_count + stop_check_interval
+                
+                if self.stop_callback(self.nodes_count):
+                    return
+            
+            do_backtrack = False
+            
+            # toutes les contraintes sont satisfaites : une solution est trouvée
+            if right[0] == 0:
+                yield [row_of[node] for node in stack]
+                do_backtrack = True
+            
+            else:
+                # choix de la colonne ayant le moins de noeuds
+                best_column = column = right[0]
+                while column:
+                    if column_size[column] < column_size[best_column]:
+                        best_column = column
+                    column = right[column]
+                
+                cover(best_column)
+                
+                if down[best_column] == best_column:
+                    # aucune ligne ne peut satisfaire cette contrainte
+                    uncover(best_column)
+                    do_backtrack = True
+                else:
+                    select(down[best_column])
+            
+            # retour en arrière jusqu'à trouver une ligne non essayée
+            while do_backtrack:
+                if not stack:
+                    return
+                
+                node = stack.pop()
+                
+                j = left[node]
+                while j != node:
+                    uncover(column_of[j])
+                    j = left[j]
+                
+                node = down[node]
+                
+                # toutes les lignes de la colonne ont été essayées
+                if node == column_of[node]:
+                    uncover(node)
+                else:
+                    select(node)
+                    do_backtrack = False
+    
+    def get_solution_values(self, solution_rows: list[int]) -> bytearray:
+        """
+        Renvoi les codes des valeurs de la grille complétée par la solution "solution_rows"
+        """
+        
+        values = bytearray(self.values)
+        
+        for row_number in solution_rows:
+            index, code, _ = self.all_rows[row_number]
+            values[index] = code
+        
+        return values
+    
+    def solve(self) -> bytearray | None:
+        """
+        Renvoi les codes des valeurs de la première solution trouvée, ou None si la grille n'a pas de solution
+        """
+        
+        for solution_rows in self.search():
+            return self.get_solution_values(solution_rows)
+        
+        return None
+    
+    def count_solutions(self, limit: int = 0) -> int:
+        """
+        Compte les solutions de la grille
+        :param limit: arrête le comptage dès que "limit" solutions ont été trouvées (0 = aucune limite)
+        """
+        
+        solutions_count = 0
+        
+        for _ in self.search():
+            solutions_count += 1
+            
+            if solutions_count == limit:
+                break
+        
+        return solutions_count
+    
+    def get_all_solutions(self):
+        """
+        Générateur renvoyant les codes des valeurs de chaque solution de la grille
+        """
+        
+        for solution_rows in self.search():
+            yield self.get_solution_values(solution_rows)
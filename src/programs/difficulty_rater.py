@@ -0,0 +1,342 @@
+# import des librairies
+from itertools import combinations
+
+# nos modules
+from src.programs.test_errors import test_errors
+from src.programs.units import get_unit_tables
+
+# techniques de résolution, de la plus simple à la plus difficile, et leur note (échelle proche de Sudoku Explainer)
+# "trial_and_error" : aucune technique ne permet d'avancer, la grille demande des essais (ou n'a pas de solution unique)
+all_techniques_ratings = {
+    "hidden_single": 1.5,
+    "naked_single": 2.3,
+    "locked_candidates": 2.8,
+    "naked_pair": 3.0,
+    "x_wing": 3.2,
+    "hidden_pair": 3.4,
+    "naked_triple": 3.6,
+    "swordfish": 3.8,
+    "hidden_triple": 4.0,
+    "trial_and_error": 10.0
+}
+
+
+class DifficultyRating:
+    """
+    La classe "DifficultyRating" contient le résultat de la notation d'une grille :
+    technique la plus difficile nécessaire, note de la grille (note de cette technique),
+    nombre d'utilisations de chaque technique, et si la grille a été entièrement résolue par les techniques
+    """
+    
+    __slots__ = ("hardest_technique", "score", "all_techniques_counts", "is_solved")
+    
+    def __init__(self, hardest_technique: str, all_techniques_counts: dict[str, int], is_solved: bool):
+        self.hardest_technique = hardest_technique
+        self.score = all_techniques_ratings[hardest_technique] if hardest_technique else 0.0
+        self.all_techniques_counts = all_techniques_counts
+        self.is_solved = is_solved
+    
+    def __repr__(self):
+        return f"DifficultyRating({self.score}, {self.hardest_technique}, solved={self.is_solved})"
+
+
+class DifficultyRater:
+    """
+    La classe "DifficultyRater" note la difficulté d'une grille pour un joueur : la grille est résolue uniquement avec
+    des techniques humaines, en utilisant toujours la technique la plus simple permettant d'avancer
+    La note de la grille est celle de la technique la plus difficile utilisée
+    Les valeurs possibles de chaque case sont des masques de bits (bit n°i à 1 = code i + 1 possible)
+    """
+    
+    def __init__(self, size: int):
+        
+        # Test préconditions
+        test_errors(size)
+        
+        self.size = size
+        self.unit_tables = get_unit_tables(size)
+        self.full_mask = (1 << size) - 1
+        
+        # index des cases de chaque groupe : lignes, colonnes, puis carrés
+        self.all_lines = self.unit_tables.groups_indexes["lines"]
+        self.all_columns = self.unit_tables.groups_indexes["columns"]
+        self.all_squares = self.unit_tables.groups_indexes["squares"]
+        self.all_units = self.all_lines + self.all_columns + self.all_squares
+        
+        # techniques dans l'ordre d'essai, chacune renvoi True si elle a pu avancer
+        self.all_techniques = [
+            ("hidden_single", self.apply_hidden_singles),
+            ("naked_single", self.apply_naked_singles),
+            ("locked_candidates", self.apply_locked_candidates),
+            ("naked_pair", lambda: self.apply_naked_subsets(2)),
+            ("x_wing", lambda: self.apply_fish(2)),
+            ("hidden_pair", lambda: self.apply_hidden_subsets(2)),
+            ("naked_triple", lambda: self.apply_naked_subsets(3)),
+            ("swordfish", lambda: self.apply_fish(3)),
+            ("hidden_triple", lambda: self.apply_hidden_subsets(3))
+        ]
+        
+        # état de la résolution en cours : codes des valeurs et valeurs possibles des cases (0 pour une case remplie)
+        self.values: list[int] = []
+        self.candidates: list[int] = []
+        # indique qu'une case vide n'a plus de valeur possible : la grille n'a pas de solution
+        self.is_contradiction = False
+    
+    def rate(self, values: bytes) -> DifficultyRating:
+        """
+        Note la grille dont les codes des valeurs sont "values" (0 = case vide), la grille n'est pas modifiée
+        """
+        
+        peers = self.unit_tables.peers
+        self.values = list(values)
+        self.candidates = [0] * self.unit_tables.cells_count
+        self.is_contradiction = False
+        
+        for index, code in enumerate(self.values):
+            if not code:
+                used_mask = 0
+                for peer in peers[index]:
+                    if self.values[peer]:
+                        used_mask |= 1 << (self.values[peer] - 1)
+                
+                self.candidates[index] = self.full_mask & ~used_mask
+                self.is_contradiction |= not self.candidates[index]
+        
+        all_techniques_counts = {name: 0 for name, _ in self.all_techniques}
+        hardest_technique = ""
+        
+        while 0 in self.values and not self.is_contradiction:
+            for name, technique in self.all_techniques:
+                if technique():
+                    all_techniques_counts[name] += 1
+                    
+                    if not hardest_technique or all_techniques_ratings[name] > all_techniques_ratings[hardest_technique]:
+                        hardest_technique = name
+                    
+                    break
+            
+            else:
+                # aucune technique ne permet d'avancer
+                hardest_technique = "trial_and_error"
+                break
+        
+        is_solved = 0 not in self.values and not self.is_contradiction
+        
+        return DifficultyRating(hardest_technique, all_techniques_counts, is_solved)
+    
+    def place(self, index: int, code: int):
+        """
+        Remplit la case d'index "index" avec le code "code" et retire ce code des valeurs possibles de ses voisins
+        """
+        
+        candidates = self.candidates
+        mask = ~(1 << (code - 1))
+        
+        self.values[index] = code
+        candidates[index] = 0
+        
+        for peer in self.unit_tables.peers[index]:
+            if candidates[peer]:
+                candidates[peer] &= mask
+                self.is_contradiction |= not candidates[peer]
+    
+    def eliminate(self, all_indexes, mask: int) -> bool:
+        """
+        Retire les valeurs du masque "mask" des valeurs possibles des cases "all_indexes"
+        Renvoi True si au moins une valeur a été retirée
+        """
+        
+        candidates = self.candidates
+        is_changed = False
+        
+        for index in all_indexes:
+            if candidates[index] & mask:
+                candidates[index] &= ~mask
+                self.is_contradiction |= not candidates[index]
+                is_changed = True
+        
+        return is_changed
+    
+    def apply_hidden_singles(self) -> bool:
+        """
+        Valeur possible dans une seule case d'un groupe : la case prend cette valeur
+        """
+        
+        candidates = self.candidates
+        is_changed = False
+        
+        for unit in self.all_units:
+            # valeurs possibles dans au moins une case, puis dans au moins deux cases du groupe
+            seen_once = seen_twice = 0
+            for index in unit:
+                seen_twice |= seen_once & candidates[index]
+                seen_once |= candidates[index]
+            
+            unique_mask = seen_once & ~seen_twice
+            
+            while unique_mask:
+                bit = unique_mask & -unique_mask
+                unique_mask &= unique_mask - 1
+                
+                for index in unit:
+                    # la valeur a pu être posée dans le groupe par une case précédente
+                    if candidates[index] & bit:
+                        self.place(index, bit.bit_length())
+                        is_changed = True
+                        break
+        
+        return is_changed
+    
+    def apply_naked_singles(self) -> bool:
+        """
+        Case n'ayant qu'une seule valeur possible : la case prend cette valeur
+        """
+        
+        candidates = self.candidates
+        is_changed = False
+        
+        for index, mask in enumerate(candidates):
+            # une seule valeur possible (un seul bit à 1), le masque a pu changer depuis le début de la boucle
+            if mask and not mask & (mask - 1) and candidates[index] == mask:
+                self.place(index, mask.bit_length())
+                is_changed = True
+        
+        return is_changed
+    
+    def apply_locked_candidates(self) -> bool:
+        """
+        Valeur d'un carré possible uniquement sur une ligne (ou une colonne) : elle est retirée du reste de la ligne
+        Valeur d'une ligne (ou d'une colonne) possible uniquement dans un carré : elle est retirée du reste du carré
+        """
+        
+        candidates = self.candidates
+        cell_groups = self.unit_tables.cell_groups
+        
+        # (groupes de départ, position du groupe d'arrivée dans cell_groups, groupes d'arrivée)
+        for all_base_units, group_position, all_cover_units in [
+            (self.all_squares, 0, self.all_lines), (self.all_squares, 1, self.all_columns),
+            (self.all_lines, 2, self.all_squares), (self.all_columns, 2, self.all_squares)
+        ]:
+            for unit in all_base_units:
+                union_mask = 0
+                for index in unit:
+                    union_mask |= candidates[index]
+                
+                while union_mask:
+                    bit = union_mask & -union_mask
+                    union_mask &= union_mask - 1
+                    
+                    all_cover_numbers = {cell_groups[index][group_position] for index in unit if candidates[index] & bit}
+                    
+                    if len(all_cover_numbers) == 1:
+                        cover_unit = all_cover_units[all_cover_numbers.pop()]
+                        
+                        if self.eliminate([index for index in cover_unit if index not in unit], bit):
+                            return True
+        
+        return False
+    
+    def apply_naked_subsets(self, subset_size: int) -> bool:
+        """
+        "subset_size" cases d'un groupe n'ayant à elles toutes que "subset_size" valeurs possibles :
+        ces valeurs sont retirées des autres cases du groupe
+        """
+        
+        candidates = self.candidates
+        
+        for unit in self.all_units:
+            all_small_cells = [index for index in unit if 2 <= candidates[index].bit_count() <= subset_size]
+            
+            for subset in combinations(all_small_cells, subset_size):
+                union_mask = 0
+                for index in subset:
+                    union_mask |= candidates[index]
+                
+                if union_mask.bit_count() == subset_size:
+                    if self.eliminate([index for index in unit if index not in subset], union_mask):
+                        return True
+        
+        return False
+    
+    def apply_hidden_subsets(self, subset_size: int) -> bool:
+        """
+        "subset_size" valeurs d'un groupe possibles uniquement dans "subset_size" cases :
+        les autres valeurs sont retirées de ces cases
+        """
+        
+        candidates = self.candidates
+        
+        for unit in self.all_units:
+            # cases où chaque valeur est possible, uniquement pour les valeurs possibles dans 2 à "subset_size" cases
+            all_positions = {}
+            for code in range(1, self.size + 1):
+                bit = 1 << (code - 1)
+                cells = [index for index in unit if candidates[index] & bit]
+                
+                if 2 <= len(cells) <= subset_size:
+                    all_positions[bit] = cells
+            
+            for subset in combinations(all_positions, subset_size):
+                all_cells = set()
+                for bit in subset:
+                    all_cells.update(all_positions[bit])
+                
+                if len(all_cells) == subset_size:
+                    subset_mask = sum(subset)
+                    
+                    if self.eliminate(all_cells, self.full_mask & ~subset_mask):
+                        return True
+        
+        return False
+    
+    def apply_fish(self, fish_size: int) -> bool:
+        """
+        X-wing (2) ou swordfish (3) : une valeur possible, dans "fish_size" lignes, uniquement dans les mêmes
+        "fish_size" colonnes : elle est retirée des autres cases de ces colonnes (et inversement lignes / colonnes)
+        """
+        
+        candidates = self.candidates
+        
+        for all_base_units, all_cover_units in [(self.all_lines, self.all_columns), (self.all_columns, self.all_lines)]:
+            for code in range(1, self.size + 1):
+                bit = 1 << (code - 1)
+                
+                # positions de la valeur dans chaque groupe de départ, pour les groupes où elle a 2 à "fish_size" positions
+                all_positions = {}
+                for unit_number, unit in enumerate(all_base_units):
+                    positions = [position for position, index in enumerate(unit) if candidates[index] & bit]
+                    
+                    if 2 <= len(positions) <= fish_size:
+                        all_positions[unit_number] = positions
+                
+                for subset in combinations(all_positions, fish_size):
+                    all_cover_numbers = set()
+                    for unit_number in subset:
+                        all_cover_numbers.update(all_positions[unit_number])
+                    
+                    if len(all_cover_numbers) == fish_size:
+                        all_indexes = [
+                            index
+                            for cover_number in all_cover_numbers
+                            for unit_number, index in enumerate(all_cover_units[cover_number]) if unit_number not in subset
+                        ]
+                        
+                        if self.eliminate(all_indexes, bit):
+                            return True
+        
+        return False
+
+
+# notateurs créés lors de la première notation de chaque taille
+all_raters: dict[int, DifficultyRater] = {}
+
+
+def rate_grid(values: bytes, size: int) -> DifficultyRating:
+    """
+    Note la difficulté de la grille de taille "size" dont les codes des valeurs sont "values"
+    """
+    
+    if size not in all_raters:
+        all_raters[size] = DifficultyRater(size)
+    
+    return all_raters[size].rate(values)
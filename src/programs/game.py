@@ -6,7 +6,20 @@ import json
 # import de nos modules
 from src.programs.sudoku import Sudoku
 from src.programs.graphism import Graphism
-from src.programs.test_errors import test_errors
+from src.programs.puzzle_pool import PuzzlePool
+from src.programs.test_errors import all_possible_values, all_sudoku_sizes, test_errors, test_internal_errors, set_validation_level
+
+# valeurs par défaut des paramètres ajoutés au fichier de configuration depuis sa première version,
+# utilisées lorsque le fichier "config.json" d'un joueur ne contient pas encore ces clés
+default_config = {
+    "validation_level": "boundaries",
+    "solving_engine": "backtracking",
+    "solving_workers": 1,
+    "history_max_depth": 500,
+    "solving_replay_speed": 500,
+    "puzzle_pool_depth": 5,
+    "solver_statistics_log": "",
+}
 
 
 class Game:
@@ -14,7 +27,13 @@ class Game:
     La classe Game permet de mettre en relation les entrées de l'utilisateurs avec la grille du sudoku et la gestion de l'affichage
     """
     
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, puzzle_pool: PuzzlePool = None):
+        """
+        :param screen: fenêtre du jeu
+        :param puzzle_pool: stocks de grilles générées à l'avance, None pour les stocks du dossier par défaut complétés
+        jusqu'à "puzzle_pool_depth" grilles (voir config file)
+        """
+        
         # variable indiquant si la fenêtre doit être fermée
         self.do_quit = False
         
@@ -38,14 +57,36 @@ class Game:
         # charge le fichier de configuration et met à jour l'attribut self.config_file
         self.load_config_file()
         
+        # niveau de vérification des erreurs // récupère ce paramètre dans config file
+        set_validation_level(self.get_config_value("validation_level"))
+        
         # difficulté des grilles générées
         self.generation_difficulty = self.get_config_value("generation_difficulty")
         
         # indique si l'affichage doit être fait pendant la résoltion // récupèrre ce paramètre dans config file
         self.do_display_during_solving = self.get_config_value("do_display_during_solving")
         
-        # Valeurs possibles pour les symboles (chiffre puis lettre)
-        self.possible_values = "123456789ABCDEFG"
+        # moteur de résolution, "backtracking" ou "dancing_links" // récupère ce paramètre dans config file
+        self.solving_engine = self.get_config_value("solving_engine")
+        
+        # nombre de processus utilisés pour les recherches sans affichage (1 = processus courant uniquement, 0 = tous les processeurs)
+        self.solving_workers = self.get_config_value("solving_workers")
+        
+        # nombre maximal d'actions conservées dans l'historique // récupère ce paramètre dans config file
+        self.history_max_depth = self.get_config_value("history_max_depth")
+        
+        # vitesse de relecture de la dernière résolution, en cases modifiées par seconde // récupère ce paramètre dans config file
+        self.solving_replay_speed = self.get_config_value("solving_replay_speed")
+        
+        # fichier où les statistiques de chaque résolution et génération sont ajoutées, une ligne JSON par calcul
+        # ("" = désactivé) // récupère ce paramètre dans config file
+        self.solver_statistics_log = self.get_config_value("solver_statistics_log")
+        
+        # grilles générées à l'avance, complétées en arrière-plan jusqu'à "puzzle_pool_depth" grilles par taille et difficulté
+        self.puzzle_pool = puzzle_pool if puzzle_pool is not None else PuzzlePool(self.get_config_value("puzzle_pool_depth"))
+        
+        # Valeurs possibles pour les symboles (chiffres, lettres majuscules, puis lettres minuscules)
+        self.possible_values = all_possible_values
         
         # créé l'instance sudoku
         self.sudoku = Sudoku(self, 9)
@@ -90,6 +131,25 @@ class Game:
             pygame.K_e:         "E",
             pygame.K_f:         "F",
             pygame.K_g:         "G",
+            pygame.K_h:         "H",
+            pygame.K_i:         "I",
+            pygame.K_j:         "J",
+            pygame.K_k:         "K",
+            pygame.K_l:         "L",
+            pygame.K_m:         "M",
+            pygame.K_n:         "N",
+            pygame.K_o:         "O",
+            pygame.K_p:         "P",
+            pygame.K_q:         "Q",
+            pygame.K_r:         "R",
+            pygame.K_s:         "S",
+            pygame.K_t:         "T",
+            pygame.K_u:         "U",
+            pygame.K_v:         "V",
+            pygame.K_w:         "W",
+            pygame.K_x:         "X",
+            pygame.K_y:         "Y",
+            pygame.K_z:         "Z",
             
             # 0 correspond à une case vide (supprime la valeur de la case)
             pygame.K_BACKSPACE: "0",
@@ -100,13 +160,57 @@ class Game:
         
         # met à jour la taille des images // pas d'affichage
         self.graphism.update_rect()
+        
+        # nombre maximal d'images par seconde
+        self.frame_rate = 60
+        # temps d'attente maximal d'un évènement (ms) lorsqu'aucun calcul n'est en cours
+        self.idle_timeout = 1000
     
     
-    def update(self, do_display = True):
+    def run(self):
+        """
+        Boucle principale du jeu, jusqu'à la fermeture de la fenêtre
+        Sans action de l'utilisateur, la boucle attend les évènements sans utiliser le processeur et n'affiche rien,
+        la fenêtre est mise à jour au plus "frame_rate" fois par seconde, les évènements arrivés entre deux images sont regroupés
+        """
+        
+        clock = pygame.time.Clock()
+        
+        # affichage de la première image
+        self.update(pygame.event.get(), True)
+        
+        while not self.do_quit:
+            # un calcul est en cours, la fenêtre est mise à jour à chaque image
+            if self.is_processing:
+                clock.tick(self.frame_rate)
+                all_events = pygame.event.get()
+            
+            else:
+                # attend le prochain évènement (NOEVENT si aucun évènement n'est arrivé avant "idle_timeout")
+                first_event = pygame.event.wait(self.idle_timeout)
+                
+                # Limitation à "frame_rate" images par seconde, les évènements arrivés pendant l'attente sont traités ensemble
+                clock.tick(self.frame_rate)
+                all_events = ([] if first_event.type == pygame.NOEVENT else [first_event]) + pygame.event.get()
+            
+            # la fenêtre n'est redessinée que si un évènement a pu la modifier
+            self.update(all_events, bool(all_events) or self.is_processing)
+        
+        # arrête le calcul en cours et la génération des grilles à l'avance avant la fermeture de la fenêtre
+        self.sudoku.cancel_worker()
+        self.puzzle_pool.close()
+    
+    def update(self, all_events: list[pygame.event.Event], do_display: bool = True):
         """
         Met à jour l'affichage du jeu
+        :param all_events: évènements arrivés depuis la dernière mise à jour
         """
         
+        # lit les messages du calcul en arrière-plan (avancement, résultat)
+        self.sudoku.update_worker()
+        # complète les grilles générées à l'avance, en attente pendant les calculs du jeu
+        self.puzzle_pool.update(self.sudoku.grid.size, self.generation_difficulty, self.is_processing)
+        
         # met en pause la lecture de la musique ou la reprend en fonction du focus
         if self.is_window_focused != pygame.key.get_focused():
             self.is_window_focused = pygame.key.get_focused()
@@ -120,23 +224,23 @@ class Game:
         
         # si le menu options est ouvert
         if self.is_options_open:
-            self.update_options(do_display)
+            self.update_options(all_events, do_display)
         
         # si le mmenu démarrer est ouvert
         elif self.current_menu == "start":
-            self.update_start(do_display)
+            self.update_start(all_events, do_display)
         
         # sii le menu normal (grille) est ouvert
         elif self.current_menu == "game":
-            self.update_game(do_display)
+            self.update_game(all_events, do_display)
     
-    def update_start(self, do_display: bool):
+    def update_start(self, all_events: list[pygame.event.Event], do_display: bool):
         """
         Met à jour l'état du jeu lorsque le menu de démarrage est ouvert
         """
         
-        # récupère les evenements en cours
-        all_events = pygame.event.get()
+        # charge les images du menu lors de sa première utilisation
+        self.graphism.load_menu("start")
         
         # balaye dans les évenements
         for event in all_events:
@@ -162,7 +266,7 @@ class Game:
                     # ne pas afficher le menu démarrer...
                     do_display = False
                     # ... mais plutot le menu de jeu
-                    self.update_game(True)
+                    self.update_game([], True)
                 
                 # si le bouton options est selectionnée
                 elif self.graphism.options_start_button_rect.collidepoint(mouse_pos):
@@ -170,7 +274,7 @@ class Game:
                     # ne pas afficher le menu démarrer...
                     do_display = False
                     # ... mais plutôt le menu options
-                    self.update_options(True)
+                    self.update_options([], True)
                 
                 elif self.graphism.help_button_rect.collidepoint(mouse_pos):
                     self.open_file(self.help_filepath)
@@ -184,12 +288,14 @@ class Game:
         if do_display:
             self.graphism.display_start_elements()
     
-    def update_game(self, do_display: bool):
+    def update_game(self, all_events: list[pygame.event.Event], do_display: bool):
         """
         Met à jour l'état du jeu lorsque le menu de jeu est affiché
         """
         
-        all_events = pygame.event.get()
+        # charge les images du menu lors de sa première utilisation
+        self.graphism.load_menu("game")
+        
         # boolean qui indique si une touche controle est pressé
         is_ctrl_pressed = pygame.key.get_pressed()[pygame.K_LCTRL] or pygame.key.get_pressed()[pygame.K_RCTRL]
         
@@ -207,8 +313,22 @@ class Game:
                 self.graphism.update_rect()
                 pygame.display.flip()
             
-            # Ne pas vérifier les autres event si la résolution est en cours (économie performance)
+            # Ne pas vérifier les autres event si la résolution est en cours, sauf le bouton retour qui annule le calcul
             if self.is_processing:
+                if (
+                    event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT
+                    and self.graphism.return_button_rect.collidepoint(pygame.mouse.get_pos())
+                ):
+                    self.sudoku.cancel_worker()
+                    self.current_menu = "start"
+                    do_display = False
+                    self.update_start([], True)
+                    return
+                
+                # touche Echap : annule le calcul ou la relecture en cours, sans quitter la grille
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    self.sudoku.cancel_worker()
+                
                 continue
             
             # Si l'utilisateur clique sur l'écran
@@ -235,9 +355,6 @@ class Game:
                         else:
                             # supprimer les cases déverrouillées
                             self.sudoku.clear()
-                        
-                        # vérifier la validiété de la grille
-                        self.sudoku.verify_grid()
                     
                     # bouton annuler dernière action
                     elif self.graphism.arrow_left_button_rect.collidepoint(
@@ -272,8 +389,7 @@ class Game:
                     
                     # bouton résoudre le sudoku
                     elif self.graphism.solve_button_rect.collidepoint(mouse_pos):
-                        self.sudoku.solve_grid(self.do_display_during_solving)
-                        self.sudoku.verify_grid()
+                        self.sudoku.solve_grid(self.do_display_during_solving, self.solving_engine)
                     
                     # bouton options
                     elif self.graphism.options_button_rect.collidepoint(mouse_pos):
@@ -281,7 +397,7 @@ class Game:
                         # ne pas afficher le menu de jeu...
                         do_display = False
                         # ... mais plutôt le menu options
-                        self.update_options(True)
+                        self.update_options([], True)
                     
                     # bouton retour (au menu démarrer)
                     elif self.graphism.return_button_rect.collidepoint(mouse_pos):
@@ -289,7 +405,7 @@ class Game:
                         # ne pas afficher le menu  de jeu...
                         do_display = False
                         # ... mais plutôt le menu démarrer
-                        self.update_start(True)
+                        self.update_start([], True)
                 
                 # Si l'utilisateur effectue un clique droit
                 elif event.button == pygame.BUTTON_RIGHT:
@@ -331,7 +447,6 @@ class Game:
                 # Ctrl + C - supprime toutes les valeurs des cases déverrouillées
                 if event.key == pygame.K_c and is_ctrl_pressed:
                     self.sudoku.clear()
-                    self.sudoku.verify_grid()
                 # Ctrl + z : annuler la dernière action
                 
                 if event.key == pygame.K_z and is_ctrl_pressed:
@@ -341,35 +456,41 @@ class Game:
                 if event.key == pygame.K_y and is_ctrl_pressed:
                     self.sudoku.move_index_history("forward")
                 
+                # Ctrl + r : rejouer la dernière résolution
+                if event.key == pygame.K_r and is_ctrl_pressed:
+                    self.sudoku.replay_solving()
+                
                 # une valeur présente dans key_mapping a été pressé
                 if event.key in self.key_mapping and not is_ctrl_pressed:
                     # Si aucune case n'est sélectionnée, ne rien faire
                     if self.sudoku.selected_cell == (-1, -1):
                         continue
                     
-                    # Si la valeur n'est pas compatible avec la taille de la grille actuelle, ne rien faire
-                    if not self.key_mapping[event.key] in "0" + self.possible_values[:self.sudoku.grid.size]:
-                        continue
-                    
                     # récupère la valeur à affecter à partir du dictionnaire self.key_mapping
+                    # Maj + lettre : lettre minuscule, valeurs des grilles de plus de 35x35
                     value = self.key_mapping[event.key]
+                    if event.mod & pygame.KMOD_SHIFT:
+                        value = value.lower()
                     
-                    # modifie la valeur de la case selectionnée
-                    self.sudoku.set_selected_cell_value(value)
+                    # Si la valeur n'est pas compatible avec la taille de la grille actuelle, ne rien faire
+                    if not value in "0" + self.possible_values[:self.sudoku.grid.size]:
+                        continue
                     
-                    # vérifie si cette valeur entre en conflit avec d'autres valeurs de la grille
-                    self.sudoku.verify_grid()
+                    # modifie la valeur de la case selectionnée, la grille met à jour les conflits avec les autres valeurs
+                    self.sudoku.set_selected_cell_value(value)
         
         if do_display:
             self.graphism.display_game_elements()
     
-    def update_options(self, do_display: bool):
+    def update_options(self, all_events: list[pygame.event.Event], do_display: bool):
         """
         Met à jour l'état du jeu lorsque le menu d'options est ouvert
         """
         
+        # charge les images du menu lors de sa première utilisation
+        self.graphism.load_menu("options")
+        
         mouse_pos = pygame.mouse.get_pos()
-        all_events = pygame.event.get()
         
         # balayer dans les evenements
         for event in all_events:
@@ -396,25 +517,17 @@ class Game:
                     do_display = False
                     if self.current_menu == "start":
                         # ... mais plutôt le menu démarrer
-                        self.update_start(True)
+                        self.update_start([], True)
                     else:
                         # ... mais plutôt le menu de jeu
-                        self.update_game(True)
+                        self.update_game([], True)
                 
                 # bouton dimensions
                 if self.graphism.dimensions_button_rect.collidepoint(mouse_pos):
                     
-                    # afficher image taille 9x9
-                    if self.sudoku.grid.size == 4:
-                        is_action_successful = self.sudoku.new_empty_grid(9)
-                    
-                    # afficher image taille 16x16
-                    elif self.sudoku.grid.size == 9:
-                        is_action_successful = self.sudoku.new_empty_grid(16)
-                    
-                    # afficher taille 4x4
-                    else:
-                        is_action_successful = self.sudoku.new_empty_grid(4)
+                    # taille suivante (4x4, 9x9, 16x16, 25x25, ...), puis retour à 4x4 après la plus grande taille
+                    size_position = all_sudoku_sizes.index(self.sudoku.grid.size)
+                    is_action_successful = self.sudoku.new_empty_grid(all_sudoku_sizes[(size_position + 1) % len(all_sudoku_sizes)])
                     
                     if is_action_successful:
                         self.graphism.update_grid_attributes(self.sudoku.grid.size)
@@ -429,8 +542,7 @@ class Game:
                     self.graphism.display_game_elements()
                     
                     # Génération de la grill
-                    self.sudoku.generate_grid(self.generation_difficulty)
-                    self.sudoku.verify_grid()
+                    self.sudoku.generate_grid(self.generation_difficulty, engine=self.solving_engine)
                 
                 # bouton curseur
                 elif self.graphism.cursor_background_button_rect.collidepoint(mouse_pos):
@@ -505,7 +617,7 @@ class Game:
         Met à jour une case uniquement (gain de performance), utilisée lors de la résolution
         """
         
-        test_errors(self.sudoku.grid.size, coordinates=coordinates)
+        test_internal_errors(self.sudoku.grid.size, coordinates=coordinates)
         
         all_events = pygame.event.get()
         
@@ -556,7 +668,7 @@ class Game:
         
         difficulty = (cursor_pos - input_lower_bound) / (input_upper_bound - input_lower_bound) * (output_upper_bound - output_lower_bound) + output_lower_bound
         difficulty = round(difficulty, 2)
-
+        
         self.generation_difficulty = difficulty
         self.set_config_value("generation_difficulty", difficulty)
     
@@ -582,11 +694,11 @@ class Game:
     def load_config_file(self):
         """
         Charge le fichier de configuration spécifié à self.config_filepath
-        attribut self.config_file mis à jour
+        attribut self.config_file mis à jour, les clés absentes du fichier prennent leur valeur par défaut (voir default_config)
         """
         
         with open("src/config.json") as file:
-            self.config_file = json.load(fp = file)
+            self.config_file = {**default_config, **json.load(fp = file)}
     
     def get_config_value(self, key: str):
         """
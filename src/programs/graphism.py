@@ -4,7 +4,12 @@ import os
 from tkinter.filedialog import askdirectory
 
 # nos modules
-from src.programs.test_errors import test_errors
+from src.programs.image_cache import ImageCache
+from src.programs.test_errors import test_errors, test_internal_errors
+from src.programs.units import get_unit_tables
+
+# dossier du cache des images redimensionnées sur le disque, accélère le démarrage du jeu
+textures_cache_folder = "src/cache/textures"
 
 class Graphism:
     """
@@ -17,25 +22,53 @@ class Graphism:
         
         self.grid_size = grid_size
         self.square_size = int(self.grid_size ** 0.5)
+        # tables précalculées des groupes et des voisins des cases, partagées avec la grille
+        self.unit_tables = get_unit_tables(self.grid_size)
         
         self.texture_pack = texture_pack
         self.do_play_music = do_play_music
         self.do_display_conflicts = do_display_conflicts
         
+        # images chargées et redimensionnées, partagées entre les redimensionnements de la fenêtre et les packs de textures
+        self.image_cache = ImageCache(disk_folder = textures_cache_folder)
+        # pack de textures dont le son d'ambiance est chargé
+        self.audio_texture_pack = None
+        
         # variable indiquant si le curseur a été sélectionné par un clique gauche
         self.is_cursor_selected = False
         
-
+        # menu affiché dans la fenêtre, toute la fenêtre est redessinée lorsqu'il change
+        self.displayed_menu = None
+        # menus dont les images et les rectangles sont chargés, les images d'un menu sont chargées lors de sa première utilisation
+        self.loaded_menus: set[str] = set()
+        # indique si toute la fenêtre doit être redessinée lors du prochain affichage
+        self.is_full_redraw_needed = True
+        # image et rectangle affichés pour chaque bouton, permet de ne redessiner que les boutons modifiés
+        self.displayed_elements: dict[str, tuple[pygame.Surface, tuple[int, int, int, int]]] = {}
+        # apparence affichée de chaque case (voir get_cell_appearance), None si la case n'a pas été dessinée
+        self.displayed_cells: list[tuple[int, int, bool, bool] | None] = [None] * self.grid_size ** 2
+        # zones de la fenêtre modifiées depuis la dernière mise à jour de l'affichage
+        self.dirty_rects: list[pygame.Rect] = []
+    
+    
     def update_grid_attributes(self, size: int):
         """
         met à jour les attributs de la grille, utiliser lors d'un changement de taille de la grille
         """
         self.grid_size = size
         self.square_size = int(self.grid_size ** 0.5)
+        self.unit_tables = get_unit_tables(self.grid_size)
         
-        self.update_cells()
-        self.update_digits()
-
+        # les cases du menu de jeu et le bouton dimensions du menu options dépendent de la taille de la grille
+        self.loaded_menus.discard("game")
+        self.loaded_menus.discard("options")
+        
+        if self.displayed_menu is not None:
+            self.load_menu(self.displayed_menu)
+        
+        # la grille est entièrement redessinée
+        self.invalidate_display()
+    
     def reverse_display_conflicts(self):
         """
         Cette fonction inverse l'état de la variable booléenne "self.do_display_conflicts"
@@ -65,7 +98,7 @@ class Graphism:
             if not path in os.listdir("src/graphics"):
                 print("\nThis isn't a texture pack")
                 continue
-                
+            
             break
         
         self.texture_pack = path
@@ -81,10 +114,8 @@ class Graphism:
         :return l'image redimensionnée spécifée dans `path`
         """
         
-        # image
-        image = pygame.image.load(f"src/graphics/{self.texture_pack}/{filepath}")
-        resized_image = pygame.transform.smoothscale(image, dimensions)
-        return resized_image
+        # image chargée et redimensionnée une seule fois, puis gardée dans le cache
+        return self.image_cache.get_scaled(self.texture_pack, filepath, dimensions)
     
     def load_audio(self, filepath: str):
         """
@@ -99,7 +130,7 @@ class Graphism:
         pygame.mixer.music.load(f"src/graphics/{self.texture_pack}/" + filepath)
         # lance la lecture infinie du son
         pygame.mixer.music.play(-1)
-
+        
         # régler le volume (echelle de 0 à 1)
         pygame.mixer.music.set_volume(0.2)
         
@@ -127,251 +158,343 @@ class Graphism:
         
         else:
             pygame.mixer.music.pause()
-
-
+    
+    
+    def invalidate_display(self):
+        """
+        Indique que toute la fenêtre doit être redessinée lors du prochain affichage
+        Utilisée lorsque les dimensions, les images ou la taille de la grille changent
+        """
+        
+        self.is_full_redraw_needed = True
+    
+    def begin_display(self, menu: str) -> bool:
+        """
+        Commence l'affichage du menu "menu", redessine le fond d'écran si toute la fenêtre doit être redessinée
+        Renvoi True si toute la fenêtre est redessinée, False si seuls les éléments modifiés le seront
+        """
+        
+        self.load_menu(menu)
+        
+        # changement de menu, tous les éléments sont différents
+        if menu != self.displayed_menu:
+            self.displayed_menu = menu
+            self.is_full_redraw_needed = True
+        
+        if self.is_full_redraw_needed:
+            self.displayed_elements.clear()
+            self.displayed_cells = [None] * self.grid_size ** 2
+            
+            # Affichage du fond d'écran
+            self.screen.blit(self.background, self.background_rect)
+        
+        return self.is_full_redraw_needed
+    
+    def end_display(self):
+        """
+        Met à jour la fenêtre : toute la fenêtre si elle a été entièrement redessinée, sinon uniquement les zones modifiées
+        """
+        
+        if self.is_full_redraw_needed:
+            pygame.display.flip()
+        
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        
+        self.dirty_rects.clear()
+        self.is_full_redraw_needed = False
+    
+    def display_element(self, name: str, image: pygame.Surface, rect: pygame.Rect):
+        """
+        Affiche l'image d'un élément (bouton) de la fenêtre, uniquement si elle a changé depuis le dernier affichage
+        Le fond d'écran est redessiné sous l'élément, les images pouvant être transparentes
+        """
+        
+        if self.displayed_elements.get(name) == (image, tuple(rect)):
+            return
+        
+        if not self.is_full_redraw_needed:
+            self.screen.blit(self.background, rect, rect.move(-self.background_rect.x, -self.background_rect.y))
+            self.dirty_rects.append(rect.copy())
+        
+        self.screen.blit(image, rect)
+        self.displayed_elements[name] = (image, tuple(rect))
+    
+    def get_cell_appearance(self, index: int) -> tuple[int, int, bool, bool]:
+        """
+        Renvoi ce qui est affiché pour la case d'index "index" : code de la valeur, code de l'état, sélection et conflit
+        """
+        
+        grid = self.game.sudoku.grid
+        
+        return (
+            grid.values[index],
+            grid.states[index],
+            self.unit_tables.all_coordinates[index] == self.game.sudoku.selected_cell,
+            self.do_display_conflicts and grid.conflicts[index] != 0
+        )
+    
+    def display_cell(self, coordinates: tuple[int, int]):
+        """
+        Affiche une case : image selon son état et sa sélection, chiffre et cadenas
+        """
+        
+        x, y = coordinates
+        index = x * self.grid_size + y
+        rect = self.all_cell_rect[x][y]
+        
+        _, state_code, is_selected, _ = appearance = self.get_cell_appearance(index)
+        is_superlocked = self.game.sudoku.grid.all_states[state_code] == "superlocked"
+        
+        # efface l'ancienne case, l'image de fond de la grille peut être transparente
+        if not self.is_full_redraw_needed:
+            self.screen.blit(self.background, rect, rect.move(-self.background_rect.x, -self.background_rect.y))
+            self.screen.blit(self.grid_background, rect, rect.move(-self.grid_background_rect.x, -self.grid_background_rect.y))
+            self.dirty_rects.append(rect)
+        
+        # affichage d'une case déverrouillée
+        if not is_superlocked and not is_selected:
+            self.screen.blit(self.cell_image, rect)
+        
+        # Affichage d'une case sélectionnée
+        elif not is_superlocked and is_selected:
+            self.screen.blit(self.selected_cell_image, rect)
+        
+        # Affichage d'une case superlocked
+        elif is_superlocked and not is_selected:
+            self.screen.blit(self.superlocked_cell_image, rect)
+        
+        # Affichage d'une case superlocked et sélectionnée
+        else:
+            self.screen.blit(self.superlocked_selected_cell_image, rect)
+        
+        # affichage du chiffre de la case
+        self.display_cell_digit(coordinates)
+        
+        # affichage du cadenas si la case est verrouillée
+        if self.game.sudoku.grid.all_states[state_code] == "locked":
+            self.screen.blit(self.padlock_image, rect)
+        
+        self.displayed_cells[index] = appearance
+    
     def display_start_elements(self):
         """
         Affiche les éléments du menu de démarrage
         """
         
-        # Affichage du fond d'écran
-        self.screen.blit(self.background, self.background_rect)
+        self.begin_display("start")
         
         mouse_pos = pygame.mouse.get_pos()
         
         # bouton jouer
         if self.play_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.play_selected_button, self.play_button_rect)
+            self.display_element("play", self.play_selected_button, self.play_button_rect)
         else:
-            self.screen.blit(self.play_button, self.play_button_rect)
-            
+            self.display_element("play", self.play_button, self.play_button_rect)
+        
         # bouton options
         if self.options_start_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.options_start_selected_button, self.options_start_button_rect)
+            self.display_element("options", self.options_start_selected_button, self.options_start_button_rect)
         else:
-            self.screen.blit(self.options_start_button, self.options_start_button_rect)
+            self.display_element("options", self.options_start_button, self.options_start_button_rect)
         
         # bouton aide
         if self.help_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.help_button_selected, self.help_button_rect)
+            self.display_element("help", self.help_button_selected, self.help_button_rect)
         else:
-            self.screen.blit(self.help_button, self.help_button_rect)
-            
+            self.display_element("help", self.help_button, self.help_button_rect)
+        
         # boutons quitter
         if self.quit_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.quit_selected_button, self.quit_button_rect)
+            self.display_element("quit", self.quit_selected_button, self.quit_button_rect)
         else:
-            self.screen.blit(self.quit_button, self.quit_button_rect)
+            self.display_element("quit", self.quit_button, self.quit_button_rect)
         
-        pygame.display.flip()
+        self.end_display()
     
     def display_game_elements(self):
         """
         Permet d'afficher les élément du menu principal
+        Seuls les boutons et les cases dont l'affichage a changé sont redessinés
         """
         
-        # Affichage du fond d'écran
-        self.screen.blit(self.background, self.background_rect)
+        if self.begin_display("game"):
+            # Affiche l'image de fond de la grille
+            self.screen.blit(self.grid_background, self.grid_background_rect)
         
         # Affichage des boutons
         mouse_pos = pygame.mouse.get_pos()
         
         # bouton annuler
         if not self.game.sudoku.is_history_move_possible("backward"):
-            self.screen.blit(self.arrow_left_disabled_button, self.arrow_left_button_rect)
+            self.display_element("arrow_left", self.arrow_left_disabled_button, self.arrow_left_button_rect)
         elif self.arrow_left_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.arrow_left_selected_button, self.arrow_left_button_rect)
+            self.display_element("arrow_left", self.arrow_left_selected_button, self.arrow_left_button_rect)
         else:
-            self.screen.blit(self.arrow_left_button, self.arrow_left_button_rect)
+            self.display_element("arrow_left", self.arrow_left_button, self.arrow_left_button_rect)
         
         # bouton vider la grille
         if self.cross_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.cross_selected_button, self.cross_button_rect)
+            self.display_element("cross", self.cross_selected_button, self.cross_button_rect)
         else:
-            self.screen.blit(self.cross_button, self.cross_button_rect)
+            self.display_element("cross", self.cross_button, self.cross_button_rect)
         
         # bouton rétablir
         if not self.game.sudoku.is_history_move_possible("forward"):
-            self.screen.blit(self.arrow_right_disabled_button, self.arrow_right_button_rect)
+            self.display_element("arrow_right", self.arrow_right_disabled_button, self.arrow_right_button_rect)
         elif self.arrow_right_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.arrow_right_selected_button, self.arrow_right_button_rect)
+            self.display_element("arrow_right", self.arrow_right_selected_button, self.arrow_right_button_rect)
         else:
-            self.screen.blit(self.arrow_right_button, self.arrow_right_button_rect)
+            self.display_element("arrow_right", self.arrow_right_button, self.arrow_right_button_rect)
         
         # bouton ouvrir
         if self.open_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.open_selected_button, self.open_button_rect)
+            self.display_element("open", self.open_selected_button, self.open_button_rect)
         else:
-            self.screen.blit(self.open_button, self.open_button_rect)
-
+            self.display_element("open", self.open_button, self.open_button_rect)
+        
         # bouton enregistrer
         if self.save_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.save_selected_button, self.save_button_rect)
+            self.display_element("save", self.save_selected_button, self.save_button_rect)
         else:
-            self.screen.blit(self.save_button, self.save_button_rect)
+            self.display_element("save", self.save_button, self.save_button_rect)
         
         # bouton résoudre
         if self.solve_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.solve_selected_button, self.solve_button_rect)
+            self.display_element("solve", self.solve_selected_button, self.solve_button_rect)
         else:
-            self.screen.blit(self.solve_button, self.solve_button_rect)
-      
+            self.display_element("solve", self.solve_button, self.solve_button_rect)
+        
         # bouton options
         if self.options_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.options_selected_button, self.options_button_rect)
+            self.display_element("options", self.options_selected_button, self.options_button_rect)
         else:
-            self.screen.blit(self.options_button, self.options_button_rect)
-
+            self.display_element("options", self.options_button, self.options_button_rect)
+        
         if self.return_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.return_selected_button, self.return_button_rect)
+            self.display_element("return", self.return_selected_button, self.return_button_rect)
         else:
-            self.screen.blit(self.return_button, self.return_button_rect)
-        
-        # Affiche l'image de fond de la grille
-        self.screen.blit(self.grid_background, self.grid_background_rect)
+            self.display_element("return", self.return_button, self.return_button_rect)
         
-        # Pour toutes les coordonnées de cases
-        for x in range(self.grid_size):
-            for y in range(self.grid_size):
-                rect = self.all_cell_rect[x][y]
-
-                # affichage d'une case déverrouillée
-                if self.game.sudoku.grid.get_cell_state((x, y)) != "superlocked" and (x, y) != self.game.sudoku.selected_cell:
-                    self.screen.blit(self.cell_image, rect)
-
-                # Affichage d'une case sélectionnée
-                elif self.game.sudoku.grid.get_cell_state((x, y)) != "superlocked" and (x, y) == self.game.sudoku.selected_cell:
-                    self.screen.blit(self.selected_cell_image, rect)
-
-                # Affichage d'une case superlocked
-                elif self.game.sudoku.grid.get_cell_state((x, y)) == "superlocked" and (x, y) != self.game.sudoku.selected_cell:
-                    self.screen.blit(self.superlocked_cell_image, rect)
-
-                # Affichage d'une case superlocked et sélectionnée
-                else:
-                    self.screen.blit(self.superlocked_selected_cell_image, rect)
-
-        # affichage du chiffre de chaque case
-        for x in range(self.grid_size):
-            for y in range(self.grid_size):
-                self.display_cell_digit((x, y))
-                
-                # affichage du cadenas si la case est verrouillée
-                if self.game.sudoku.grid.get_cell((x, y)).state == "locked":
-                    self.screen.blit(self.padlock_image, self.all_cell_rect[x][y])
+        # Pour toutes les cases dont l'affichage a changé (valeur, état, sélection ou conflit)
+        for index, coordinates in enumerate(self.unit_tables.all_coordinates):
+            if self.get_cell_appearance(index) != self.displayed_cells[index]:
+                self.display_cell(coordinates)
         
         # mettre à jour la fenêtre (mise à jour effective des modifications)
-        pygame.display.flip()
+        self.end_display()
     
     def display_options_elements(self):
         """
         Permet d'afficher les élément du menu d'options à l'écran
         """
         
-        # Affichage du fond d'écran
-        self.screen.blit(self.background, self.background_rect)
+        self.begin_display("options")
         
         # Affichage des boutons
         
         mouse_pos = pygame.mouse.get_pos()
-
+        
         # bouton quitter le menu options
         if self.cross_options_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.cross_selected_options_button, self.cross_options_button_rect)
+            self.display_element("cross_options", self.cross_selected_options_button, self.cross_options_button_rect)
         else:
-            self.screen.blit(self.cross_options_button, self.cross_options_button_rect)
+            self.display_element("cross_options", self.cross_options_button, self.cross_options_button_rect)
         
         # boutons dimension
         if self.dimensions_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.dimensions_selected_button, self.dimensions_button_rect)
+            self.display_element("dimensions", self.dimensions_selected_button, self.dimensions_button_rect)
         else:
             
-            self.screen.blit(self.dimensions_button, self.dimensions_button_rect)
-            
+            self.display_element("dimensions", self.dimensions_button, self.dimensions_button_rect)
+        
         # bouton générer
         if self.generate_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.generate_selected_button, self.generate_button_rect)
+            self.display_element("generate", self.generate_selected_button, self.generate_button_rect)
         else:
-            self.screen.blit(self.generate_button, self.generate_button_rect)
+            self.display_element("generate", self.generate_button, self.generate_button_rect)
+        
+        # boutton curseur, le fond du curseur est redessiné lorsque le curseur se déplace
+        if self.displayed_elements.get("cursor") != (self.cursor_button, tuple(self.cursor_button_rect)):
+            self.displayed_elements.pop("cursor_background", None)
+        self.display_element("cursor_background", self.cursor_background_button, self.cursor_background_button_rect)
+        self.display_element("cursor", self.cursor_button, self.cursor_button_rect)
         
-        # boutton curseur
-        self.screen.blit(self.cursor_background_button, self.cursor_background_button_rect)
-        self.screen.blit(self.cursor_button, self.cursor_button_rect)
-            
         # bouton mode de jeu (joueur ou éditeur)
         if self.game_mode_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.game_mode_selected_button, self.game_mode_button_rect)
+            self.display_element("game_mode", self.game_mode_selected_button, self.game_mode_button_rect)
         else:
-            self.screen.blit(self.game_mode_button, self.game_mode_button_rect)
-            
+            self.display_element("game_mode", self.game_mode_button, self.game_mode_button_rect)
+        
         # bouton changer de textures
         if self.change_textures_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.change_textures_selected_button, self.change_textures_button_rect)
+            self.display_element("change_textures", self.change_textures_selected_button, self.change_textures_button_rect)
         else:
-            self.screen.blit(self.change_textures_button, self.change_textures_button_rect)
+            self.display_element("change_textures", self.change_textures_button, self.change_textures_button_rect)
         
         # bouton activer / désactiver la musique
         if self.play_music_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.play_music_selected_button, self.play_music_button_rect)
+            self.display_element("play_music", self.play_music_selected_button, self.play_music_button_rect)
         else:
-            self.screen.blit(self.play_music_button, self.play_music_button_rect)
+            self.display_element("play_music", self.play_music_button, self.play_music_button_rect)
         # bouton afficher / cacher les erreurs
         if self.display_errors_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.display_errors_selected_button, self.display_errors_button_rect)
+            self.display_element("display_errors", self.display_errors_selected_button, self.display_errors_button_rect)
         else:
-            self.screen.blit(self.display_errors_button, self.display_errors_button_rect)
-            
+            self.display_element("display_errors", self.display_errors_button, self.display_errors_button_rect)
+        
         # bouton afficher / cacher l'affichage des cases durant la résolution
         if self.display_solving_button_rect.collidepoint(mouse_pos):
-            self.screen.blit(self.display_solving_selected_button, self.display_solving_button_rect)
+            self.display_element("display_solving", self.display_solving_selected_button, self.display_solving_button_rect)
         else:
-            self.screen.blit(self.display_solving_button, self.display_solving_button_rect)
- 
+            self.display_element("display_solving", self.display_solving_button, self.display_solving_button_rect)
+        
         # mise à jour effective des modifications
-        pygame.display.flip()
+        self.end_display()
     
     def display_cell_elements(self, coordinates: tuple[int, int]):
         """
-        mise à jour rapide d'une case uniquement, utilisée lors de la résolution
+        mise à jour rapide d'une case et de ses voisines uniquement, utilisée lors de la résolution
+        Seule la zone des cases modifiées est mise à jour dans la fenêtre
         :param coordinates: coordonnées de la case à mettre à jour
         """
         # Test de préconditions
-        test_errors(self.grid_size, coordinates = coordinates)
-        
-        x, y = coordinates
+        test_internal_errors(self.grid_size, coordinates = coordinates)
         
-        # mettre à jour une portion de l'écran
-        self.screen.blit(self.cell_image, self.all_cell_rect[x][y])
+        # la fenêtre doit être entièrement redessinée (redimensionnement, changement de menu)
+        if self.is_full_redraw_needed or self.displayed_menu != "game":
+            self.display_game_elements()
+            return
         
-        # Affichage du cadenas si la case est "locked"
-        if self.game.sudoku.grid.get_cell_state(coordinates) == "locked":
-            self.screen.blit(self.padlock_image, self.all_cell_rect[x][y])
+        index = coordinates[0] * self.grid_size + coordinates[1]
         
-        # affichage du chiffre de la case
-        self.display_cell_digit(coordinates)
+        # la case et ses voisines, dont l'affichage des conflits peut avoir changé
+        for cell_index in (index,) + self.unit_tables.peers[index]:
+            if self.get_cell_appearance(cell_index) != self.displayed_cells[cell_index]:
+                self.display_cell(self.unit_tables.all_coordinates[cell_index])
         
         # mise à jour effective des modifications
-        pygame.display.flip()
+        self.end_display()
     
     def display_cell_digit(self, coordinates):
         """
         Permet d'afficher une valeur particulière dans une case
         """
         
-        test_errors(self.grid_size, coordinates = coordinates)
+        test_internal_errors(self.grid_size, coordinates = coordinates)
         
         # valeur à mettre
-        digit = self.game.sudoku.grid.get_cell_value(coordinates)
-
+        digit = self.game.sudoku.grid.get_cell_value_unchecked(coordinates)
+        
         # case vide, rien à afficher
         if digit == '0':
             return
         
         # si la case n'est pas dans un conflit, affiche rla première ilage, sinon l'image avec la valeur en rouge
-        if not self.game.sudoku.grid.is_cell_in_conflict(coordinates) or not self.do_display_conflicts:
+        if not self.game.sudoku.grid.is_cell_in_conflict_unchecked(coordinates) or not self.do_display_conflicts:
             digit_image = self.all_digits_image[self.game.possible_values.index(digit)]
         else:
-            digit_image = self.all_digits_image[self.game.possible_values.index(digit) + len(self.game.possible_values)]
+            digit_image = self.all_digits_image[self.game.possible_values.index(digit) + self.grid_size]
         x, y = coordinates
         
         # modifier la portion concernée
@@ -379,15 +502,15 @@ class Graphism:
             digit_image,
             self.all_cell_rect[x][y]
         ) 
-
-
+    
+    
     def update_rect(self):
         """
         Calcule des dimensions et des coordonnées des éléments de la fenêtre
         """
         
         # défini l'icone du jeu
-        self.icon = pygame.image.load(f"src/graphics/{self.texture_pack}/icon.png")
+        self.icon = self.image_cache.get_original(self.texture_pack, "icon.png")
         pygame.display.set_icon(self.icon)
         
         # Test si la longueur de référence doit être la longueur ou la largeur de l'écran
@@ -409,19 +532,14 @@ class Graphism:
         # Ratio entre la longueur du grand carré et de la marge
         self.outline_thickness = self.rect_ref_distance / 30
         
-        # Calcule les dimensions et les coordonnées des boutons du menu de démarrage
-        self.update_start_buttons_rect()
-        # Calcule les dimensions et les coordonnées des boutons du menu principal
-        self.update_game_buttons_rect()
-        # Calcule les dimensions et les coordonnées des boutons du menu options
-        self.update_options_buttons_rect()
-        
-        # chargemement et lecture du son d'ambiance
-        self.load_audio("audio/background_music.mp3")
-        
-        # Lancer la musique
-        if self.do_play_music:
-            self.play_audio()
+        # chargemement et lecture du son d'ambiance, uniquement au démarrage et au changement de pack de textures
+        if self.audio_texture_pack != self.texture_pack:
+            self.audio_texture_pack = self.texture_pack
+            self.load_audio("audio/background_music.mp3")
+            
+            # Lancer la musique
+            if self.do_play_music:
+                self.play_audio()
         
         # image fond d'écran
         self.background = self.load_image("background.png", background_dimensions)
@@ -431,17 +549,49 @@ class Graphism:
         self.background_rect.x = self.screen.get_width() / 2 - background_dimensions[0] / 2
         self.background_rect.y = self.screen.get_height() / 2 - background_dimensions[1] / 2
         
-        # image fond de la grille
-        self.grid_background = self.load_image("grid_background.png", [self.rect_ref_distance] * 2)
+        # les images des menus sont rechargées lors de leur prochaine utilisation, sauf celles du menu affiché
+        self.loaded_menus.clear()
+        
+        if self.displayed_menu is not None:
+            self.load_menu(self.displayed_menu)
+        
+        # les dimensions et les images ont changé, toute la fenêtre est redessinée
+        self.invalidate_display()
+    
+    def load_menu(self, menu: str):
+        """
+        Charge les images et calcule les rectangles des éléments du menu "menu" ("start", "game" ou "options"),
+        s'ils n'ont pas été chargés depuis le dernier appel à update_rect
+        """
+        
+        if menu in self.loaded_menus:
+            return
+        
+        if menu == "start":
+            # Calcule les dimensions et les coordonnées des boutons du menu de démarrage
+            self.update_start_buttons_rect()
+        
+        elif menu == "game":
+            # Calcule les dimensions et les coordonnées des boutons du menu principal
+            self.update_game_buttons_rect()
+            
+            # image fond de la grille
+            self.grid_background = self.load_image("grid_background.png", [self.rect_ref_distance] * 2)
+            
+            # rectangle de l'image du fond de la grille
+            self.grid_background_rect = self.grid_background.get_rect()
+            self.grid_background_rect.x = self.screen.get_width() * (1 / 2) - self.rect_ref_distance * (1 / 4)
+            self.grid_background_rect.y = self.screen.get_height() * (1 / 2) - self.rect_ref_distance * (1 / 2)
+            
+            # Charge toutes les images possibles pour chaque case
+            self.update_cells()
+            self.update_digits()
         
-        # rectangle de l'image du fond de la grille
-        self.grid_background_rect = self.grid_background.get_rect()
-        self.grid_background_rect.x = self.screen.get_width() * (1 / 2) - self.rect_ref_distance * (1 / 4)
-        self.grid_background_rect.y = self.screen.get_height() * (1 / 2) - self.rect_ref_distance * (1 / 2)
+        elif menu == "options":
+            # Calcule les dimensions et les coordonnées des boutons du menu options
+            self.update_options_buttons_rect()
         
-        # Charge toutes les images possibles pour chaque case
-        self.update_cells()
-        self.update_digits()
+        self.loaded_menus.add(menu)
     
     def update_cells(self):
         """
@@ -459,7 +609,6 @@ class Graphism:
         
         # image d'une case sélectionnée
         self.selected_cell_image = self.load_image("cells/selected_cell.png", self.cell_dimensions)
-        self.selected_cell_image = pygame.transform.smoothscale(self.selected_cell_image, self.cell_dimensions)
         
         # image d'une case superverrouillée et sélectionnée
         self.superlocked_selected_cell_image = self.load_image("cells/superlocked_selected_cell.png", self.cell_dimensions)
@@ -467,15 +616,18 @@ class Graphism:
         # image du cadenas
         self.padlock_image = self.load_image("/cells/padlock.png", [self.cell_image.get_width() / 2.3] * 2)
         
-        # calcul des coordonnées pour chaque case
-        self.all_cell_rect = [[
-            pygame.Rect([
-                self.grid_background_rect.x + self.outline_thickness * (1 + x // self.square_size) + x * self.cell_image.get_width(),
-                self.grid_background_rect.y + self.outline_thickness * (1 + y // self.square_size) + y * self.cell_image.get_height(),
+        # calcul des coordonnées pour chaque case, la position du carré de la case donne le nombre de bordures à décaler
+        self.all_cell_rect = [[] for _ in range(self.grid_size)]
+        
+        for index, (x, y) in enumerate(self.unit_tables.all_coordinates):
+            square_x, square_y = self.unit_tables.square_positions[index]
+            
+            self.all_cell_rect[x].append(pygame.Rect([
+                self.grid_background_rect.x + self.outline_thickness * (1 + square_x) + x * self.cell_image.get_width(),
+                self.grid_background_rect.y + self.outline_thickness * (1 + square_y) + y * self.cell_image.get_height(),
                 self.cell_image.get_width(),
                 self.cell_image.get_height()
-            ])
-        for y in range(self.grid_size)] for x in range(self.grid_size)]
+            ]))
     
     def update_digits(self):
         """
@@ -484,34 +636,72 @@ class Graphism:
         
         self.all_digits_image: list[pygame.Surface] = []
         
-        # balaye parmi les valeurs possibles pour ce sudoku "value", et parmi les deux types d'image,
+        # balaye parmi les valeurs possibles pour la taille de la grille "value", et parmi les deux types d'image,
         # les "regular" (normales) et les "wrong" (mal placées)
         for color in ["regular", "wrong"]:
-            for value in self.game.possible_values:
-                digit_image = self.load_image(f"digits/{value}_{color}.png", self.cell_dimensions)
+            for value in self.game.possible_values[:self.grid_size]:
+                # valeurs au delà de "G" : pas d'image dans les packs de textures, la valeur est dessinée
+                # dans la couleur des chiffres du pack
+                if os.path.exists(f"src/graphics/{self.texture_pack}/digits/{value}_{color}.png"):
+                    digit_image = self.load_image(f"digits/{value}_{color}.png", self.cell_dimensions)
+                else:
+                    digit_image = self.image_cache.get_text_image(
+                        self.texture_pack, value, self.image_cache.get_average_color(self.texture_pack, f"digits/1_{color}.png"),
+                        self.cell_dimensions
+                    )
+                
                 self.all_digits_image.append(digit_image)
     
+    def load_dimensions_button(self, is_selected: bool) -> pygame.Surface:
+        """
+        Charge l'image du bouton dimensions pour la taille actuelle de la grille
+        Les grilles de plus de 16x16 n'ont pas d'image dans les packs de textures, leur bouton est dessiné
+        """
+        
+        filepath = f"buttons/options/dimensions_{self.grid_size}{'_selected' if is_selected else ''}.png"
+        
+        if os.path.exists(f"src/graphics/{self.texture_pack}/{filepath}"):
+            return self.load_image(filepath, self.options_buttons_dimensions)
+        
+        return self.image_cache.get_text_image(
+            self.texture_pack, f"DIMENSIONS : {self.grid_size}x{self.grid_size}",
+            (255, 255, 255) if is_selected else (200, 200, 200), self.options_buttons_dimensions,
+            "buttons/options/cursor_background.png"
+        )
+    
     def update_dimensions_button(self):
         """
         Mettre à jour le bouton dimensions uniquement
         """
         
-        self.dimensions_button = self.load_image(f"buttons/options/dimensions_{self.grid_size}.png", self.options_buttons_dimensions)
-        self.dimensions_selected_button = self.load_image(f"buttons/options/dimensions_{self.grid_size}_selected.png", self.options_buttons_dimensions)
+        # le menu options n'est pas chargé, le bouton sera chargé avec le menu
+        if "options" not in self.loaded_menus:
+            return
+        
+        self.dimensions_button = self.load_dimensions_button(False)
+        self.dimensions_selected_button = self.load_dimensions_button(True)
     
     def update_game_mode_button(self):
         """
         Mettre à jour le bouton mode de jeu uniquement
         """
         
-        self.game_mode_button = self.load_image(f"/buttons/options/game_mode_{self.game.sudoku.game_mode}.png", self.options_buttons_dimensions)
+        # le menu options n'est pas chargé, le bouton sera chargé avec le menu
+        if "options" not in self.loaded_menus:
+            return
+        
+        self.game_mode_button = self.load_image(f"buttons/options/game_mode_{self.game.sudoku.game_mode}.png", self.options_buttons_dimensions)
         self.game_mode_selected_button = self.load_image(f"buttons/options/game_mode_{self.game.sudoku.game_mode}_selected.png", self.options_buttons_dimensions)
     
     def update_play_music_buton(self):
         """
         Mettre à jour le bouton activer / désactiver la musique uniquement
         """
-
+        
+        # le menu options n'est pas chargé, le bouton sera chargé avec le menu
+        if "options" not in self.loaded_menus:
+            return
+        
         self.play_music_button = self.load_image(f"buttons/options/play_music_{'on' if self.do_play_music else 'off'}.png", self.options_buttons_dimensions)
         self.play_music_selected_button = self.load_image(f"buttons/options/play_music_{'on' if self.do_play_music else 'off'}_selected.png", self.options_buttons_dimensions)
     
@@ -520,6 +710,10 @@ class Graphism:
         Mettre à jour le bouton afficher / cacher les erreurs uniquement
         """
         
+        # le menu options n'est pas chargé, le bouton sera chargé avec le menu
+        if "options" not in self.loaded_menus:
+            return
+        
         self.display_errors_button = self.load_image(f"buttons/options/display_errors_{'on' if self.do_display_conflicts else 'off'}.png", self.options_buttons_dimensions)
         self.display_errors_selected_button = self.load_image(f"buttons/options/display_errors_{'on' if self.do_display_conflicts else 'off'}_selected.png", self.options_buttons_dimensions)
     
@@ -528,6 +722,10 @@ class Graphism:
         Mettre à jour le bouton afficher / cacher l'affichage durant la résolution uniquement
         """
         
+        # le menu options n'est pas chargé, le bouton sera chargé avec le menu
+        if "options" not in self.loaded_menus:
+            return
+        
         self.display_solving_button = self.load_image(f"buttons/options/display_solving_{'on' if self.game.do_display_during_solving else 'off'}.png", self.options_buttons_dimensions)
         self.display_solving_selected_button = self.load_image(f"buttons/options/display_solving_{'on' if self.game.do_display_during_solving else 'off'}_selected.png", self.options_buttons_dimensions)
     
@@ -536,13 +734,13 @@ class Graphism:
         Calcule les dimensions et les coordonnées des boutons du menu de démarrage
         """
         
-        # image bouton jouer - reference pour la taille pour le calcul
-        self.play_button = pygame.image.load(f"src/graphics/{self.texture_pack}/buttons/start/play.png")
+        # dimensions de l'image du bouton jouer - reference pour la taille pour le calcul
+        play_button_width, play_button_height = self.image_cache.get_original_size(self.texture_pack, "buttons/start/play.png")
         
         # dimensions des boutons du menu démarrer
         self.start_buttons_dimensions = [
             self.rect_ref_distance - self.outline_thickness,
-            (self.rect_ref_distance - self.outline_thickness) * (self.play_button.get_height() / self.play_button.get_width())
+            (self.rect_ref_distance - self.outline_thickness) * (play_button_height / play_button_width)
         ]
         
         # ccordonnées des boutons du menu démarrer
@@ -555,7 +753,7 @@ class Graphism:
         buttons_gap = (self.rect_ref_distance - self.start_buttons_dimensions[1]) / 5
         
         # redimensionnement du bouton
-        self.play_button = pygame.transform.smoothscale(self.play_button, self.start_buttons_dimensions)
+        self.play_button = self.load_image("buttons/start/play.png", self.start_buttons_dimensions)
         
         # bouton jouer sélectionné
         self.play_selected_button = self.load_image("buttons/start/play_selected.png", self.start_buttons_dimensions)
@@ -603,13 +801,13 @@ class Graphism:
         Calcule les dimensions et les coordonnées des bouttons du menu principal
         """
         
-        # image bouton ouvrir - sert taille reference pour calcul taille
-        self.open_button = pygame.image.load(f"src/graphics/{self.texture_pack}/buttons/game/open.png")
-
+        # dimensions de l'image du bouton ouvrir - sert taille reference pour calcul taille
+        open_button_width, open_button_height = self.image_cache.get_original_size(self.texture_pack, "buttons/game/open.png")
+        
         # calcul la taille des boutons
         self.game_buttons_dimensions = [
             self.rect_ref_distance / 2 - self.outline_thickness,
-            (self.rect_ref_distance / 2 - self.outline_thickness) * (self.open_button.get_height() / self.open_button.get_width())
+            (self.rect_ref_distance / 2 - self.outline_thickness) * (open_button_height / open_button_width)
         ]
         
         # calcul les coordonnées des boutons
@@ -620,10 +818,10 @@ class Graphism:
         
         # espace vertical entre les boutons
         buttons_gap = (self.rect_ref_distance - self.game_buttons_dimensions[1]) / 5
-
+        
         # redimensionnement bouton ouvrir
-        self.open_button = pygame.transform.smoothscale(self.open_button, self.game_buttons_dimensions)
-
+        self.open_button = self.load_image("buttons/game/open.png", self.game_buttons_dimensions)
+        
         # image bouton
         self.open_selected_button = self.load_image("buttons/game/open_selected.png", self.game_buttons_dimensions)
         
@@ -631,19 +829,19 @@ class Graphism:
         self.open_button_rect = self.open_button.get_rect()
         self.open_button_rect.x = ref_coordinates[0]
         self.open_button_rect.y = ref_coordinates[1] + buttons_gap
-
+        
         # image bouton sauvegarder
         self.save_button = self.load_image("buttons/game/save.png", self.game_buttons_dimensions)
-
+        
         # image bouton sauvegarder sélectionnée
         self.save_selected_button = self.load_image("buttons/game/save_selected.png", self.game_buttons_dimensions)
-
+        
         # rectangle bouton sauvegarder
         self.save_button_rect = self.save_button.get_rect()
         self.save_button_rect.x = ref_coordinates[0]
         self.save_button_rect.y = ref_coordinates[1] + buttons_gap * 2
-
-
+        
+        
         # image bouton résoudre
         self.solve_button = self.load_image("buttons/game/solve.png", self.game_buttons_dimensions)
         
@@ -701,7 +899,7 @@ class Graphism:
         self.cross_button_rect = self.cross_button.get_rect()
         self.cross_button_rect.x = ref_coordinates[0] + self.game_buttons_dimensions[0] / 2 - self.game_buttons_dimensions[1] / 2
         self.cross_button_rect.y = ref_coordinates[1]
-
+        
         # image bouton rétablir
         self.arrow_right_button = self.load_image("buttons/game/arrow_right.png", [self.game_buttons_dimensions[1]] * 2)
         
@@ -721,13 +919,15 @@ class Graphism:
         Calcule les dimensions et les coordonnées des boutons du menu d'options
         """
         
-        # image bouton dimensions - sert de reference pour la taille
-        self.dimensions_button = pygame.image.load(f"src/graphics/{self.texture_pack}/buttons/options/dimensions_{self.grid_size}.png")
+        # dimensions de l'image du bouton dimensions - sert de reference pour la taille, identiques pour toutes les tailles de grille
+        dimensions_button_width, dimensions_button_height = self.image_cache.get_original_size(
+            self.texture_pack, "buttons/options/dimensions_4.png"
+        )
         
         # dimensions des boutons
         self.options_buttons_dimensions = [
             (self.rect_ref_distance - self.outline_thickness) * (3 / 4),
-            (self.rect_ref_distance - self.outline_thickness) * (3 / 4) * self.dimensions_button.get_height() / self.dimensions_button.get_width()
+            (self.rect_ref_distance - self.outline_thickness) * (3 / 4) * dimensions_button_height / dimensions_button_width
         ]
         
         # espace vertical entre les boutons
@@ -740,10 +940,10 @@ class Graphism:
         ]
         
         # redimensionnement du bouton dimensions
-        self.dimensions_button = pygame.transform.smoothscale(self.dimensions_button, self.options_buttons_dimensions)
+        self.dimensions_button = self.load_dimensions_button(False)
         
         # image bouton dimensions sélectionnée
-        self.dimensions_selected_button = self.load_image(f"buttons/options/dimensions_{self.grid_size}_selected.png", self.options_buttons_dimensions)
+        self.dimensions_selected_button = self.load_dimensions_button(True)
         
         # rectangle bouton dimensions
         self.dimensions_button_rect = self.dimensions_button.get_rect()
@@ -818,7 +1018,7 @@ class Graphism:
         self.play_music_button_rect = self.play_music_button.get_rect()
         self.play_music_button_rect.x = ref_coordinates_right[0]
         self.play_music_button_rect.y = ref_coordinates_right[1] + buttons_gap * 2
-
+        
         # image bouton afficher erreurs
         self.display_errors_button = self.load_image(f"buttons/options/display_errors_{'on' if self.do_display_conflicts else 'off'}.png", self.options_buttons_dimensions)
         
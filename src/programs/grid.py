@@ -1,22 +1,57 @@
+# import des librairies
+import copy
+
 # nos modules
 from src.programs.cell import Cell
-from src.programs.test_errors import test_errors
+from src.programs.test_errors import all_possible_values, test_errors, test_internal_errors
+from src.programs.units import get_unit_tables
 
 
 class Grid:
     """
     La class "Grid" permet de stocker et de gérer le contenu de la grille du sudoku
+    Les valeurs, les états et les conflits des cases sont stockés dans des tableaux d'octets (bytearray),
+    la case (x, y) se trouve à l'index "x * size + y"
+    Les méthodes "..._unchecked" sont les chemins rapides utilisés par le solveur, la génération et l'affichage :
+    elles ne sont vérifiées qu'au niveau de validation "debug"
     """
     
     def __init__(self, size: int):
         test_errors(size)
         
+        self.possible_values = all_possible_values
+        # états possibles des cases, l'index de l'état correspond au code stocké dans self.states
+        self.all_states = ("unlocked", "locked", "superlocked")
+        # dictionnaire permettant de convertir un état en son code
+        self.state_codes = {state: code for code, state in enumerate(self.all_states)}
+        
+        self.update_size_attributes(size)
+    
+    def update_size_attributes(self, size: int):
+        """
+        Met à jour les attributs dépendant de la taille de la grille et vide la grille
+        """
+        
         self.size = size
         self.square_size = int(self.size ** 0.5)
         self.cells_count = self.size ** 2 # nombre total de cases
-        self.possible_values = "123456789ABCDEFG"
         
-        self.content = [[Cell("0", "unlocked", self.size) for y in range(self.size)] for x in range(self.size)]
+        # tables précalculées des groupes et des voisins des cases
+        self.unit_tables = get_unit_tables(self.size)
+        
+        # symboles de la grille, l'index du symbole correspond au code stocké dans self.values ("0" = case vide)
+        self.symbols = "0" + self.possible_values[:self.size]
+        # dictionnaire permettant de convertir une valeur en son code
+        self.value_codes = {value: code for code, value in enumerate(self.symbols)}
+        
+        # contenu de la grille : code de la valeur, code de l'état et conflit (0 ou 1) de chaque case
+        self.values = bytearray(self.cells_count)
+        self.states = bytearray(self.cells_count)
+        self.conflicts = bytearray(self.cells_count)
+        
+        # masques de bits des valeurs utilisées pour chaque ligne, colonne et carré
+        # le bit n°i est à 1 si la valeur self.possible_values[i] est présente dans le groupe
+        self.update_masks()
     
     def copy(self):
         """
@@ -24,11 +59,21 @@ class Grid:
         Permet de créer un nouvel objet Grid avec les mêmes attributs
         """
         
-        copied_grid = Grid(self.size)
-        copied_grid.set_content(self.get_all_values(), self.get_all_states())
+        # copie superficielle : les tables et les dictionnaires de conversion (en lecture seule) sont partagés entre les copies
+        copied_grid = copy.copy(self)
+        
+        # copie directe des tableaux, le contenu a déjà été vérifié lors de son écriture dans cette grille
+        copied_grid.values = self.values.copy()
+        copied_grid.states = self.states.copy()
+        copied_grid.conflicts = self.conflicts.copy()
         
-        # Test postconditions
-        test_errors(self.size, list_values = copied_grid.get_all_values(), list_states = copied_grid.get_all_states())
+        copied_grid.lines_mask = self.lines_mask.copy()
+        copied_grid.columns_mask = self.columns_mask.copy()
+        copied_grid.squares_mask = self.squares_mask.copy()
+        
+        copied_grid.lines_count = self.lines_count.copy()
+        copied_grid.columns_count = self.columns_count.copy()
+        copied_grid.squares_count = self.squares_count.copy()
         
         return copied_grid
     
@@ -40,20 +85,134 @@ class Grid:
         # Test préconditions
         test_errors(size, list_values = list_values, list_states = list_states)
         
-        self.size = size
-        self.square_size = int(size ** 0.5)
-        self.cells_count = size ** 2        
-        
+        self.update_size_attributes(size)
         self.set_content(list_values, list_states)
+    
+    def update_masks(self):
+        """
+        Recalcule entièrement les masques de bits et les compteurs de valeurs de chaque ligne, colonne et carré
+        """
+        
+        # masque contenant un bit à 1 pour chaque valeur possible de la grille
+        self.full_mask = (1 << self.size) - 1
+        # dictionnaire permettant de convertir une valeur en son bit, "0" (case vide) ne correspond à aucun bit
+        self.value_bits = {value: (1 << code) >> 1 for code, value in enumerate(self.symbols)}
+        
+        self.lines_mask = [0] * self.size
+        self.columns_mask = [0] * self.size
+        self.squares_mask = [0] * self.size
+        
+        # nombre d'occurrences de chaque code de valeur dans chaque groupe, à l'index "groupe * (size + 1) + code"
+        # permet de ne retirer un bit du masque que lorsque la dernière occurrence de la valeur dans le groupe est effacée
+        # (cas des grilles en conflit)
+        self.lines_count = bytearray(self.size * (self.size + 1))
+        self.columns_count = bytearray(self.size * (self.size + 1))
+        self.squares_count = bytearray(self.size * (self.size + 1))
+        
+        for index, code in enumerate(self.values):
+            self.add_value_to_masks(index, code)
+    
+    def add_value_to_masks(self, index: int, code: int):
+        """
+        Ajoute le code de valeur "code" de la case d'index "index" aux masques de sa ligne, de sa colonne et de son carré
+        """
+        
+        # case vide, aucun masque à modifier
+        if not code:
+            return
+        
+        bit = 1 << (code - 1)
+        line, column, square = self.unit_tables.cell_groups[index]
+        
+        for masks, counts, group in (
+            (self.lines_mask, self.lines_count, line),
+            (self.columns_mask, self.columns_count, column),
+            (self.squares_mask, self.squares_count, square)
+        ):
+            counts[group * (self.size + 1) + code] += 1
+            masks[group] |= bit
+    
+    def remove_value_from_masks(self, index: int, code: int):
+        """
+        Retire le code de valeur "code" de la case d'index "index" des masques de sa ligne, de sa colonne et de son carré
+        """
+        
+        # case vide, aucun masque à modifier
+        if not code:
+            return
+        
+        bit = 1 << (code - 1)
+        line, column, square = self.unit_tables.cell_groups[index]
+        
+        for masks, counts, group in (
+            (self.lines_mask, self.lines_count, line),
+            (self.columns_mask, self.columns_count, column),
+            (self.squares_mask, self.squares_count, square)
+        ):
+            counts[group * (self.size + 1) + code] -= 1
+            
+            # dernière occurrence de la valeur dans le groupe
+            if not counts[group * (self.size + 1) + code]:
+                masks[group] &= ~bit
+    
+    def is_index_in_conflict(self, index: int) -> bool:
+        """
+        Renvoi True si la valeur de la case d'index "index" apparait plusieurs fois sur sa ligne, sa colonne ou dans son carré
+        """
+        
+        code = self.values[index]
+        
+        # une case vide n'est jamais en conflit
+        if not code:
+            return False
         
+        line, column, square = self.unit_tables.cell_groups[index]
+        
+        return (
+            self.lines_count[line * (self.size + 1) + code] > 1
+            or self.columns_count[column * (self.size + 1) + code] > 1
+            or self.squares_count[square * (self.size + 1) + code] > 1
+        )
+    
+    def update_conflicts(self):
+        """
+        Recalcule entièrement l'état de conflit de chaque case, utilisé lorsque tout le contenu de la grille est remplacé
+        """
+        
+        self.conflicts = bytearray(self.is_index_in_conflict(index) for index in range(self.cells_count))
+    
+    def update_conflicts_around(self, index: int, old_code: int, new_code: int):
+        """
+        Met à jour l'état de conflit après le changement de valeur de la case d'index "index" (de "old_code" à "new_code")
+        Seules les cases de sa ligne, de sa colonne et de son carré ayant l'ancienne ou la nouvelle valeur peuvent changer d'état
+        """
+        
+        values = self.values
+        groups_indexes = self.unit_tables.groups_indexes
+        
+        for format, group in zip(("lines", "columns", "squares"), self.unit_tables.cell_groups[index]):
+            for peer in groups_indexes[format][group]:
+                if values[peer] and (values[peer] == old_code or values[peer] == new_code):
+                    self.conflicts[peer] = self.is_index_in_conflict(peer)
+        
+        # la case elle-même, si elle a été vidée
+        self.conflicts[index] = self.is_index_in_conflict(index)
+    
+    def get_conflicting_cells(self) -> set[tuple[int, int]]:
+        """
+        Renvoi l'ensemble des coordonnées des cases en conflit
+        """
+        
+        return {self.unit_tables.all_coordinates[index] for index, is_in_conflict in enumerate(self.conflicts) if is_in_conflict}
+    
     def get_cell(self, coordinates: tuple[int, int]) -> Cell:
         """
-        Renvoi la case de coordonnées (x, y)
+        Renvoi la case de coordonnées (x, y), sous forme d'une vue sur le contenu de la grille
         """
         
         test_errors(self.size, coordinates = coordinates)
-
-        return self.content[coordinates[0]][coordinates[1]]
+        
+        return Cell(self, coordinates)
     
     def set_content(self, list_values: list[list[str]], list_states: list[list[str]]):
         """
@@ -62,33 +221,53 @@ class Grid:
         
         test_errors(self.size, list_values = list_values, list_states = list_states)
         
-        self.content.clear()
-        for x in range(self.size):
-            self.content.append([])
-            for y in range(self.size):
-                cell = Cell(list_values[x][y], list_states[x][y], self.size)
-                self.content[x].append(cell)
+        self.values = bytearray(self.value_codes[value] for line in list_values for value in line)
+        self.states = bytearray(self.state_codes[state] for line in list_states for state in line)
+        
+        # le contenu a été entièrement remplacé, les masques et les conflits doivent être recalculés
+        self.update_masks()
+        self.update_conflicts()
+    
+    def set_values_codes(self, values, states = None):
+        """
+        Remplace les valeurs de la grille par les codes "values" (0 = case vide), rangés par index, sans vérification
+        Les états sont aussi remplacés par les codes "states" s'ils sont donnés
+        Utilisé par les processus de résolution et l'historique, qui stockent les grilles sous forme d'octets
+        """
+        
+        self.values = bytearray(values)
+        
+        if states is not None:
+            self.states = bytearray(states)
+        
+        # le contenu a été entièrement remplacé, les masques et les conflits doivent être recalculés
+        self.update_masks()
+        self.update_conflicts()
     
     def get_all_values(self) -> list[list[str]]:
         """
         Renvoie une double liste contenant toutes les valeurs de la grille
         """
         
-        return [[cell.value for cell in line] for line in self.content]
-
+        return [
+            [self.symbols[code] for code in self.values[x * self.size:(x + 1) * self.size]] for x in range(self.size)
+        ]
+    
     def get_all_states(self) -> list[list[str]]:
         """
         Renvois une double liste contenant toutes les états des cases de la grille
         """
         
-        return [[cell.state for cell in line] for line in self.content]
+        return [
+            [self.all_states[code] for code in self.states[x * self.size:(x + 1) * self.size]] for x in range(self.size)
+        ]
     
-    def get_all_coordinates_simple_list(self) -> list[tuple[int, int]]:
+    def get_all_coordinates_simple_list(self) -> tuple[tuple[int, int], ...]:
         """
         Retourne une liste (simple) de toutes les coordonnées de la grille
         """
-        return [(x, y) for x in range(0, self.size) for y in range(0, self.size)]
-
+        return self.unit_tables.all_coordinates
+    
     def set_cell_value(self, coordinates: tuple[int, int], value: str):
         """
         Met la case de coordonnées (x, y) à la valeur "value"
@@ -97,8 +276,46 @@ class Grid:
         # Test préconditions
         test_errors(self.size, coordinates = coordinates, value = value)
         
-        self.content[coordinates[0]][coordinates[1]].set_value(value)
+        self.set_cell_value_unchecked(coordinates, value)
+    
+    def set_cell_value_unchecked(self, coordinates: tuple[int, int], value: str):
+        """
+        Met la case de coordonnées (x, y) à la valeur "value", sans vérification
+        """
+        
+        test_internal_errors(self.size, coordinates = coordinates, value = value)
         
+        index = coordinates[0] * self.size + coordinates[1]
+        code = self.value_codes[value]
+        old_code = self.values[index]
+        
+        if code == old_code:
+            return
+        
+        # met à jour les masques de la ligne, de la colonne et du carré de la case
+        self.remove_value_from_masks(index, old_code)
+        self.add_value_to_masks(index, code)
+        
+        self.values[index] = code
+        
+        # met à jour les conflits de la ligne, de la colonne et du carré de la case
+        self.update_conflicts_around(index, old_code, code)
+    
+    def set_cell_code_unchecked(self, index: int, code: int):
+        """
+        Met la case d'index "index" au code de valeur "code" (0 = case vide), sans vérification
+        Chemin le plus rapide, utilisé par le cœur de résolution qui travaille directement sur les index et les codes
+        Les conflits ne sont pas mis à jour : le solveur ne travaille que sur des grilles sans conflit,
+        où il ne pose que des valeurs possibles
+        """
+        
+        test_internal_errors(self.size, coordinates = self.unit_tables.all_coordinates[index], value = self.symbols[code])
+        
+        self.remove_value_from_masks(index, self.values[index])
+        self.add_value_to_masks(index, code)
+        
+        self.values[index] = code
+    
     def get_cell_value(self, coordinates: tuple[int, int]) -> str:
         """
         Renvoi la valeur de la case de coordonnées (x, y)
@@ -106,8 +323,17 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates)
         
-        return self.content[coordinates[0]][coordinates[1]].value
+        return self.get_cell_value_unchecked(coordinates)
+    
+    def get_cell_value_unchecked(self, coordinates: tuple[int, int]) -> str:
+        """
+        Renvoi la valeur de la case de coordonnées (x, y), sans vérification
+        """
+        
+        test_internal_errors(self.size, coordinates = coordinates)
         
+        return self.symbols[self.values[coordinates[0] * self.size + coordinates[1]]]
+    
     def set_cell_state(self, coordinates: tuple[int, int], state: str):
         """
         Met l'état de la case de coordonnées "coordinates" à "state"
@@ -115,7 +341,16 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates, state = state)
         
-        self.content[coordinates[0]][coordinates[1]].set_state(state)
+        self.set_cell_state_unchecked(coordinates, state)
+    
+    def set_cell_state_unchecked(self, coordinates: tuple[int, int], state: str):
+        """
+        Met l'état de la case de coordonnées "coordinates" à "state", sans vérification
+        """
+        
+        test_internal_errors(self.size, coordinates = coordinates, state = state)
+        
+        self.states[coordinates[0] * self.size + coordinates[1]] = self.state_codes[state]
     
     def get_cell_state(self, coordinates: tuple[int, int]) -> str:
         """
@@ -124,17 +359,16 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates)
         
-        return self.content[coordinates[0]][coordinates[1]].state
+        return self.get_cell_state_unchecked(coordinates)
     
-    def set_cell_conflicting_state(self, coordinates: tuple[int, int], conflicting_state: bool):
+    def get_cell_state_unchecked(self, coordinates: tuple[int, int]) -> str:
         """
-        Met la variable indiquant si la case est en conflit ou non à l'état indiqué
+        Renvoi l'état de la case de coordonnées (x, y), sans vérification
         """
-
-        # Test préconditions
-        test_errors(boolean = conflicting_state)
         
-        self.content[coordinates[0]][coordinates[1]].set_conflicting_state(conflicting_state)
+        test_internal_errors(self.size, coordinates = coordinates)
+        
+        return self.all_states[self.states[coordinates[0] * self.size + coordinates[1]]]
     
     def is_cell_in_conflict(self, coordinates: tuple[int, int]) -> bool:
         """
@@ -143,8 +377,16 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates)
         
-        x, y = coordinates
-        return self.content[x][y].is_in_conflict
+        return self.is_cell_in_conflict_unchecked(coordinates)
+    
+    def is_cell_in_conflict_unchecked(self, coordinates: tuple[int, int]) -> bool:
+        """
+        Renvois si la case est en conflit avec d'autres ou non, sans vérification
+        """
+        
+        test_internal_errors(self.size, coordinates = coordinates)
+        
+        return bool(self.conflicts[coordinates[0] * self.size + coordinates[1]])
     
     def get_coordinates_as(self, coordinates: tuple[int, int], input_format: str, output_format: str) -> tuple[int, int]:
         """
@@ -154,30 +396,10 @@ class Grid:
         test_errors(self.size, coordinates = coordinates, format = input_format)
         test_errors(format = output_format)
         
-        match input_format:
-            
-            case "columns":
-                coordinates = (coordinates[1], coordinates[0])
-            
-            case "squares":
-                coordinates = (
-                    (coordinates[0] // self.square_size) * self.square_size + coordinates[1] // self.square_size,
-                    (coordinates[0] % self.square_size) * self.square_size + coordinates[1] % self.square_size
-                )
+        # coordonnées (x, y) de la case à partir de son groupe et de sa position dans le groupe
+        x, y = self.unit_tables.groups_coordinates[input_format][coordinates[0]][coordinates[1]]
         
-        match output_format:
-            
-            case "lines":
-                return coordinates
-            
-            case "columns":
-                return (coordinates[1], coordinates[0])
-            
-            case "squares":
-                return (
-                    (coordinates[0] // self.square_size) * self.square_size + coordinates[1] // self.square_size,
-                    (coordinates[0] % self.square_size) * self.square_size + coordinates[1] % self.square_size
-                )
+        return self.unit_tables.formated_coordinates[output_format][x * self.size + y]
     
     def get_all_values_as(self, format: str) -> list[list[str]]:
         """
@@ -187,23 +409,17 @@ class Grid:
         test_errors(format = format)
         
         return [
-            [
-                self.get_cell_value(self.get_coordinates_as((x, y), format, "lines")) for y in range(self.size)
-            ] for x in range(self.size)
+            [self.symbols[self.values[index]] for index in group] for group in self.unit_tables.groups_indexes[format]
         ]
-        
-    def get_all_coordinates_as(self, format: str) -> list[list[tuple[int, int]]]:
+    
+    def get_all_coordinates_as(self, format: str) -> tuple[tuple[tuple[int, int], ...], ...]:
         """
         Renvois les coordonnées des cases de la grilles ordonnées en lignes, colonnes ou carrés (argument "format")
         """
         
         test_errors(format = format)
         
-        return [
-            [
-                self.get_coordinates_as((x, y), format, "lines") for y in range(self.size)
-            ] for x in range(self.size)
-        ]
+        return self.unit_tables.groups_coordinates[format]
     
     def get_group_values(self, coordinates: tuple[int, int], format: str) -> list[str]:
         """
@@ -213,13 +429,12 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates, format = format)
         
-        formated_coordinates = self.get_coordinates_as(coordinates, "lines", format)
+        # numéro du groupe de la case dans le format demandé
+        group = self.unit_tables.formated_coordinates[format][coordinates[0] * self.size + coordinates[1]][0]
         
-        return [
-            self.get_cell_value(self.get_coordinates_as((formated_coordinates[0], y), format, "lines")) for y in range(self.size)
-        ]
+        return [self.symbols[self.values[index]] for index in self.unit_tables.groups_indexes[format][group]]
     
-    def get_group_coordinates(self, coordinates: tuple[int, int], format: str) -> list[tuple[int, int]]:
+    def get_group_coordinates(self, coordinates: tuple[int, int], format: str) -> tuple[tuple[int, int], ...]:
         """
         Renvoi la liste des coordonnées des cases appartenant au même groupe que la case "coordinates"
         l'argument "format" indique le type de groupe à prendre en compte (ligne, colonne ou carré)
@@ -227,27 +442,38 @@ class Grid:
         
         test_errors(self.size, coordinates = coordinates, format = format)
         
-        formated_coordinates = self.get_coordinates_as(coordinates, "lines", format)
+        # numéro du groupe de la case dans le format demandé
+        group = self.unit_tables.formated_coordinates[format][coordinates[0] * self.size + coordinates[1]][0]
         
-        return [self.get_coordinates_as((formated_coordinates[0], y), format, "lines") for y in range(self.size)]
+        return self.unit_tables.groups_coordinates[format][group]
     
-    def get_all_empty_cells(self) -> list[tuple[int, int]]:
+    def get_peers_coordinates(self, coordinates: tuple[int, int]) -> tuple[tuple[int, int], ...]:
         """
-        Renvoi la liste des coordonnées des cases vides de la grille
+        Renvoi les coordonnées des cases voisines de la case "coordinates" (même ligne, même colonne ou même carré, sans la case elle-même)
         """
         
-        all_empty_cells = []
+        test_errors(self.size, coordinates = coordinates)
         
-        # Pour toutes les cases de la grille
-        for y in range(self.size):
-            for x in range(self.size):
-                coordinates = (x, y)
-                
-                if self.get_cell_value(coordinates) == '0':  # Si la valeur de la case est zéro
-                    test_errors(self.size, coordinates = coordinates)
-                    all_empty_cells.append(coordinates)  # Ajouter à la liste des cases vides les coordonnées (x, y)
+        return self.get_peers_coordinates_unchecked(coordinates)
+    
+    def get_peers_coordinates_unchecked(self, coordinates: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+        """
+        Renvoi les coordonnées des cases voisines de la case "coordinates", sans vérification
+        """
+        
+        test_internal_errors(self.size, coordinates = coordinates)
         
-        return all_empty_cells
+        return self.unit_tables.peers_coordinates[coordinates[0] * self.size + coordinates[1]]
+    
+    def get_all_empty_cells(self) -> list[tuple[int, int]]:
+        """
+        Renvoi la liste des coordonnées des cases vides de la grille
+        """
+        
+        # Pour toutes les cases de la grille, colonne par colonne, ajouter les coordonnées (x, y) des cases dont la valeur est zéro
+        return [
+            (x, y) for y in range(self.size) for x in range(self.size) if not self.values[x * self.size + y]
+        ]
     
     def get_first_empty_cell(self) -> tuple[int, int]:
         """
@@ -257,10 +483,7 @@ class Grid:
         # Pour toutes les cases de la grille
         for y in range(self.size):
             for x in range(self.size):
-                coordinates = (x, y)
-                
-                if self.get_cell_value(coordinates) == '0':  # Dès qu'une case vide est rencontrée
-                    test_errors(self.size, coordinates = coordinates)
+                if not self.values[x * self.size + y]:  # Dès qu'une case vide est rencontrée
                     return (x, y)  # Renvoyer les coordonnées (x, y)
     
     def get_possible_values(self, coordinates: tuple[int, int]) -> list[str]:
@@ -271,38 +494,47 @@ class Grid:
         # Test préconditions
         test_errors(self.size, coordinates = coordinates)
         
-        possible_values = [digit for digit in self.possible_values[:self.size]]
+        return self.get_possible_values_unchecked(coordinates)
+    
+    def get_possible_values_unchecked(self, coordinates: tuple[int, int]) -> list[str]:
+        """
+        Renvoi les valeurs possibles de la case "coordinates", sans vérification
+        """
         
-        # Pour tout les formats existants
-        for format in ["lines", "columns", "squares"]:
-            group = self.get_group_values(coordinates, format)
-            
-            for cell_value in group:
-                if cell_value in possible_values:
-                    possible_values.remove(cell_value)
+        test_internal_errors(self.size, coordinates = coordinates)
+        
+        possible_mask = self.get_possible_values_mask(coordinates)
+        
+        return [digit for digit in self.possible_values[:self.size] if possible_mask & self.value_bits[digit]]
+    
+    def get_possible_values_mask(self, coordinates: tuple[int, int]) -> int:
+        """
+        Renvoi le masque de bits des valeurs possibles de la case "coordinates"
+        Le bit n°i est à 1 si la valeur self.possible_values[i] n'est présente ni sur la ligne, ni sur la colonne, ni dans le carré de la case
+        """
+        
+        line, column, square = self.unit_tables.cell_groups[coordinates[0] * self.size + coordinates[1]]
         
-        return possible_values
+        return self.full_mask & ~(self.lines_mask[line] | self.columns_mask[column] | self.squares_mask[square])
     
     def is_full(self) -> bool:
         """
         Renvoie True si la grille est remplie, et False si elle ne l'est pas
         """
         
-        for x in range(self.size):
-            for y in range(self.size):
-                if self.get_cell_value((x, y)) == "0":
-                    return False
-        
-        return True
-
+        return 0 not in self.values
+    
     def is_empty(self) -> bool:
         """
         Renvoie True si la grille est vide, et False si elle ne l'est pas
         """
         
-        for x in range(self.size):
-            for y in range(self.size):
-                if self.get_cell_value((x, y)) != "0":
-                    return False
+        return not any(self.values)
+    
+    def is_valid(self) -> bool:
+        """
+        Renvoie True si aucune valeur n'apparait plusieurs fois dans une même ligne, colonne ou carré
+        """
         
-        return True
\ No newline at end of file
+        # les compteurs de valeurs de chaque groupe ne dépassent 1 que si la grille contient un doublon
+        return max(self.lines_count) <= 1 and max(self.columns_count) <= 1 and max(self.squares_count) <= 1
@@ -0,0 +1,180 @@
+# import des librairies
+from array import array
+
+# nos modules
+from src.programs.grid import Grid
+
+
+class HistoryDiff:
+    """
+    La classe "HistoryDiff" contient les modifications de la grille effectuées par une action :
+    index des cases modifiées, anciens et nouveaux codes des valeurs et des états, ancienne et nouvelle sélection
+    Les codes sont stockés dans des tableaux d'octets, beaucoup plus compacts qu'une copie de la grille
+    """
+    
+    __slots__ = ("indexes", "old_values", "new_values", "old_states", "new_states", "old_selection", "new_selection")
+    
+    def __init__(
+        self, old_values: bytes, new_values: bytes, old_states: bytes, new_states: bytes,
+        old_selection: tuple[int, int], new_selection: tuple[int, int]
+    ):
+        """
+        Calcule les modifications entre l'ancien et le nouveau contenu de la grille
+        """
+        
+        # index des cases dont la valeur ou l'état a changé
+        self.indexes = array("H", [
+            index for index in range(len(new_values))
+            if old_values[index] != new_values[index] or old_states[index] != new_states[index]
+        ])
+        
+        self.old_values = bytes(old_values[index] for index in self.indexes)
+        self.new_values = bytes(new_values[index] for index in self.indexes)
+        self.old_states = bytes(old_states[index] for index in self.indexes)
+        self.new_states = bytes(new_states[index] for index in self.indexes)
+        
+        self.old_selection = old_selection
+        self.new_selection = new_selection
+    
+    def get_size(self) -> int:
+        """
+        Renvoi la place occupée par les modifications, en octets (approximation sans les en-têtes des objets)
+        """
+        
+        return self.indexes.itemsize * len(self.indexes) + 4 * len(self.old_values)
+
+
+class History:
+    """
+    La classe "History" stocke l'historique de la grille sous forme de modifications (HistoryDiff) entre deux états successifs
+    Un état complet (image clé) est conservé toutes les "keyframe_interval" actions, pour se déplacer rapidement dans l'historique
+    Le nombre d'actions conservées est limité à "max_depth", les plus anciennes sont supprimées par blocs de "keyframe_interval"
+    Les déplacements modifient directement la grille, sans la remplacer
+    """
+    
+    def __init__(self, grid: Grid, selection: tuple[int, int], max_depth: int = 500, keyframe_interval: int = 50):
+        """
+        :param grid: grille suivie par l'historique, son contenu actuel devient le premier état de l'historique
+        :param selection: case sélectionnée dans le premier état
+        :param max_depth: nombre maximal d'actions conservées
+        :param keyframe_interval: nombre d'actions entre deux images clés
+        """
+        
+        assert type(max_depth) == int and max_depth >= 1, f'The "max_depth" argument must be a positive integer (value : {max_depth})'
+        assert type(keyframe_interval) == int and keyframe_interval >= 1, \
+            f'The "keyframe_interval" argument must be a positive integer (value : {keyframe_interval})'
+        
+        self.grid = grid
+        self.max_depth = max_depth
+        # une image clé au moins tous les "max_depth" états, pour que les actions les plus anciennes puissent être supprimées
+        self.keyframe_interval = min(keyframe_interval, max_depth)
+        
+        # modifications entre deux états successifs, diffs[i] passe de l'état i à l'état i + 1
+        self.diffs: list[HistoryDiff] = []
+        # images clés : codes des valeurs et des états de l'état "k * keyframe_interval", et case sélectionnée
+        self.keyframes: list[tuple[bytes, bytes, tuple[int, int]]] = [(bytes(grid.values), bytes(grid.states), selection)]
+        # indique à quel état de l'historique correspond la grille
+        self.index = 0
+        
+        # contenu de la grille à l'état courant, sert de référence pour calculer la prochaine modification
+        self.reference_values = bytes(grid.values)
+        self.reference_states = bytes(grid.states)
+        self.reference_selection = selection
+    
+    def get_length(self) -> int:
+        """
+        Renvoi le nombre d'états de l'historique
+        """
+        
+        return len(self.diffs) + 1
+    
+    def get_size(self) -> int:
+        """
+        Renvoi la place occupée par les modifications et les images clés, en octets (approximation)
+        """
+        
+        return sum(diff.get_size() for diff in self.diffs) + sum(len(values) * 2 for values, _, _ in self.keyframes)
+    
+    def save(self, selection: tuple[int, int]):
+        """
+        Ajoute l'état actuel de la grille à l'historique, à la suite de l'état courant
+        """
+        
+        # Si l'utilisateur est remonté dans l'historique, effacer les états de la grille qui ont été annulés
+        if self.index < len(self.diffs):
+            del self.diffs[self.index:]
+            del self.keyframes[self.index // self.keyframe_interval + 1:]
+        
+        values, states = bytes(self.grid.values), bytes(self.grid.states)
+        
+        self.diffs.append(
+            HistoryDiff(self.reference_values, values, self.reference_states, states, self.reference_selection, selection)
+        )
+        self.index = len(self.diffs)
+        
+        self.reference_values, self.reference_states, self.reference_selection = values, states, selection
+        
+        # nouvelle image clé
+        if self.index % self.keyframe_interval == 0:
+            self.keyframes.append((values, states, selection))
+        
+        # limite de profondeur dépassée, supprime le bloc d'actions le plus ancien (la deuxième image clé devient le premier état)
+        if len(self.diffs) > self.max_depth and len(self.keyframes) > 1:
+            del self.diffs[:self.keyframe_interval]
+            del self.keyframes[0]
+            self.index -= self.keyframe_interval
+    
+    def apply_diff(self, diff: HistoryDiff, do_undo: bool):
+        """
+        Applique une modification à la grille, en avant (nouveaux codes) ou en arrière (anciens codes)
+        """
+        
+        all_values = diff.old_values if do_undo else diff.new_values
+        all_states = diff.old_states if do_undo else diff.new_states
+        all_coordinates = self.grid.unit_tables.all_coordinates
+        
+        for position, index in enumerate(diff.indexes):
+            coordinates = all_coordinates[index]
+            # la grille met à jour ses masques et ses conflits
+            self.grid.set_cell_value_unchecked(coordinates, self.grid.symbols[all_values[position]])
+            self.grid.states[index] = all_states[position]
+    
+    def move_to(self, index: int) -> tuple[int, int]:
+        """
+        Met la grille dans l'état "index" de l'historique
+        Part de l'état courant ou de l'image clé la plus proche, selon le nombre de modifications à appliquer
+        Renvoi la case sélectionnée dans cet état
+        """
+        
+        assert type(index) == int and 0 <= index < self.get_length(), \
+            f'The "index" argument must be between 0 and {self.get_length() - 1} (value : {index})'
+        
+        # la grille a été modifiée sans être enregistrée dans l'historique, elle est remise dans l'état courant
+        if self.grid.values != self.reference_values or self.grid.states != self.reference_states:
+            self.grid.set_values_codes(self.reference_values, self.reference_states)
+        
+        keyframe_number = index // self.keyframe_interval
+        keyframe_index = keyframe_number * self.keyframe_interval
+        
+        # repartir de l'image clé demande moins de modifications que de partir de l'état courant
+        if index - keyframe_index < abs(index - self.index):
+            values, states, selection = self.keyframes[keyframe_number]
+            self.grid.set_values_codes(values, states)
+            self.index = keyframe_index
+        
+        while self.index < index:
+            self.apply_diff(self.diffs[self.index], False)
+            self.index += 1
+        
+        while self.index > index:
+            self.index -= 1
+            self.apply_diff(self.diffs[self.index], True)
+        
+        if index == 0:
+            selection = self.keyframes[0][2]
+        else:
+            selection = self.diffs[index - 1].new_selection
+        
+        self.reference_values, self.reference_states, self.reference_selection = bytes(self.grid.values), bytes(self.grid.states), selection
+        
+        return selection
@@ -0,0 +1,303 @@
+# import des librairies
+from collections import OrderedDict
+import os
+import pygame
+
+
+def get_surface_bytes(surface: pygame.Surface) -> int:
+    """
+    Renvoi la place occupée par les pixels d'une image, en octets
+    """
+    
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def convert_surface(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Convertit une image au format de pixels de la fenêtre, en gardant la transparence si l'image en a une
+    L'image n'est pas convertie si la fenêtre n'a pas encore été créée
+    """
+    
+    if pygame.display.get_surface() is None:
+        return surface
+    
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    
+    return surface.convert()
+
+
+def get_png_size(filepath: str) -> tuple[int, int] | None:
+    """
+    Lit les dimensions d'une image PNG dans son en-tête, sans décoder l'image
+    Renvoi None si le fichier n'est pas une image PNG
+    """
+    
+    with open(filepath, "rb") as file:
+        header = file.read(24)
+    
+    # signature PNG, puis bloc IHDR contenant la largeur et la hauteur
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        return None
+    
+    return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+
+
+class ImageCache:
+    """
+    La classe "ImageCache" charge les images des packs de textures et garde en mémoire :
+    - les images originales, décodées une seule fois par fichier
+    - les images redimensionnées, identifiées par (pack de textures, chemin, dimensions),
+      les moins récemment utilisées sont supprimées au delà de "max_scaled_bytes" octets
+    Les images redimensionnées sont aussi enregistrées sans compression dans "disk_folder", identifiées en plus
+    par la date de modification de l'image originale : les lancements suivants n'ont ni à décoder ni à redimensionner les images
+    Les images sont converties au format de pixels de la fenêtre, pour accélérer leur affichage
+    """
+    
+    def __init__(self, max_scaled_bytes: int = 64 * 1024 ** 2, disk_folder: str = None, max_disk_bytes: int = 256 * 1024 ** 2):
+        """
+        :param max_scaled_bytes: place maximale occupée en mémoire par les images redimensionnées, en octets
+        :param disk_folder: dossier du cache sur le disque (None = pas de cache sur le disque)
+        :param max_disk_bytes: place maximale occupée par le cache sur le disque, vérifiée à la création du cache, en octets
+        """
+        
+        assert type(max_scaled_bytes) == int and max_scaled_bytes >= 0, \
+            f'The "max_scaled_bytes" argument must be a positive integer (value : {max_scaled_bytes})'
+        assert type(max_disk_bytes) == int and max_disk_bytes >= 0, \
+            f'The "max_disk_bytes" argument must be a positive integer (value : {max_disk_bytes})'
+        
+        self.max_scaled_bytes = max_scaled_bytes
+        self.disk_folder = disk_folder
+        self.max_disk_bytes = max_disk_bytes
+        
+        # images originales, (pack de textures, chemin) -> image
+        self.all_originals: dict[tuple[str, str], pygame.Surface] = {}
+        # images redimensionnées, (pack de textures, chemin, dimensions) -> image, de la moins à la plus récemment utilisée
+        self.all_scaled: OrderedDict[tuple[str, str, tuple[int, int]], pygame.Surface] = OrderedDict()
+        # place occupée par les images redimensionnées, en octets
+        self.scaled_bytes = 0
+        
+        # nombre d'images redimensionnées trouvées dans le cache en mémoire / sur le disque / calculées
+        self.hits_count = 0
+        self.disk_hits_count = 0
+        self.misses_count = 0
+        
+        if self.disk_folder is not None:
+            self.prune_disk_cache()
+    
+    def get_original(self, texture_pack: str, filepath: str) -> pygame.Surface:
+        """
+        Renvoi l'image originale "filepath" du pack de textures, chargée depuis le disque lors du premier appel
+        :param filepath: chemin de l'image depuis le chemin relatif `src/graphics/{texture_pack}/`
+        """
+        
+        key = (texture_pack, filepath)
+        
+        if key not in self.all_originals:
+            self.all_originals[key] = convert_surface(pygame.image.load(f"src/graphics/{texture_pack}/{filepath}"))
+        
+        return self.all_originals[key]
+    
+    def get_scaled(self, texture_pack: str, filepath: str, dimensions: list[int, int] | list[float]) -> pygame.Surface:
+        """
+        Renvoi l'image "filepath" du pack de textures redimensionnée à "dimensions", calculée lors du premier appel
+        :param filepath: chemin de l'image depuis le chemin relatif `src/graphics/{texture_pack}/`
+        :param dimensions: dimensions de l'image, arrondies à l'entier inférieur comme par pygame.transform.smoothscale
+        """
+        
+        key = (texture_pack, filepath, (int(dimensions[0]), int(dimensions[1])))
+        
+        if key in self.all_scaled:
+            self.hits_count += 1
+            self.all_scaled.move_to_end(key)
+            return self.all_scaled[key]
+        
+        scaled_image = self.read_disk_image(key)
+        
+        if scaled_image is not None:
+            self.disk_hits_count += 1
+        
+        else:
+            self.misses_count += 1
+            scaled_image = pygame.transform.smoothscale(self.get_original(texture_pack, filepath), key[2])
+            self.write_disk_image(key, scaled_image)
+        
+        self.store_scaled(key, scaled_image)
+        
+        return scaled_image
+    
+    def store_scaled(self, key: tuple[str, str, tuple[int, int]], image: pygame.Surface):
+        """
+        Ajoute une image au cache en mémoire des images redimensionnées
+        """
+        
+        self.all_scaled[key] = image
+        self.scaled_bytes += get_surface_bytes(image)
+        
+        # supprime les images les moins récemment utilisées, en gardant au moins l'image demandée
+        while self.scaled_bytes > self.max_scaled_bytes and len(self.all_scaled) > 1:
+            _, removed_image = self.all_scaled.popitem(last=False)
+            self.scaled_bytes -= get_surface_bytes(removed_image)
+    
+    def get_average_color(self, texture_pack: str, filepath: str) -> tuple[int, int, int]:
+        """
+        Renvoi la couleur moyenne des pixels visibles de l'image originale "filepath" du pack de textures
+        """
+        
+        # moyenne pondérée par la transparence, les pixels transparents ne comptent pas
+        return tuple(pygame.transform.average_color(self.get_original(texture_pack, filepath), consider_alpha=True)[:3])
+    
+    def get_text_image(
+        self, texture_pack: str, text: str, color: tuple[int, int, int], dimensions: list[int, int] | list[float],
+        background_filepath: str = None
+    ) -> pygame.Surface:
+        """
+        Renvoi une image du texte "text" de couleur "color" dessinée à la demande, pour les éléments qui n'ont pas d'image
+        dans les packs de textures (valeurs et bouton des dimensions des grilles de plus de 16x16)
+        Le texte est centré sur l'image "background_filepath" du pack de textures redimensionnée, ou sur un fond transparent
+        L'image est gardée dans le cache en mémoire comme les images redimensionnées, mais pas dans le cache sur le disque
+        """
+        
+        key = (texture_pack, f"{text}|{color}|{background_filepath}", (int(dimensions[0]), int(dimensions[1])))
+        width, height = key[2]
+        
+        if key in self.all_scaled:
+            self.hits_count += 1
+            self.all_scaled.move_to_end(key)
+            return self.all_scaled[key]
+        
+        self.misses_count += 1
+        
+        if background_filepath is None:
+            text_image = pygame.Surface(key[2], pygame.SRCALPHA)
+        else:
+            text_image = self.get_scaled(texture_pack, background_filepath, key[2]).copy()
+        
+        if not pygame.font.get_init():
+            pygame.font.init()
+        
+        # hauteur du texte : 70 % de l'image, réduite si le texte est trop large
+        rendered_text = pygame.font.Font(None, max(int(height * 0.7), 1)).render(text, True, color)
+        
+        if rendered_text.get_width() > width * 0.9:
+            ratio = width * 0.9 / rendered_text.get_width()
+            rendered_text = pygame.transform.smoothscale(
+                rendered_text, (int(rendered_text.get_width() * ratio), int(rendered_text.get_height() * ratio))
+            )
+        
+        text_image.blit(rendered_text, rendered_text.get_rect(center=text_image.get_rect().center))
+        text_image = convert_surface(text_image)
+        
+        self.store_scaled(key, text_image)
+        
+        return text_image
+    
+    def get_original_size(self, texture_pack: str, filepath: str) -> tuple[int, int]:
+        """
+        Renvoi les dimensions de l'image originale "filepath" du pack de textures
+        Les dimensions d'une image PNG sont lues dans son en-tête, l'image n'est décodée que si elle n'est pas une PNG
+        """
+        
+        if (texture_pack, filepath) in self.all_originals:
+            return self.all_originals[texture_pack, filepath].get_size()
+        
+        return get_png_size(f"src/graphics/{texture_pack}/{filepath}") or self.get_original(texture_pack, filepath).get_size()
+    
+    def get_disk_path(self, key: tuple[str, str, tuple[int, int]]) -> str:
+        """
+        Renvoi le chemin du fichier du cache sur le disque d'une image redimensionnée
+        Le nom du fichier contient les dimensions et la date de modification de l'image originale,
+        une image originale modifiée n'utilise donc jamais une ancienne image du cache
+        """
+        
+        texture_pack, filepath, (width, height) = key
+        modification_time = os.stat(f"src/graphics/{texture_pack}/{filepath}").st_mtime_ns
+        filename = filepath.strip("/").replace("/", "-")
+        
+        return os.path.join(self.disk_folder, texture_pack, f"{filename}_{width}x{height}_{modification_time}.raw")
+    
+    def read_disk_image(self, key: tuple[str, str, tuple[int, int]]) -> pygame.Surface | None:
+        """
+        Lit une image redimensionnée dans le cache sur le disque
+        Renvoi None si l'image n'est pas dans le cache ou si le fichier n'est pas valide
+        """
+        
+        if self.disk_folder is None:
+            return None
+        
+        disk_path = self.get_disk_path(key)
+        
+        if not os.path.exists(disk_path):
+            return None
+        
+        try:
+            with open(disk_path, "rb") as file:
+                file_content = file.read()
+            
+            # premier octet : 1 si l'image a de la transparence, puis les pixels RGBA ou RGB
+            pixels_format = "RGBA" if file_content[:1] == b"\x01" else "RGB"
+            image = pygame.image.fromstring(file_content[1:], key[2], pixels_format)
+            
+            # date d'utilisation, les images les moins récemment utilisées sont supprimées en premier
+            os.utime(disk_path)
+        
+        except (OSError, ValueError) as error:
+            print(f"Invalid texture cache file {disk_path} ({error})")
+            return None
+        
+        return convert_surface(image)
+    
+    def write_disk_image(self, key: tuple[str, str, tuple[int, int]], image: pygame.Surface):
+        """
+        Enregistre une image redimensionnée dans le cache sur le disque, le cache est désactivé en cas d'erreur d'écriture
+        """
+        
+        if self.disk_folder is None:
+            return
+        
+        disk_path = self.get_disk_path(key)
+        has_alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        
+        try:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            
+            # écriture dans un fichier temporaire, un fichier incomplet n'est jamais lu
+            with open(disk_path + ".tmp", "wb") as file:
+                file.write(b"\x01" if has_alpha else b"\x00")
+                file.write(pygame.image.tostring(image, "RGBA" if has_alpha else "RGB"))
+            
+            os.replace(disk_path + ".tmp", disk_path)
+        
+        except OSError as error:
+            print(f"Texture cache disabled, could not write {disk_path} ({error})")
+            self.disk_folder = None
+    
+    def prune_disk_cache(self):
+        """
+        Supprime les fichiers les moins récemment utilisés du cache sur le disque, au delà de "max_disk_bytes" octets
+        """
+        
+        all_files = []
+        
+        for folder, _, all_filenames in os.walk(self.disk_folder):
+            for filename in all_filenames:
+                file_stat = os.stat(os.path.join(folder, filename))
+                all_files.append((file_stat.st_mtime, file_stat.st_size, os.path.join(folder, filename)))
+        
+        disk_bytes = sum(file_size for _, file_size, _ in all_files)
+        
+        for _, file_size, disk_path in sorted(all_files):
+            if disk_bytes <= self.max_disk_bytes:
+                break
+            
+            os.remove(disk_path)
+            disk_bytes -= file_size
+    
+    def clear(self):
+        """
+        Vide le cache, utilisé lorsque les fichiers des packs de textures ont pu être modifiés
+        """
+        
+        self.all_originals.clear()
+        self.all_scaled.clear()
+        self.scaled_bytes = 0
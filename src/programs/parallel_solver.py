@@ -0,0 +1,269 @@
+# import des librairies
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# nos modules
+from src.programs.grid import Grid
+from src.programs.solver import Solver, SolverStatistics
+from src.programs.test_errors import test_errors
+
+# évènement partagé par les processus de résolution, indique que les recherches en cours doivent s'arrêter
+stop_event = None
+
+
+def init_worker(event):
+    """
+    Initialise un processus de résolution : enregistre l'évènement d'arrêt partagé
+    """
+    
+    global stop_event
+    stop_event = event
+
+
+def search_subproblem(
+    size: int, values: bytes, engine: str, limit: int, do_keep_solution: bool
+) -> tuple[bytes | int | None, SolverStatistics]:
+    """
+    Fonction exécutée dans un processus de résolution, cherche les solutions d'un sous-problème
+    Renvoi (codes des valeurs de la solution ou None, statistiques de la recherche) si "do_keep_solution",
+    et (nombre de solutions, -1 si annulé, statistiques de la recherche) sinon
+    """
+    
+    grid = Grid(size)
+    grid.set_values_codes(values)
+    
+    # la recherche s'arrête dès qu'un autre processus a trouvé une solution ou atteint la limite
+    solver = Solver(grid, engine, lambda coordinates: stop_event.is_set(), 1024)
+    
+    if do_keep_solution:
+        return (bytes(grid.values) if solver.solve() else None), solver.get_statistics()
+    
+    return solver.count_solutions(limit), solver.get_statistics()
+
+
+class ParallelSolver(Solver):
+    """
+    La classe "ParallelSolver" répartit la recherche sur plusieurs processus :
+    les premiers niveaux de l'arbre de recherche (case ayant le moins de valeurs possibles x valeurs possibles)
+    sont développés en sous-problèmes indépendants, résolus par un ProcessPoolExecutor
+    Les processus sont créés lors de la première recherche et conservés jusqu'à l'appel de close()
+    """
+    
+    def __init__(
+        self, grid: Grid, engine: str = "backtracking", progress_callback = None,
+        callback_interval: int = 1, workers_count: int = 0
+    ):
+        """
+        :param workers_count: nombre de processus de résolution (0 = nombre de processeurs de la machine)
+        """
+        
+        super().__init__(grid, engine, progress_callback, callback_interval)
+        
+        assert type(workers_count) == int and workers_count >= 0, \
+            f'The "workers_count" argument must be a positive integer (value : {workers_count})'
+        
+        self.workers_count = workers_count or os.cpu_count() or 1
+        # nombre de sous-problèmes visé par processus, équilibre la charge entre les processus
+        self.subproblems_per_worker = 4
+        # nombre maximal de niveaux de l'arbre de recherche développés
+        self.max_split_depth = 4
+        # temps d'attente maximal (s) des résultats entre deux appels de "progress_callback"
+        self.polling_interval = 0.05
+        # nombre minimal de cases vides pour répartir une vérification de l'existence d'une solution (voir has_solution) :
+        # en dessous, la vérification est plus courte que le découpage en sous-problèmes (quelques millisecondes)
+        self.min_parallel_empty_cells = 200
+        
+        self.executor = None
+        self.stop_event = None
+    
+    def close(self):
+        """
+        Arrête les processus de résolution
+        """
+        
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+    
+    def get_executor(self) -> ProcessPoolExecutor:
+        """
+        Renvoi le ProcessPoolExecutor, créé lors du premier appel
+        """
+        
+        if self.executor is None:
+            # "spawn" : les processus ne copient pas la fenêtre pygame du processus courant
+            context = multiprocessing.get_context("spawn")
+            self.stop_event = context.Event()
+            self.executor = ProcessPoolExecutor(
+                self.workers_count, mp_context=context, initializer=init_worker, initargs=(self.stop_event,)
+            )
+        
+        return self.executor
+    
+    def split_grid(self) -> list[bytes]:
+        """
+        Développe les premiers niveaux de l'arbre de recherche de la grille
+        Renvoi la liste des sous-problèmes (codes des valeurs de la grille), les branches sans solution sont écartées
+        """
+        
+        subproblems_count = self.workers_count * self.subproblems_per_worker
+        subproblems = [bytes(self.grid.values)]
+        
+        for _ in range(self.max_split_depth):
+            if len(subproblems) >= subproblems_count:
+                break
+            
+            next_subproblems = []
+            
+            for values in subproblems:
+                grid = Grid(self.grid.size)
+                grid.set_values_codes(values)
+                solver = Solver(grid)
+                
+                # déductions logiques (voir Solver.propagate), la branche est écartée si elle n'a pas de solution
+                solver.init_candidates()
+                is_contradictory = solver.propagate()
+                self.add_statistics(solver.get_statistics())
+                
+                if is_contradictory:
+                    continue
+                
+                best_cell = solver.get_best_cell(False)
+                
+                # grille remplie, le sous-problème est déjà une solution
+                if best_cell is None:
+                    next_subproblems.append(bytes(grid.values))
+                    continue
+                
+                # un sous-problème par valeur possible de la case ayant le moins de valeurs possibles
+                index, possible_mask = best_cell
+                for code in range(1, grid.size + 1):
+                    if possible_mask >> (code - 1) & 1:
+                        grid.set_cell_code_unchecked(index, code)
+                        next_subproblems.append(bytes(grid.values))
+            
+            # aucune case n'a pu être développée
+            if next_subproblems == subproblems:
+                break
+            
+            subproblems = next_subproblems
+        
+        return subproblems
+    
+    def run_subproblems(self, limit: int, do_keep_solution: bool) -> bytes | int | None:
+        """
+        Résout les sous-problèmes de la grille dans les processus de résolution
+        Renvoi la première solution trouvée (codes des valeurs) ou None si "do_keep_solution",
+        et le nombre de solutions (arrêt dès que "limit" est atteint, -1 si annulé) sinon
+        """
+        
+        starting_time = time.perf_counter()
+        subproblems = self.split_grid()
+        self.add_phase_time("split", starting_time)
+        
+        starting_time = time.perf_counter()
+        executor = self.get_executor()
+        
+        all_futures = {
+            executor.submit(search_subproblem, self.grid.size, values, self.engine, limit, do_keep_solution)
+            for values in subproblems
+        }
+        
+        solution_values = None
+        solutions_count = 0
+        
+        while all_futures:
+            done_futures, all_futures = wait(all_futures, self.polling_interval, FIRST_COMPLETED)
+            
+            for future in done_futures:
+                result, statistics = future.result()
+                self.add_statistics(statistics)
+                
+                if do_keep_solution:
+                    solution_values = solution_values or result
+                elif result != -1:
+                    solutions_count += result
+            
+            # la première solution trouvée, ou la limite atteinte, arrête les autres processus
+            if solution_values is not None or (limit and solutions_count >= limit):
+                break
+            
+            # suivi de l'avancement // anti freeze de la fenêtre
+            if self.progress_callback is not None and self.progress_callback(self.grid.unit_tables.all_coordinates[0]):
+                self.stop("cancelled")
+            
+            # limites du calcul (voir Solver.set_limits), les noeuds des processus ne sont comptés qu'à la fin de leur sous-problème
+            if self.check_limits():
+                break
+        
+        # arrête les recherches en cours, puis attend la fin des processus avant de réarmer l'évènement
+        if all_futures:
+            self.stop_event.set()
+            for future in all_futures:
+                future.cancel()
+            wait(all_futures)
+            self.stop_event.clear()
+        
+        self.add_phase_time("search", starting_time)
+        
+        if do_keep_solution:
+            return solution_values
+        
+        return -1 if self.is_cancelled else solutions_count
+    
+    def solve(self, do_choice_randomly: bool = False) -> bool:
+        """
+        Résout la grille sur plusieurs processus, les valeurs trouvées sont placées dans les cases vides
+        Le choix aléatoire (génération d'une grille complète) reste dans le processus courant, il ne revient jamais en arrière
+        """
+        
+        # Test préconditions
+        test_errors(boolean = do_choice_randomly)
+        
+        if do_choice_randomly or not self.grid.is_valid():
+            return super().solve(do_choice_randomly)
+        
+        solution_values = self.run_subproblems(1, True)
+        
+        if solution_values is None:
+            return False
+        
+        # les noeuds des processus sont déjà comptés
+        self.copy_solution(solution_values)
+        
+        return True
+    
+    def has_solution(self) -> bool:
+        """
+        Renvoi True si la grille a au moins une solution, la grille n'est pas modifiée
+        Utilisé par la génération pour vérifier l'unicité de la solution après chaque retrait (voir Solver.has_other_solution) :
+        la recherche est répartie sur plusieurs processus à partir de "min_parallel_empty_cells" cases vides,
+        les vérifications plus courtes restent dans le processus courant
+        """
+        
+        if self.grid.values.count(0) < self.min_parallel_empty_cells:
+            return super().has_solution()
+        
+        return self.run_subproblems(1, True) is not None
+    
+    def count_solutions(self, limit: int = 0) -> int:
+        """
+        Compte les solutions de la grille sur plusieurs processus, la grille n'est pas modifiée
+        Les nombres de solutions des sous-problèmes sont additionnés, le comptage s'arrête dès que "limit" est atteint
+        """
+        
+        assert type(limit) == int and limit >= 0, f'The "limit" argument must be a positive integer (value : {limit})'
+        
+        # une grille contenant des doublons n'a pas de solution
+        if not self.grid.is_valid():
+            return 0
+        
+        solutions_count = self.run_subproblems(limit, False)
+        
+        # plusieurs processus peuvent finir en même temps, le résultat est le même qu'une recherche séquentielle
+        if limit and solutions_count > limit:
+            return limit
+        
+        return solutions_count
@@ -0,0 +1,101 @@
+# import des librairies
+import os
+import sys
+
+# symboles acceptés pour une case vide dans le format une grille par ligne
+empty_symbols = "0."
+# dictionnaire permettant de convertir un chiffre entre 0 et 2 d'un fichier .sdk en état de case
+load_state_conversion = {"0": "unlocked", "1": "locked", "2": "superlocked"}
+
+
+def read_sdk_file(filepath: str) -> tuple[int, list[list[str]], list[list[str]]]:
+    """
+    Lit un fichier .sdk : taille de la grille, valeurs puis états, séparés par une ligne vide
+    Renvoi la taille de la grille, la liste des valeurs et la liste des états
+    """
+    
+    with open(filepath, "r") as file:
+        file_content = file.read().split("\n\n")
+    
+    grid_size = int(file_content[0])
+    all_values = [[value for value in line] for line in file_content[1].split("\n")]
+    all_states = [[load_state_conversion[state] for state in line] for line in file_content[2].split("\n")]
+    
+    return grid_size, all_values, all_states
+
+
+def parse_puzzle_line(line: str) -> tuple[int, list[list[str]], list[list[str]]]:
+    """
+    Lit une grille écrite sur une seule ligne, case par case et ligne par ligne ("0" ou "." pour une case vide)
+    La taille de la grille est déduite de la longueur de la ligne (16, 81, 256, 625 cases...), toutes les cases sont déverrouillées
+    Les lettres sont lues en majuscules jusqu'aux grilles 25x25, les minuscules sont des valeurs différentes au delà de 35 valeurs
+    Renvoi la taille de la grille, la liste des valeurs et la liste des états
+    """
+    
+    grid_size = int(len(line) ** 0.5)
+    
+    if grid_size ** 2 != len(line):
+        raise ValueError(f"The puzzle must contain a square number of cells (length : {len(line)})")
+    
+    if grid_size <= 35:
+        line = line.upper()
+    
+    all_values = [
+        ["0" if value in empty_symbols else value for value in line[x * grid_size:(x + 1) * grid_size]]
+        for x in range(grid_size)
+    ]
+    all_states = [["unlocked"] * grid_size for _ in range(grid_size)]
+    
+    return grid_size, all_values, all_states
+
+
+def iter_puzzle_lines(file, source_name: str):
+    """
+    Générateur renvoyant chaque grille d'un fichier au format une grille par ligne, sous la forme (nom, grille, erreur)
+    Les lignes vides et les commentaires (commençant par "#") sont ignorés
+    """
+    
+    for line_number, line in enumerate(file, 1):
+        line = line.strip()
+        
+        if not line or line.startswith("#"):
+            continue
+        
+        try:
+            yield f"{source_name}:{line_number}", parse_puzzle_line(line), None
+        except ValueError as error:
+            yield f"{source_name}:{line_number}", None, str(error)
+
+
+def iter_puzzles(all_paths: list[str]):
+    """
+    Générateur renvoyant au fur et à mesure chaque grille des chemins "all_paths", sous la forme (nom, grille, erreur)
+    La grille est (taille, valeurs, états), ou None si elle n'a pas pu être lue, l'erreur est alors indiquée
+    Un chemin peut être un fichier .sdk, un fichier au format une grille par ligne, un dossier (fichiers .sdk et .txt)
+    ou "-" pour l'entrée standard (une grille par ligne)
+    """
+    
+    for path in all_paths:
+        if path == "-":
+            yield from iter_puzzle_lines(sys.stdin, "stdin")
+            continue
+        
+        # fichiers du dossier, dans l'ordre alphabétique
+        if os.path.isdir(path):
+            all_filepaths = [
+                os.path.join(path, filename) for filename in sorted(os.listdir(path))
+                if filename.endswith((".sdk", ".txt"))
+            ]
+        else:
+            all_filepaths = [path]
+        
+        for filepath in all_filepaths:
+            if filepath.endswith(".sdk"):
+                try:
+                    yield filepath, read_sdk_file(filepath), None
+                except (ValueError, KeyError, IndexError) as error:
+                    yield filepath, None, f"Invalid .sdk file ({error!r})"
+            
+            else:
+                with open(filepath, "r") as file:
+                    yield from iter_puzzle_lines(file, filepath)
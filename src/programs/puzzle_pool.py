@@ -0,0 +1,324 @@
+# import des librairies
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+# nos modules
+from src.programs.difficulty_rater import rate_grid
+from src.programs.grid import Grid
+from src.programs.solver import Solver, max_difficulty, min_difficulty
+from src.programs.transformations import get_random_variant
+
+# dossier des grilles pré-générées, un fichier par taille et par niveau de difficulté
+puzzle_pool_folder = "src/cache/puzzles"
+# tailles de grilles et niveaux de difficulté des grilles pré-générées
+all_pool_sizes = [4, 9, 16]
+all_difficulty_buckets = [0.3, 0.4, 0.5, 0.6, 0.7]
+# notes (voir difficulty_rater) attendues pour chaque niveau de difficulté : le nombre de cases retirées ne suffit pas,
+# une grille facile peut demander des essais, et une grille difficile n'avoir besoin que de valeurs évidentes
+# les notes étant discrètes (voir all_techniques_ratings), les intervalles (bornes comprises) ne se chevauchent pas :
+# singletons cachés, singletons nus, candidats verrouillés, paires, triplets et poissons, puis essais
+all_buckets_scores_ranges = {0.3: (0.0, 1.5), 0.4: (2.3, 2.3), 0.5: (2.8, 2.8), 0.6: (3.0, 4.0), 0.7: (10.0, 10.0)}
+# nombre maximal de générations pour obtenir une grille dont la note est dans l'intervalle de son niveau
+generation_attempts = 3
+
+
+def get_difficulty_bucket(difficulty: float) -> float:
+    """
+    Renvoi le niveau de difficulté des grilles pré-générées le plus proche de "difficulty"
+    """
+    
+    return min(all_difficulty_buckets, key=lambda bucket: abs(bucket - difficulty))
+
+
+def init_generation_process():
+    """
+    Initialise un processus de génération : priorité minimale, le jeu et les résolutions restent prioritaires
+    """
+    
+    if hasattr(os, "nice"):
+        os.nice(19)
+
+
+def generate_puzzle(size: int, difficulty: float) -> bytes:
+    """
+    Fonction exécutée dans un processus de génération, génère une grille à solution unique
+    La grille est regénérée (au plus "generation_attempts" fois) tant que sa note n'est pas dans l'intervalle
+    de son niveau de difficulté, la grille dont la note est la plus proche de l'intervalle est gardée :
+    les petites grilles ne demandent souvent que des singletons cachés, même aux niveaux les plus difficiles
+    Renvoi les codes des valeurs de la grille (0 = case vide)
+    """
+    
+    min_score, max_score = all_buckets_scores_ranges[get_difficulty_bucket(difficulty)]
+    best_values = None
+    best_distance = 0.0
+    
+    for _ in range(generation_attempts):
+        grid = Grid(size)
+        Solver(grid).generate(difficulty)
+        
+        score = rate_grid(grid.values, size).score
+        distance = max(min_score - score, score - max_score, 0.0)
+        
+        if best_values is None or distance < best_distance:
+            best_values = bytes(grid.values)
+            best_distance = distance
+        
+        if not distance:
+            break
+    
+    return best_values
+
+
+class PuzzlePool:
+    """
+    La classe "PuzzlePool" conserve des grilles générées à l'avance pour chaque (taille, niveau de difficulté) :
+    une génération prend une grille du stock immédiatement, sans attendre le calcul
+    Les stocks sont enregistrés dans "folder" au format une grille par ligne (lisible par puzzle_files.iter_puzzles),
+    et conservés entre deux lancements du jeu
+    Un processus de priorité minimale regénère une grille à la fois, jusqu'à "depth" grilles par stock (voir update)
+    La dernière grille d'un stock n'est jamais retirée : une variante équivalente (voir transformations) est donnée à la place,
+    un stock ayant au moins une grille donne donc toujours une grille immédiatement
+    """
+    
+    def __init__(self, depth: int = 5, folder: str = puzzle_pool_folder):
+        """
+        :param depth: nombre de grilles visé par stock (0 = pas de stock, les grilles sont toujours générées à la demande)
+        :param folder: dossier des fichiers des stocks
+        """
+        
+        assert type(depth) == int and depth >= 0, f'The "depth" argument must be a positive integer (value : {depth})'
+        
+        self.depth = depth
+        self.folder = folder
+        
+        # grilles de chaque stock, (taille, niveau de difficulté) -> liste des codes des valeurs, chargées depuis le disque
+        self.all_puzzles: dict[tuple[int, float], list[bytes]] = {}
+        
+        # processus de génération, créé lors de la première grille à regénérer
+        self.executor = None
+        # indique si les stocks sont complétés en arrière-plan, désactivé si le processus de génération s'est arrêté anormalement
+        self.is_refill_enabled = depth > 0
+        # grille en cours de génération, et son stock
+        self.pending_future: Future | None = None
+        self.pending_key: tuple[int, float] | None = None
+    
+    def get_filepath(self, key: tuple[int, float]) -> str:
+        """
+        Renvoi le chemin du fichier d'un stock
+        """
+        
+        size, bucket = key
+        
+        return os.path.join(self.folder, f"{size}x{size}_{bucket:.1f}.txt")
+    
+    def get_puzzles(self, key: tuple[int, float]) -> list[bytes]:
+        """
+        Renvoi les grilles d'un stock, lues dans son fichier lors du premier appel
+        Les lignes invalides (taille différente, symbole inconnu) sont ignorées
+        """
+        
+        if key in self.all_puzzles:
+            return self.all_puzzles[key]
+        
+        size = key[0]
+        symbols = Grid(size).symbols
+        puzzles = []
+        
+        if os.path.exists(self.get_filepath(key)):
+            with open(self.get_filepath(key), "r") as file:
+                for line in file:
+                    line = line.strip()
+                    
+                    if len(line) == size ** 2 and all(symbol in symbols for symbol in line):
+                        puzzles.append(bytes(symbols.index(symbol) for symbol in line))
+        
+        self.all_puzzles[key] = puzzles
+        
+        return puzzles
+    
+    def save_puzzles(self, key: tuple[int, float]):
+        """
+        Enregistre les grilles d'un stock dans son fichier, le stock n'est plus enregistré en cas d'erreur d'écriture
+        """
+        
+        filepath = self.get_filepath(key)
+        symbols = Grid(key[0]).symbols
+        
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            
+            # écriture dans un fichier temporaire, un fichier incomplet n'est jamais lu
+            with open(filepath + ".tmp", "w") as file:
+                for values in self.get_puzzles(key):
+                    file.write("".join(symbols[code] for code in values) + "\n")
+            
+            os.replace(filepath + ".tmp", filepath)
+        
+        except OSError as error:
+            print(f"Could not save the puzzle pool {filepath} ({error})")
+    
+    def get_count(self, size: int, difficulty: float) -> int:
+        """
+        Renvoi le nombre de grilles du stock de la taille et du niveau de difficulté de "difficulty"
+        """
+        
+        return len(self.get_puzzles((size, get_difficulty_bucket(difficulty))))
+    
+    def pop(self, size: int, difficulty: float) -> bytes | None:
+        """
+        Retire une grille du stock de la taille et du niveau de difficulté de "difficulty"
+        Renvoi les codes des valeurs de la grille, ou None si le stock est vide
+        """
+        
+        key = (size, get_difficulty_bucket(difficulty))
+        puzzles = self.get_puzzles(key)
+        
+        if not puzzles:
+            return None
+        
+        # dernière grille du stock, conservée : variante de même difficulté, à solution unique comme la grille d'origine
+        if len(puzzles) == 1:
+            return get_random_variant(puzzles[0], size)
+        
+        values = puzzles.pop()
+        self.save_puzzles(key)
+        
+        return values
+    
+    def push(self, key: tuple[int, float], values: bytes):
+        """
+        Ajoute une grille à un stock et enregistre le stock
+        """
+        
+        self.get_puzzles(key).append(values)
+        self.save_puzzles(key)
+    
+    def get_missing_key(self, priority_size: int, priority_difficulty: float) -> tuple[int, float] | None:
+        """
+        Renvoi le prochain stock à compléter : celui de la taille et de la difficulté actuelles du jeu en priorité,
+        puis le stock le moins rempli, ou None si tous les stocks sont pleins
+        """
+        
+        priority_key = (priority_size, get_difficulty_bucket(priority_difficulty))
+        
+        if len(self.get_puzzles(priority_key)) < self.depth:
+            return priority_key
+        
+        all_keys = [(size, bucket) for size in all_pool_sizes for bucket in all_difficulty_buckets]
+        missing_key = min(all_keys, key=lambda key: len(self.get_puzzles(key)))
+        
+        return missing_key if len(self.get_puzzles(missing_key)) < self.depth else None
+    
+    def update(self, priority_size: int, priority_difficulty: float, is_paused: bool = False):
+        """
+        Appelée par la boucle principale : ajoute au stock la grille dont la génération est finie,
+        puis lance la génération de la prochaine grille manquante (une seule à la fois)
+        :param is_paused: ne lance pas de nouvelle génération, utilisé pendant les calculs du jeu
+        """
+        
+        if self.pending_future is not None:
+            if not self.pending_future.done():
+                return
+            
+            try:
+                self.push(self.pending_key, self.pending_future.result())
+            except Exception as error:
+                print(f"Puzzle pool refill disabled, the generation failed ({error})")
+                self.close()
+                self.is_refill_enabled = False
+            
+            self.pending_future = None
+            self.pending_key = None
+        
+        if is_paused or not self.is_refill_enabled:
+            return
+        
+        missing_key = self.get_missing_key(priority_size, priority_difficulty)
+        
+        if missing_key is None:
+            return
+        
+        if self.executor is None:
+            # "spawn" : le processus ne copie pas la fenêtre pygame du processus courant
+            context = multiprocessing.get_context("spawn")
+            self.executor = ProcessPoolExecutor(1, mp_context=context, initializer=init_generation_process)
+        
+        self.pending_key = missing_key
+        self.pending_future = self.executor.submit(generate_puzzle, *missing_key)
+    
+    def close(self):
+        """
+        Arrête le processus de génération, la grille en cours de génération est perdue
+        """
+        
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            self.pending_future = None
+            self.pending_key = None
+
+
+def warm_pool(pool: PuzzlePool, all_sizes: list[int], all_buckets: list[float], workers_count: int = 0) -> int:
+    """
+    Remplit en une fois les stocks des tailles "all_sizes" et des niveaux "all_buckets" jusqu'à "pool.depth" grilles,
+    les grilles sont générées en parallèle sur "workers_count" processus (0 = nombre de processeurs de la machine)
+    Renvoi le nombre de grilles générées
+    """
+    
+    all_missing_keys = [
+        (size, bucket)
+        for size in all_sizes for bucket in all_buckets
+        for _ in range(pool.depth - len(pool.get_puzzles((size, bucket))))
+    ]
+    
+    context = multiprocessing.get_context("spawn")
+    
+    with ProcessPoolExecutor(workers_count or os.cpu_count() or 1, mp_context=context) as executor:
+        all_futures = {executor.submit(generate_puzzle, *key): key for key in all_missing_keys}
+        
+        for future in as_completed(all_futures):
+            pool.push(all_futures[future], future.result())
+    
+    return len(all_missing_keys)
+
+
+def main(all_arguments: list[str] = None):
+    """
+    Point d'entrée en ligne de commande : python -m src.programs.puzzle_pool [options]
+    """
+    
+    parser = argparse.ArgumentParser(
+        prog="python -m src.programs.puzzle_pool",
+        description="Fill the pre-generated puzzle pools used by the Generate button"
+    )
+    parser.add_argument("-d", "--depth", type=int, default=20, help="number of puzzles per size and difficulty (default : 20)")
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", choices=all_pool_sizes, default=all_pool_sizes)
+    parser.add_argument(
+        "-l", "--difficulties", type=float, nargs="+", default=all_difficulty_buckets,
+        help=f"difficulties between {min_difficulty} and {max_difficulty}, rounded to the nearest pool (default : all pools)"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=0, help="number of processes (default : 0, all processors)")
+    parser.add_argument("-f", "--folder", default=puzzle_pool_folder, help=f"pools folder (default : {puzzle_pool_folder})")
+    arguments = parser.parse_args(all_arguments)
+    
+    pool = PuzzlePool(arguments.depth, arguments.folder)
+    all_buckets = sorted({get_difficulty_bucket(difficulty) for difficulty in arguments.difficulties})
+    
+    starting_time = time.perf_counter()
+    generated_count = warm_pool(pool, arguments.sizes, all_buckets, arguments.workers)
+    
+    print(f"{generated_count} puzzles generated in {time.perf_counter() - starting_time:.2f}s", file=sys.stderr)
+    
+    for size in arguments.sizes:
+        for bucket in all_buckets:
+            print(f"{size}x{size} {bucket:.1f} : {pool.get_count(size, bucket)} puzzles", file=sys.stderr)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
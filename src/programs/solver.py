@@ -0,0 +1,1115 @@
+# import des librairies
+from array import array
+import json
+import random
+import sys
+import time
+
+# nos modules
+from src.programs.dancing_links import DancingLinks
+from src.programs.grid import Grid
+from src.programs.test_errors import test_errors
+from src.programs.transformations import apply_transformation, get_random_transformation
+
+# difficultés minimale et maximale de la génération (valeurs possibles de "generation_difficulty")
+min_difficulty, max_difficulty = 0.3, 0.7
+# proportion des cases retirées par la génération aux difficultés minimale et maximale, selon la taille de la grille
+# au delà de la proportion maximale, la plupart des grilles n'ont plus de case pouvant être retirée (4x4, 9x9),
+# ou la vérification de l'unicité de la solution devient beaucoup trop longue (16x16 et plus)
+all_removed_frequencies_ranges = {
+    4: (0.4, 0.7), 9: (0.45, 0.68), 16: (0.3, 0.5), 25: (0.3, 0.45), 36: (0.25, 0.4), 49: (0.25, 0.35)
+}
+# nombre maximal de noeuds par case pour compléter une grille aléatoire, au delà le remplissage est recommencé (voir fill_randomly)
+fill_nodes_factor = 4
+# taille de grille à partir de laquelle une grille complète est obtenue par transformation d'une grille modèle (voir fill_from_pattern)
+min_pattern_fill_size = 25
+# nombre maximal de noeuds par case pour vérifier l'unicité de la solution lors de la génération (voir generate)
+uniqueness_nodes_factor = 2
+# nombre de noeuds entre deux vérifications de l'heure limite et du jeton d'annulation (voir set_limits)
+limits_check_interval = 256
+# calculs pouvant être effectués par Solver.run
+all_solver_tasks = ["solve", "count", "generate"]
+
+
+def get_removed_cells_target(size: int, difficulty: float) -> int:
+    """
+    Renvoi le nombre de cases à retirer d'une grille complète de taille "size" pour la difficulté "difficulty"
+    La proportion des cases retirées varie linéairement avec la difficulté, entre les deux valeurs de
+    "all_removed_frequencies_ranges" pour cette taille
+    """
+    
+    min_frequency, max_frequency = all_removed_frequencies_ranges[size]
+    # position de la difficulté entre la difficulté minimale (0) et maximale (1)
+    ratio = min(max((difficulty - min_difficulty) / (max_difficulty - min_difficulty), 0), 1)
+    
+    return round((min_frequency + ratio * (max_frequency - min_frequency)) * size ** 2)
+
+
+class SolverStatistics:
+    """
+    La classe "SolverStatistics" contient les statistiques des calculs d'un solveur (voir Solver.get_statistics) :
+    - noeuds : cases posées ou retirées par le solveur
+    - décisions : valeurs essayées sur une case choisie par la recherche, retours en arrière vers ces décisions,
+      et profondeur maximale de la recherche (nombre maximal de décisions en cours)
+    - propagations (voir propagate), valeurs possibles éliminées par les propagations et temps passé à propager (s)
+    - calculs complets des valeurs possibles des cases (voir init_candidates)
+    - durée (s) de chaque phase : "fill" et "carving" pour la génération (grille complète, puis retrait des cases),
+      "matrix" et "search" pour les dancing links, "split" et "search" pour la recherche sur plusieurs processus
+    - durée totale (s) du calcul, mesurée par Solver.run (0 sinon)
+    """
+    
+    __slots__ = (
+        "nodes_count", "decisions_count", "backtracks_count", "max_depth", "propagations_count", "eliminations_count",
+        "propagation_time", "candidates_computations_count", "phases_times", "executing_time"
+    )
+    
+    def __init__(
+        self, nodes_count: int = 0, decisions_count: int = 0, backtracks_count: int = 0, max_depth: int = 0,
+        propagations_count: int = 0, eliminations_count: int = 0, propagation_time: float = 0.0,
+        candidates_computations_count: int = 0, phases_times: dict[str, float] = None, executing_time: float = 0.0
+    ):
+        self.nodes_count = nodes_count
+        self.decisions_count = decisions_count
+        self.backtracks_count = backtracks_count
+        self.max_depth = max_depth
+        self.propagations_count = propagations_count
+        self.eliminations_count = eliminations_count
+        self.propagation_time = propagation_time
+        self.candidates_computations_count = candidates_computations_count
+        self.phases_times = dict(phases_times or {})
+        self.executing_time = executing_time
+    
+    def __repr__(self):
+        return (
+            f"SolverStatistics(nodes={self.nodes_count}, decisions={self.decisions_count}, "
+            f"backtracks={self.backtracks_count}, depth={self.max_depth}, eliminations={self.eliminations_count})"
+        )
+    
+    def to_dict(self) -> dict:
+        """
+        Renvoi les statistiques sous forme de dictionnaire, les durées en millisecondes (format JSON)
+        """
+        
+        return {
+            "nodes": self.nodes_count,
+            "decisions": self.decisions_count,
+            "backtracks": self.backtracks_count,
+            "max_depth": self.max_depth,
+            "propagations": self.propagations_count,
+            "eliminations": self.eliminations_count,
+            "propagation_ms": round(self.propagation_time * 1000, 3),
+            "candidates_computations": self.candidates_computations_count,
+            "phases_ms": {phase: round(phase_time * 1000, 3) for phase, phase_time in self.phases_times.items()},
+            "time_ms": round(self.executing_time * 1000, 3)
+        }
+
+
+class SearchResult:
+    """
+    La classe "SearchResult" contient le résultat d'un calcul du solveur (voir Solver.run) :
+    - statut : "solved" ou "unsolvable" (résolution), "counted" (comptage), "generated" (génération),
+      ou "unknown" si le calcul a été arrêté avant d'aboutir
+    - valeur renvoyée par le calcul (grille résolue, nombre de solutions ou nombre de cases retirées, -1 si arrêté)
+    - raison de l'arrêt : "cancelled", "timeout", "nodes_limit", ou "" si le calcul n'a pas été arrêté
+    - statistiques du calcul (voir SolverStatistics), dont le nombre de noeuds et la durée du calcul
+    """
+    
+    __slots__ = ("task", "status", "value", "stop_reason", "statistics")
+    
+    def __init__(self, task: str, value: bool | int, stop_reason: str, statistics: SolverStatistics):
+        self.task = task
+        self.value = value
+        self.stop_reason = stop_reason
+        self.statistics = statistics
+        
+        # une solution trouvée reste valable même si une limite a été atteinte en même temps
+        if task == "solve":
+            self.status = "solved" if value else "unknown" if stop_reason else "unsolvable"
+        else:
+            self.status = "unknown" if value == -1 else "counted" if task == "count" else "generated"
+    
+    def __repr__(self):
+        return (
+            f"SearchResult({self.task}, {self.status}, {self.value}, stop={self.stop_reason or None}, "
+            f"nodes={self.statistics.nodes_count})"
+        )
+
+
+class Solver:
+    """
+    La classe "Solver" est le cœur de résolution et de génération des grilles, indépendant de Game et de pygame
+    Elle travaille directement sur une grille (Grid), par index et par codes de valeurs
+    L'interface (ou un traitement par lots) peut suivre l'avancement et annuler le calcul grâce à "progress_callback",
+    et limiter le calcul en noeuds, en temps ou par un jeton d'annulation (voir set_limits et run)
+    """
+    
+    def __init__(self, grid: Grid, engine: str = "backtracking", progress_callback = None, callback_interval: int = 1):
+        """
+        :param grid: grille à résoudre, elle est modifiée directement
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
+        :param progress_callback: fonction appelée avec les coordonnées de la dernière case modifiée,
+        elle renvoi True si le calcul doit être annulé (None = aucun suivi)
+        :param callback_interval: nombre de cases modifiées entre deux appels de "progress_callback"
+        """
+        
+        # Test préconditions
+        test_errors(engine = engine)
+        assert type(callback_interval) == int and callback_interval >= 1, \
+            f'The "callback_interval" argument must be a positive integer (value : {callback_interval})'
+        
+        self.grid = grid
+        self.engine = engine
+        self.progress_callback = progress_callback
+        self.callback_interval = callback_interval
+        
+        # nombre de cases posées ou retirées par le solveur (noeuds)
+        self.nodes_count = 0
+        # compteurs des statistiques (voir SolverStatistics et reset_statistics)
+        self.decisions_count = 0
+        self.backtracks_count = 0
+        self.max_depth = 0
+        self.propagations_count = 0
+        self.eliminations_count = 0
+        self.propagation_time = 0.0
+        self.candidates_computations_count = 0
+        self.phases_times: dict[str, float] = {}
+        # nombre de cases modifiées restant avant le prochain appel de "progress_callback"
+        self.nodes_before_callback = callback_interval
+        # indique si le calcul a été annulé, par "progress_callback" ou par une limite, et la raison de l'arrêt (voir set_limits)
+        self.is_cancelled = False
+        self.stop_reason = ""
+        # nombre de noeuds auquel le budget de la recherche en cours, interne à la génération, est dépassé (0 = aucun),
+        # voir set_nodes_budget
+        self.budget_nodes_count = 0
+        # limites du calcul (voir set_limits) : nombre de noeuds et heure (time.perf_counter) d'arrêt, 0 = aucune limite,
+        # et jeton d'annulation
+        self.max_nodes_count = 0
+        self.deadline = 0.0
+        self.cancel_token = None
+        # nombre de noeuds de la prochaine vérification des limites (voir check_limits),
+        # et de la prochaine vérification de l'heure limite et du jeton d'annulation
+        self.next_check_nodes_count = sys.maxsize
+        self.next_interval_check_nodes_count = 0
+        
+        # trace : index des cases remplies par la recherche, dans l'ordre, permet d'annuler les valeurs posées
+        self.trail: list[int] = []
+        # pile des décisions de la recherche : (index de la case, codes restant à essayer,
+        # longueurs de la trace et de la trace des valeurs possibles avant la décision)
+        self.decisions: list[tuple[int, list[int], int, int]] = []
+        
+        # valeurs possibles de chaque case pendant la recherche (masques, 0 pour une case remplie), voir init_candidates
+        self.candidates: list[int] = []
+        # trace des valeurs possibles : (index de la case, masque avant modification), permet d'annuler les déductions
+        self.candidates_trail: list[tuple[int, int]] = []
+        # files de travail de la propagation : cases n'ayant plus qu'une valeur possible, et groupes à examiner
+        # avec, pour chaque groupe, le masque des valeurs dont les positions possibles ont changé (0 = groupe hors de la file)
+        self.cells_queue: list[int] = []
+        self.units_queue: list[int] = []
+        self.dirty_masks: list[int] = []
+        
+        # enregistrement des cases modifiées (index puis code de valeur, 0 = case vidée), None si désactivé, voir record_trace
+        self.trace: array | None = None
+        self.max_trace_length = 0
+        # fichier où les statistiques de chaque calcul de run() sont ajoutées, "" si désactivé, voir log_statistics
+        self.statistics_log_path = ""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Libère les ressources du solveur, aucune pour la résolution dans le processus courant
+        """
+        
+        pass
+    
+    def record_trace(self, max_placements_count: int = 1_000_000):
+        """
+        Active l'enregistrement de toutes les cases modifiées par la recherche, dans l'ordre, pour pouvoir les rejouer
+        Au delà de "max_placements_count" modifications, les suivantes ne sont plus enregistrées
+        """
+        
+        assert type(max_placements_count) == int and max_placements_count >= 0, \
+            f'The "max_placements_count" argument must be a positive integer (value : {max_placements_count})'
+        
+        self.trace = array("H")
+        self.max_trace_length = 2 * max_placements_count
+    
+    def log_statistics(self, filepath: str):
+        """
+        Active l'écriture des statistiques de chaque calcul de run() dans le fichier "filepath", une ligne JSON par calcul
+        ajoutée à la fin du fichier : calcul, statut, taille de la grille, moteur et statistiques (voir SolverStatistics.to_dict)
+        """
+        
+        assert type(filepath) == str and filepath, f'The "filepath" argument must be a non-empty string (value : {filepath})'
+        
+        self.statistics_log_path = filepath
+    
+    def reset_statistics(self):
+        """
+        Remet à zéro les compteurs des statistiques, dont le nombre de noeuds
+        """
+        
+        self.nodes_count = 0
+        self.decisions_count = 0
+        self.backtracks_count = 0
+        self.max_depth = 0
+        self.propagations_count = 0
+        self.eliminations_count = 0
+        self.propagation_time = 0.0
+        self.candidates_computations_count = 0
+        self.phases_times = {}
+    
+    def get_statistics(self, executing_time: float = 0.0) -> SolverStatistics:
+        """
+        Renvoi les statistiques des calculs du solveur depuis sa création ou le dernier appel de reset_statistics
+        """
+        
+        return SolverStatistics(
+            self.nodes_count, self.decisions_count, self.backtracks_count, self.max_depth, self.propagations_count,
+            self.eliminations_count, self.propagation_time, self.candidates_computations_count, self.phases_times,
+            executing_time
+        )
+    
+    def add_statistics(self, statistics: SolverStatistics):
+        """
+        Ajoute aux compteurs les statistiques d'un autre solveur, qui a travaillé pour ce solveur (sous-problème...)
+        """
+        
+        self.nodes_count += statistics.nodes_count
+        self.decisions_count += statistics.decisions_count
+        self.backtracks_count += statistics.backtracks_count
+        self.max_depth = max(self.max_depth, statistics.max_depth)
+        self.propagations_count += statistics.propagations_count
+        self.eliminations_count += statistics.eliminations_count
+        self.propagation_time += statistics.propagation_time
+        self.candidates_computations_count += statistics.candidates_computations_count
+    
+    def add_phase_time(self, phase: str, starting_time: float):
+        """
+        Ajoute le temps écoulé depuis "starting_time" (time.perf_counter) à la durée de la phase "phase"
+        """
+        
+        self.phases_times[phase] = self.phases_times.get(phase, 0.0) + time.perf_counter() - starting_time
+    
+    def report_progress(self, index: int) -> bool:
+        """
+        Compte la modification de la case d'index "index" et appelle "progress_callback" tous les "callback_interval" noeuds
+        Renvoi True si le calcul doit être annulé
+        """
+        
+        self.nodes_count += 1
+        
+        # les limites arrêtent la recherche comme une annulation
+        if self.nodes_count >= self.next_check_nodes_count:
+            self.check_limits()
+        
+        if self.progress_callback is None:
+            return self.is_cancelled
+        
+        self.nodes_before_callback -= 1
+        
+        if not self.nodes_before_callback:
+            self.nodes_before_callback = self.callback_interval
+            
+            if self.progress_callback(self.grid.unit_tables.all_coordinates[index]):
+                self.stop("cancelled")
+        
+        return self.is_cancelled
+    
+    def set_limits(self, max_nodes: int = 0, timeout: float = 0.0, cancel_token = None):
+        """
+        Limite les calculs suivants du solveur, qui s'arrêtent comme s'ils étaient annulés, "stop_reason" indique la limite atteinte
+        Sans argument, retire toutes les limites
+        :param max_nodes: nombre maximal de noeuds à partir de cet appel (0 = aucune limite)
+        :param timeout: durée maximale (s) à partir de cet appel (0 = aucune limite)
+        :param cancel_token: objet dont la méthode is_set() renvoi True si le calcul doit être annulé (threading.Event,
+        multiprocessing.Event...), partageable entre plusieurs solveurs (None = aucun)
+        """
+        
+        assert type(max_nodes) == int and max_nodes >= 0, \
+            f'The "max_nodes" argument must be a positive integer (value : {max_nodes})'
+        assert type(timeout) in (int, float) and timeout >= 0, \
+            f'The "timeout" argument must be a positive number (value : {timeout})'
+        assert cancel_token is None or hasattr(cancel_token, "is_set"), \
+            f'The "cancel_token" argument must have an "is_set" method (type : {type(cancel_token)})'
+        
+        self.max_nodes_count = self.nodes_count + max_nodes if max_nodes else 0
+        self.deadline = time.perf_counter() + timeout if timeout else 0.0
+        self.cancel_token = cancel_token
+        
+        self.next_interval_check_nodes_count = self.nodes_count + limits_check_interval
+        self.update_next_check()
+    
+    def set_nodes_budget(self, nodes_count: int):
+        """
+        Limite la recherche suivante à "nodes_count" noeuds, utilisé par fill_randomly et generate pour abandonner
+        les recherches trop longues : le budget arrête la recherche comme les limites de set_limits (voir check_limits),
+        avec la raison d'arrêt "nodes_budget", que end_nodes_budget efface pour que le calcul continue
+        """
+        
+        assert type(nodes_count) == int and nodes_count > 0, \
+            f'The "nodes_count" argument must be a strictly positive integer (value : {nodes_count})'
+        
+        self.budget_nodes_count = self.nodes_count + nodes_count
+        self.update_next_check()
+    
+    def end_nodes_budget(self) -> bool:
+        """
+        Retire le budget de noeuds (voir set_nodes_budget), le calcul n'est plus arrêté s'il l'était seulement par le budget
+        Renvoi True si la recherche a dépassé son budget
+        """
+        
+        is_budget_exceeded = self.stop_reason == "nodes_budget"
+        
+        if is_budget_exceeded:
+            self.is_cancelled = False
+            self.stop_reason = ""
+        
+        self.budget_nodes_count = 0
+        self.update_next_check()
+        
+        return is_budget_exceeded
+    
+    def update_next_check(self):
+        """
+        Calcule le nombre de noeuds de la prochaine vérification des limites : budget ou nombre maximal de noeuds atteint,
+        ou tous les "limits_check_interval" noeuds pour l'heure limite et le jeton d'annulation
+        Cette dernière échéance n'est avancée que par check_limits : les budgets de la génération, posés et retirés
+        à chaque case retirée, ne la repoussent pas
+        """
+        
+        all_checks = [limit for limit in (self.budget_nodes_count, self.max_nodes_count) if limit > self.nodes_count]
+        
+        if self.deadline or self.cancel_token is not None:
+            all_checks.append(self.next_interval_check_nodes_count)
+        
+        self.next_check_nodes_count = min(all_checks, default=sys.maxsize)
+    
+    def check_limits(self, nodes_count: int = None) -> bool:
+        """
+        Vérifie le budget de noeuds (voir set_nodes_budget) et les limites du calcul (voir set_limits)
+        Renvoi True si le calcul doit être arrêté
+        :param nodes_count: nombre de noeuds du calcul, s'il n'est pas encore compté dans "nodes_count" (dancing links)
+        """
+        
+        if nodes_count is None:
+            nodes_count = self.nodes_count
+        
+        # les limites du calcul passent avant le budget : leur raison d'arrêt n'est pas effacée par end_nodes_budget
+        if self.max_nodes_count and nodes_count >= self.max_nodes_count:
+            self.stop("nodes_limit")
+        elif self.deadline and time.perf_counter() >= self.deadline:
+            self.stop("timeout")
+        elif self.cancel_token is not None and self.cancel_token.is_set():
+            self.stop("cancelled")
+        elif self.budget_nodes_count and nodes_count >= self.budget_nodes_count:
+            self.stop("nodes_budget")
+        
+        if self.nodes_count >= self.next_interval_check_nodes_count:
+            self.next_interval_check_nodes_count = self.nodes_count + limits_check_interval
+        
+        self.update_next_check()
+        
+        return self.is_cancelled
+    
+    def stop(self, stop_reason: str):
+        """
+        Annule le calcul en cours, seule la première raison d'arrêt est conservée
+        """
+        
+        if not self.stop_reason:
+            self.stop_reason = stop_reason
+        
+        self.is_cancelled = True
+    
+    def run(self, task: str, max_nodes: int = 0, timeout: float = 0.0, cancel_token = None, **arguments) -> SearchResult:
+        """
+        Effectue le calcul "task" : "solve" (voir solve), "count" (voir count_solutions) ou "generate" (voir generate),
+        "arguments" étant les arguments du calcul, en le limitant par "max_nodes", "timeout" et "cancel_token" (voir set_limits)
+        Renvoi le résultat du calcul (voir SearchResult), de statut "unknown" si une limite l'a arrêté,
+        avec les statistiques du calcul, écrites aussi dans le fichier de log_statistics s'il est activé
+        """
+        
+        # Test préconditions
+        assert task in all_solver_tasks, f'The "task" argument must be "solve", "count" or "generate" (value : {task})'
+        
+        self.is_cancelled = False
+        self.stop_reason = ""
+        self.reset_statistics()
+        starting_time = time.perf_counter()
+        
+        self.set_limits(max_nodes, timeout, cancel_token)
+        
+        try:
+            if task == "solve":
+                value = self.solve(**arguments)
+            elif task == "count":
+                value = self.count_solutions(**arguments)
+            else:
+                value = self.generate(**arguments)
+        finally:
+            self.set_limits()
+        
+        result = SearchResult(task, value, self.stop_reason, self.get_statistics(time.perf_counter() - starting_time))
+        
+        if self.statistics_log_path:
+            with open(self.statistics_log_path, "a") as file:
+                file.write(json.dumps({
+                    "task": task, "status": result.status, "stop_reason": result.stop_reason or None,
+                    "size": self.grid.size, "engine": self.engine, **result.statistics.to_dict()
+                }) + "\n")
+        
+        return result
+    
+    def set_code(self, index: int, code: int) -> bool:
+        """
+        Met la case d'index "index" au code de valeur "code" et signale la modification
+        Renvoi True si le calcul doit être annulé
+        """
+        
+        self.grid.set_cell_code_unchecked(index, code)
+        
+        if self.trace is not None and len(self.trace) < self.max_trace_length:
+            self.trace.append(index)
+            self.trace.append(code)
+        
+        return self.report_progress(index)
+    
+    def copy_solution(self, solution_values: bytes):
+        """
+        Place dans les cases vides les valeurs d'une solution trouvée ailleurs (dancing links, processus de résolution)
+        La recherche a déjà compté ses noeuds : les valeurs copiées ne sont qu'ajoutées à la trace (voir record_trace)
+        """
+        
+        grid = self.grid
+        
+        for index, code in enumerate(solution_values):
+            if not grid.values[index]:
+                grid.set_cell_code_unchecked(index, code)
+                
+                if self.trace is not None and len(self.trace) < self.max_trace_length:
+                    self.trace.append(index)
+                    self.trace.append(code)
+    
+    def init_candidates(self):
+        """
+        Calcule les valeurs possibles de chaque case de la grille à partir des masques, avant une recherche
+        Tous les groupes et toutes les cases vides sont à examiner par la prochaine propagation (voir propagate)
+        """
+        
+        grid = self.grid
+        cell_groups = grid.unit_tables.cell_groups
+        lines_mask, columns_mask, squares_mask = grid.lines_mask, grid.columns_mask, grid.squares_mask
+        
+        self.candidates_computations_count += 1
+        self.candidates = [
+            0 if code else grid.full_mask & ~(lines_mask[line] | columns_mask[column] | squares_mask[square])
+            for code, (line, column, square) in zip(grid.values, cell_groups)
+        ]
+        self.candidates_trail = []
+        
+        self.cells_queue = [index for index, code in enumerate(grid.values) if not code]
+        self.units_queue = list(range(len(grid.unit_tables.all_units)))
+        self.dirty_masks = [grid.full_mask] * len(grid.unit_tables.all_units)
+    
+    def clear_queues(self):
+        """
+        Vide les files de travail de la propagation, après une contradiction
+        """
+        
+        self.cells_queue.clear()
+        
+        for unit in self.units_queue:
+            self.dirty_masks[unit] = 0
+        
+        self.units_queue.clear()
+    
+    def remove_candidates(self, index: int, mask: int) -> bool:
+        """
+        Retire les valeurs du masque "mask" des valeurs possibles de la case vide d'index "index"
+        Les groupes de la case sont ajoutés à la file de travail pour les valeurs retirées, et la case elle-même si elle
+        n'a plus qu'une valeur possible
+        Renvoi True si la case n'a plus aucune valeur possible
+        """
+        
+        old_mask = self.candidates[index]
+        removed_mask = old_mask & mask
+        
+        if not removed_mask:
+            return False
+        
+        new_mask = old_mask & ~mask
+        self.candidates_trail.append((index, old_mask))
+        self.candidates[index] = new_mask
+        self.eliminations_count += removed_mask.bit_count()
+        
+        if not new_mask:
+            return True
+        
+        dirty_masks = self.dirty_masks
+        for unit in self.grid.unit_tables.cell_units[index]:
+            if not dirty_masks[unit]:
+                self.units_queue.append(unit)
+            
+            dirty_masks[unit] |= removed_mask
+        
+        # une seule valeur possible (un seul bit à 1)
+        if not new_mask & (new_mask - 1):
+            self.cells_queue.append(index)
+        
+        return False
+    
+    def place(self, index: int, code: int) -> bool:
+        """
+        Remplit la case vide d'index "index" avec le code "code", ajoutée à la trace,
+        et retire ce code des valeurs possibles de ses voisins
+        Renvoi True si un voisin n'a plus aucune valeur possible, ou si le calcul doit être annulé
+        """
+        
+        candidates = self.candidates
+        old_mask = candidates[index]
+        bit = 1 << (code - 1)
+        
+        self.trail.append(index)
+        self.candidates_trail.append((index, old_mask))
+        candidates[index] = 0
+        
+        if self.set_code(index, code):
+            return True
+        
+        # les autres valeurs de la case ne sont plus possibles à cette position dans ses groupes
+        other_mask = old_mask & ~bit
+        if other_mask:
+            dirty_masks = self.dirty_masks
+            for unit in self.grid.unit_tables.cell_units[index]:
+                if not dirty_masks[unit]:
+                    self.units_queue.append(unit)
+                
+                dirty_masks[unit] |= other_mask
+        
+        for peer in self.grid.unit_tables.peers[index]:
+            if candidates[peer] & bit and self.remove_candidates(peer, bit):
+                return True
+        
+        return False
+    
+    def propagate(self) -> bool:
+        """
+        Déductions logiques jusqu'à ce qu'il n'y en ait plus, sur les cases et les groupes des files de travail :
+        - case n'ayant qu'une seule valeur possible : la case prend cette valeur
+        - valeur possible dans une seule case d'un groupe : la case prend cette valeur
+        - valeur d'un groupe possible uniquement dans l'intersection avec un autre groupe (ligne ou colonne et carré) :
+          elle est retirée du reste de l'autre groupe
+        Seuls les groupes dont des valeurs possibles ont changé sont examinés, et seulement pour ces valeurs
+        Les cases remplies sont ajoutées à la trace
+        Renvoi True si la grille courante n'a pas de solution (renvoi False si le calcul a été annulé)
+        """
+        
+        grid = self.grid
+        unit_tables = grid.unit_tables
+        all_units, cell_units, size = unit_tables.all_units, unit_tables.cell_units, grid.size
+        candidates, cells_queue, units_queue, dirty_masks = self.candidates, self.cells_queue, self.units_queue, self.dirty_masks
+        all_units_masks = (grid.lines_mask, grid.columns_mask, grid.squares_mask)
+        
+        self.propagations_count += 1
+        
+        while cells_queue or units_queue:
+            # valeurs uniques des cases
+            while cells_queue:
+                index = cells_queue.pop()
+                mask = candidates[index]
+                
+                if mask:
+                    if not mask & (mask - 1) and self.place(index, mask.bit_length()):
+                        self.clear_queues()
+                        return not self.is_cancelled
+                
+                # case vide sans valeur possible
+                elif not grid.values[index]:
+                    self.clear_queues()
+                    return True
+            
+            if not units_queue:
+                break
+            
+            unit = units_queue.pop()
+            dirty_mask = dirty_masks[unit]
+            dirty_masks[unit] = 0
+            unit_indexes = all_units[unit]
+            
+            # valeurs possibles dans au moins une case, puis dans au moins deux cases du groupe
+            seen_once = seen_twice = 0
+            for index in unit_indexes:
+                seen_twice |= seen_once & candidates[index]
+                seen_once |= candidates[index]
+            
+            # valeur ni posée ni possible dans le groupe
+            if (seen_once | all_units_masks[unit // size][unit % size]) != grid.full_mask:
+                self.clear_queues()
+                return True
+            
+            single_mask = seen_once & ~seen_twice & dirty_mask
+            
+            if single_mask:
+                while single_mask:
+                    bit = single_mask & -single_mask
+                    single_mask &= single_mask - 1
+                    
+                    for index in unit_indexes:
+                        if candidates[index] & bit:
+                            if self.place(index, bit.bit_length()):
+                                self.clear_queues()
+                                return not self.is_cancelled
+                            break
+                
+                # le groupe a changé, il sera examiné à nouveau pour ses autres valeurs
+                remaining_mask = dirty_mask & seen_twice
+                if remaining_mask:
+                    if not dirty_masks[unit]:
+                        units_queue.append(unit)
+                    
+                    dirty_masks[unit] |= remaining_mask
+                
+                continue
+            
+            # valeurs bloquées dans l'intersection avec un autre groupe : carré pour une ligne ou une colonne,
+            # ligne ou colonne pour un carré (position du groupe dans "cell_units")
+            all_group_positions = (0, 1) if unit >= 2 * size else (2,)
+            locked_mask = dirty_mask & seen_twice
+            
+            while locked_mask:
+                bit = locked_mask & -locked_mask
+                locked_mask &= locked_mask - 1
+                
+                positions = [index for index in unit_indexes if candidates[index] & bit]
+                
+                for group_position in all_group_positions:
+                    other_unit = cell_units[positions[0]][group_position]
+                    
+                    if any(cell_units[index][group_position] != other_unit for index in positions):
+                        continue
+                    
+                    for index in all_units[other_unit]:
+                        if candidates[index] & bit and index not in unit_indexes and self.remove_candidates(index, bit):
+                            self.clear_queues()
+                            return True
+        
+        return False
+    
+    def get_best_cell(self, do_choice_randomly: bool) -> tuple[int, int] | None:
+        """
+        Renvoi l'index et le masque des valeurs possibles de la case vide ayant le moins de valeurs possibles,
+        ou None si la grille est remplie
+        Les valeurs possibles sont celles de la dernière propagation (voir init_candidates et propagate)
+        """
+        
+        best_cells = []
+        minimum = self.grid.size + 1
+        
+        for index, possible_mask in enumerate(self.candidates):
+            if not possible_mask:
+                continue
+            
+            possible_values_count = possible_mask.bit_count()
+            
+            if possible_values_count < minimum:
+                minimum = possible_values_count
+                best_cells = [(index, possible_mask)]
+                
+                # inutile de chercher plus loin sans choix aléatoire
+                if not do_choice_randomly and minimum <= 2:
+                    break
+            
+            elif possible_values_count == minimum:
+                best_cells.append((index, possible_mask))
+        
+        if not best_cells:
+            return None
+        
+        # choix aléatoire parmi les cases ayant le moins de valeurs possibles // n'impacte pas la vitesse de résolution
+        if do_choice_randomly:
+            return random.choice(best_cells)
+        
+        return best_cells[0]
+    
+    def undo_trail(self, trail_length: int, candidates_trail_length: int = 0):
+        """
+        Vide les cases de la trace jusqu'à ce qu'elle ne contienne plus que "trail_length" cases,
+        et remet les valeurs possibles des cases dans leur état lorsque leur trace contenait "candidates_trail_length" éléments
+        Les cases vidées ne sont plus signalées une fois le calcul annulé
+        """
+        
+        trail, candidates, candidates_trail = self.trail, self.candidates, self.candidates_trail
+        
+        while len(trail) > trail_length:
+            index = trail.pop()
+            
+            if self.is_cancelled:
+                self.grid.set_cell_code_unchecked(index, 0)
+            else:
+                self.set_code(index, 0)
+        
+        while len(candidates_trail) > candidates_trail_length:
+            index, mask = candidates_trail.pop()
+            candidates[index] = mask
+    
+    def backtracking_search(self, do_choice_randomly: bool = False):
+        """
+        Générateur itératif (pile de décisions explicite) qui cherche les solutions de la grille en testant toutes les possibilités
+        Chaque noeud de la recherche commence par une propagation (voir propagate), qui élimine la plupart des branches
+        sans solution avant d'avoir à les essayer
+        Il rend la main à chaque solution trouvée, la grille contient alors la solution : la recherche peut être mise
+        en pause puis reprise à la solution suivante
+        Une fois toutes les possibilités testées (ou le calcul annulé), la grille retrouve son état initial
+        """
+        
+        self.trail = []
+        self.decisions = []
+        self.init_candidates()
+        
+        trail, decisions = self.trail, self.decisions
+        
+        while True:
+            # déductions logiques
+            propagation_starting_time = time.perf_counter()
+            do_backtrack = self.propagate()
+            self.propagation_time += time.perf_counter() - propagation_starting_time
+            
+            if not do_backtrack and not self.is_cancelled:
+                best_cell = self.get_best_cell(do_choice_randomly)
+                
+                # la grille est remplie, les valeurs posées respectent toujours les masques : c'est une solution
+                if best_cell is None:
+                    yield
+                    do_backtrack = True
+                
+                else:
+                    index, possible_mask = best_cell
+                    all_codes = [code for code in range(self.grid.size, 0, -1) if possible_mask >> (code - 1) & 1]
+                    
+                    # arrangement des valeurs aléatoires dans les valeurs possibles // n'impacte pas la vitesse de résolution
+                    if do_choice_randomly:
+                        random.shuffle(all_codes)
+                    
+                    # la première valeur est posée, les suivantes seront essayées lors des retours en arrière
+                    decisions.append((index, all_codes, len(trail), len(self.candidates_trail)))
+                    self.decisions_count += 1
+                    self.max_depth = max(self.max_depth, len(decisions))
+                    do_backtrack = self.place(index, all_codes.pop())
+            
+            # retour en arrière jusqu'à trouver une décision ayant encore une valeur à essayer
+            while do_backtrack and not self.is_cancelled:
+                if not decisions:
+                    break
+                
+                index, all_codes, trail_length, candidates_trail_length = decisions[-1]
+                # enlève les valeurs posées depuis la décision, la case de la décision comprise
+                self.clear_queues()
+                self.undo_trail(trail_length, candidates_trail_length)
+                self.backtracks_count += 1
+                
+                if all_codes:
+                    self.decisions_count += 1
+                    do_backtrack = self.place(index, all_codes.pop())
+                else:
+                    decisions.pop()
+            
+            # toutes les possibilités ont été testées, ou le calcul a été annulé
+            if self.is_cancelled or do_backtrack:
+                self.clear_queues()
+                self.undo_trail(0)
+                decisions.clear()
+                return
+    
+    def solve(self, do_choice_randomly: bool = False) -> bool:
+        """
+        Résout la grille, les valeurs trouvées sont placées dans les cases vides
+        Renvoi True si la grille a été résolue, et False si elle n'a pas de solution ou si le calcul a été annulé
+        :param do_choice_randomly: choisi les cases et les valeurs de manière aléatoire, permet de générer une grille complète aléatoire
+        """
+        
+        # Test préconditions
+        test_errors(boolean = do_choice_randomly)
+        
+        # une grille contenant des doublons n'a pas de solution
+        if not self.grid.is_valid():
+            return False
+        
+        if self.engine == "dancing_links":
+            starting_time = time.perf_counter()
+            dancing_links = DancingLinks(
+                self.grid.size, self.grid.values, do_choice_randomly,
+                lambda nodes_count: self.check_limits(self.nodes_count + nodes_count)
+            )
+            self.add_phase_time("matrix", starting_time)
+            
+            starting_time = time.perf_counter()
+            solution_values = dancing_links.solve()
+            self.add_phase_time("search", starting_time)
+            # chaque ligne de la matrice choisie est un noeud, et une valeur essayée sur une case
+            self.nodes_count += dancing_links.nodes_count
+            self.decisions_count += dancing_links.nodes_count
+            
+            if solution_values is None:
+                return False
+            
+            self.copy_solution(solution_values)
+            
+            return True
+        
+        # la recherche s'arrête à la première solution, qui reste dans la grille
+        for _ in self.backtracking_search(do_choice_randomly):
+            return True
+        
+        return False
+    
+    def count_solutions(self, limit: int = 0) -> int:
+        """
+        Compte les solutions de la grille, la grille n'est pas modifiée
+        Renvoi -1 si le calcul a été annulé
+        :param limit: arrête le comptage dès que "limit" solutions ont été trouvées (0 = aucune limite)
+        """
+        
+        assert type(limit) == int and limit >= 0, f'The "limit" argument must be a positive integer (value : {limit})'
+        
+        # une grille contenant des doublons n'a pas de solution
+        if not self.grid.is_valid():
+            return 0
+        
+        if self.engine == "dancing_links":
+            starting_time = time.perf_counter()
+            dancing_links = DancingLinks(
+                self.grid.size, self.grid.values, stop_callback = lambda nodes_count: self.check_limits(self.nodes_count + nodes_count)
+            )
+            self.add_phase_time("matrix", starting_time)
+            
+            starting_time = time.perf_counter()
+            solutions_count = dancing_links.count_solutions(limit)
+            self.add_phase_time("search", starting_time)
+            self.nodes_count += dancing_links.nodes_count
+            self.decisions_count += dancing_links.nodes_count
+            
+            return -1 if self.is_cancelled else solutions_count
+        
+        solutions_count = 0
+        
+        for _ in self.backtracking_search():
+            solutions_count += 1
+            
+            if solutions_count == limit:
+                break
+        
+        # la recherche a été interrompue, enlève les valeurs de la dernière solution trouvée
+        self.undo_trail(0)
+        
+        return -1 if self.is_cancelled else solutions_count
+    
+    def has_solution(self) -> bool:
+        """
+        Renvoi True si la grille a au moins une solution, la grille n'est pas modifiée
+        Recherche par retour sur trace dans le processus courant, même avec le moteur "dancing_links" :
+        les recherches de la génération sont très courtes, les préparer coûterait plus que les effectuer
+        ParallelSolver répartit les vérifications des grandes grilles sur plusieurs processus
+        """
+        
+        for _ in self.backtracking_search():
+            # enlève les valeurs de la solution trouvée
+            self.undo_trail(0)
+            return True
+        
+        return False
+    
+    def has_other_solution(self, removed_indexes: list[int], removed_codes: list[int]) -> bool:
+        """
+        Renvoi True si la grille a une autre solution que celle où les cases "removed_indexes" (vides) valent "removed_codes"
+        La grille avant le retrait des cases avait une solution unique : une autre solution diffère forcément sur l'une
+        de ces cases, la première case différente est donc essayée avec chacune de ses autres valeurs possibles,
+        les cases précédentes gardant leurs valeurs retirées
+        Les cases retirées sont vides à la fin, le résultat n'a pas de sens si le calcul a été annulé
+        """
+        
+        grid = self.grid
+        cell_groups = grid.unit_tables.cell_groups
+        has_other_solution = False
+        
+        for index, removed_code in zip(removed_indexes, removed_codes):
+            line, column, square = cell_groups[index]
+            possible_mask = grid.full_mask & ~(grid.lines_mask[line] | grid.columns_mask[column] | grid.squares_mask[square])
+            # la valeur retirée donne la solution d'origine
+            possible_mask &= ~(1 << (removed_code - 1))
+            
+            while possible_mask and not has_other_solution and not self.is_cancelled:
+                # valeur du bit de poids faible
+                code = (possible_mask & -possible_mask).bit_length()
+                possible_mask &= possible_mask - 1
+                
+                grid.set_cell_code_unchecked(index, code)
+                has_other_solution = self.has_solution()
+                grid.set_cell_code_unchecked(index, 0)
+            
+            if has_other_solution or self.is_cancelled:
+                break
+            
+            # la case garde sa valeur retirée pour essayer les cases suivantes
+            grid.set_cell_code_unchecked(index, removed_code)
+        
+        for index in removed_indexes:
+            grid.set_cell_code_unchecked(index, 0)
+        
+        return has_other_solution
+    
+    def fill_randomly(self) -> bool:
+        """
+        Remplit la grille vide avec une grille complète aléatoire
+        Les carrés de la diagonale, indépendants les uns des autres, sont d'abord remplis par des permutations aléatoires,
+        le reste de la grille est ensuite complété par une résolution aléatoire : la recherche a beaucoup moins de
+        choix à faire, ce qui évite les recherches très longues lors du remplissage d'une grille 16x16 vide
+        Quelques remplissages demandent tout de même une très longue recherche (ou n'ont pas de solution en 4x4) :
+        la recherche est limitée à "fill_nodes_factor" noeuds par case, puis recommencée depuis une grille vide
+        Les grilles de "min_pattern_fill_size" cases de côté ou plus sont remplies par fill_from_pattern
+        Renvoi False si le calcul a été annulé
+        """
+        
+        grid = self.grid
+        
+        if grid.size >= min_pattern_fill_size:
+            return self.fill_from_pattern()
+        
+        while True:
+            for square in range(grid.square_size):
+                all_codes = random.sample(range(1, grid.size + 1), grid.size)
+                
+                for position, code in enumerate(all_codes):
+                    x = square * grid.square_size + position // grid.square_size
+                    y = square * grid.square_size + position % grid.square_size
+                    
+                    if self.set_code(x * grid.size + y, code):
+                        return False
+            
+            self.set_nodes_budget(fill_nodes_factor * grid.cells_count)
+            
+            is_filled = self.solve(do_choice_randomly = True)
+            
+            # budget dépassé, ou carrés de la diagonale ne pouvant pas être complétés : le remplissage est recommencé
+            if not self.end_nodes_budget() and (is_filled or self.is_cancelled):
+                return is_filled
+            
+            for index in range(grid.cells_count):
+                grid.set_cell_code_unchecked(index, 0)
+    
+    def fill_from_pattern(self) -> bool:
+        """
+        Remplit la grille vide avec une transformation aléatoire (voir transformations) de la grille modèle
+        où la case (x, y) vaut (square_size * (x % square_size) + x // square_size + y) % size + 1
+        Immédiat quelle que soit la taille de la grille, alors que la recherche aléatoire de fill_randomly
+        recommence de plus en plus souvent au delà de 16x16
+        Renvoi False si le calcul a été annulé
+        """
+        
+        grid = self.grid
+        pattern_values = bytes(
+            (grid.square_size * (x % grid.square_size) + x // grid.square_size + y) % grid.size + 1
+            for x in range(grid.size) for y in range(grid.size)
+        )
+        
+        for index, code in enumerate(apply_transformation(pattern_values, get_random_transformation(grid.size))):
+            if self.set_code(index, code):
+                return False
+        
+        return True
+    
+    def remove_cells(self, all_groups: list[list[int]], target: int) -> int:
+        """
+        Retire de la grille complète les groupes de cases "all_groups", dans l'ordre, tant que la solution reste unique,
+        jusqu'à avoir retiré "target" cases (voir generate)
+        Renvoi le nombre de cases retirées, ou -1 si le calcul a été annulé
+        """
+        
+        grid = self.grid
+        removed_cells_count = 0
+        
+        for removed_indexes in all_groups:
+            if removed_cells_count + len(removed_indexes) > target:
+                continue
+            
+            removed_codes = [grid.values[index] for index in removed_indexes]
+            
+            for index in removed_indexes:
+                if self.set_code(index, 0):
+                    return -1
+            
+            self.set_nodes_budget(uniqueness_nodes_factor * grid.cells_count)
+            
+            has_other_solution = self.has_other_solution(removed_indexes, removed_codes)
+            is_budget_exceeded = self.end_nodes_budget()
+            
+            # le retrait rend la solution non unique (ou l'unicité n'a pas pu être prouvée), les cases sont remises
+            if has_other_solution or is_budget_exceeded:
+                for index, code in zip(removed_indexes, removed_codes):
+                    grid.set_cell_code_unchecked(index, code)
+            else:
+                removed_cells_count += len(removed_indexes)
+            
+            if self.is_cancelled:
+                return -1
+            
+            if removed_cells_count == target:
+                break
+        
+        return removed_cells_count
+    
+    def generate(self, difficulty: float, do_use_symmetry: bool = False) -> int:
+        """
+        Génère une grille à solution unique à partir de la grille (vide)
+        Une grille complète aléatoire est générée (voir fill_randomly), puis ses cases sont retirées une par une dans un ordre aléatoire
+        (ou par paires symétriques par rapport au centre), chaque retrait étant annulé s'il rend la solution non unique
+        La vérification est limitée à "uniqueness_nodes_factor" noeuds par case : au delà, l'unicité n'est pas prouvée
+        et le retrait est aussi annulé, ce qui évite les rares vérifications interminables des grandes grilles
+        La génération s'arrête lorsque le nombre de cases visé (voir get_removed_cells_target) a été retiré,
+        ou lorsque toutes les cases ont été essayées
+        Les cases restantes sont superverrouillées
+        Renvoi le nombre de cases retirées, ou -1 si le calcul a été annulé
+        :param difficulty: difficulté de la génération, entre 0.3 et 0.7 (voir get_removed_cells_target)
+        :param do_use_symmetry: retire les cases par paires symétriques, la grille générée est symétrique
+        """
+        
+        # Test préconditions
+        test_errors(frequency = difficulty, boolean = do_use_symmetry)
+        
+        # génère une grille complète et valide aléatoirement
+        starting_time = time.perf_counter()
+        is_filled = self.fill_randomly()
+        self.add_phase_time("fill", starting_time)
+        
+        if not is_filled:
+            return -1
+        
+        grid = self.grid
+        target = get_removed_cells_target(grid.size, difficulty)
+        
+        # groupes de cases retirées ensemble : une case, ou une case et sa symétrique (une seule case au centre)
+        all_indexes = list(range(grid.cells_count))
+        if do_use_symmetry:
+            all_groups = [sorted({index, grid.cells_count - 1 - index}) for index in all_indexes[:(grid.cells_count + 1) // 2]]
+        else:
+            all_groups = [[index] for index in all_indexes]
+        
+        random.shuffle(all_groups)
+        
+        starting_time = time.perf_counter()
+        removed_cells_count = self.remove_cells(all_groups, target)
+        self.add_phase_time("carving", starting_time)
+        
+        if removed_cells_count == -1:
+            return -1
+        
+        # superverrouille les cases restantes
+        superlocked_code = grid.state_codes["superlocked"]
+        for index, code in enumerate(grid.values):
+            grid.states[index] = superlocked_code if code else grid.state_codes["unlocked"]
+        
+        return removed_cells_count
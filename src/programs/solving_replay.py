@@ -0,0 +1,73 @@
+# import des librairies
+from array import array
+import time
+
+# nos modules
+from src.programs.grid import Grid
+
+
+class SolvingReplay:
+    """
+    La classe "SolvingReplay" rejoue la trace d'une résolution (cases modifiées par le solveur, dans l'ordre) sur une grille
+    La relecture avance selon le temps écoulé : à chaque image, toutes les modifications prévues depuis l'image précédente
+    sont appliquées d'un coup, la vitesse ne dépend donc pas du nombre d'images par seconde
+    """
+    
+    def __init__(self, grid: Grid, starting_values: bytes, trace: array, final_values: bytes, speed: int):
+        """
+        :param grid: grille sur laquelle la résolution est rejouée
+        :param starting_values: codes des valeurs de la grille au début de la résolution
+        :param trace: cases modifiées par la résolution, index puis code de valeur (voir Solver.record_trace)
+        :param final_values: codes des valeurs de la grille à la fin de la résolution
+        :param speed: nombre de cases modifiées par seconde
+        """
+        
+        assert type(speed) == int and speed >= 1, f'The "speed" argument must be a strictly positive integer (value : {speed})'
+        
+        self.grid = grid
+        self.starting_values = starting_values
+        self.trace = trace
+        self.final_values = final_values
+        self.speed = speed
+        
+        # nombre de modifications de la trace appliquées à la grille
+        self.position = 0
+        self.starting_time = 0.0
+    
+    def get_length(self) -> int:
+        """
+        Renvoi le nombre de modifications de la trace
+        """
+        
+        return len(self.trace) // 2
+    
+    def start(self):
+        """
+        Remet la grille dans son état de départ et démarre la relecture
+        """
+        
+        self.grid.set_values_codes(self.starting_values)
+        self.position = 0
+        self.starting_time = time.perf_counter()
+    
+    def update(self) -> bool:
+        """
+        Applique à la grille les modifications prévues depuis le début de la relecture
+        Renvoi True si la relecture est terminée, la grille contient alors les valeurs de fin de la résolution
+        """
+        
+        target_position = min(int((time.perf_counter() - self.starting_time) * self.speed), self.get_length())
+        trace = self.trace
+        
+        for position in range(self.position, target_position):
+            self.grid.set_cell_code_unchecked(trace[2 * position], trace[2 * position + 1])
+        
+        self.position = target_position
+        
+        if self.position < self.get_length():
+            return False
+        
+        # la trace a pu être tronquée, la grille reçoit toujours les valeurs finales
+        self.grid.set_values_codes(self.final_values)
+        
+        return True
@@ -0,0 +1,174 @@
+# import des librairies
+import queue
+import threading
+import time
+
+# nos modules
+from src.programs.grid import Grid
+from src.programs.parallel_solver import ParallelSolver
+from src.programs.solver import Solver
+from src.programs.test_errors import test_errors
+
+# calculs pouvant être effectués en arrière-plan
+all_worker_tasks = ["solve", "generate"]
+
+
+class SolvingWorker:
+    """
+    La classe "SolvingWorker" effectue une résolution ou une génération dans un thread, sur une copie de la grille,
+    sans bloquer la boucle principale du jeu
+    Le thread communique uniquement par une file de messages, lue par la boucle principale à chaque image :
+    - ("progress", nombre de noeuds, codes des valeurs de la grille ou None) au plus tous les "report_interval" secondes
+    - ("result", résultat) à la fin du calcul, voir run()
+    - ("error", exception) si le calcul a échoué
+    """
+    
+    def __init__(
+        self, task: str, grid: Grid, engine: str = "backtracking", workers_count: int = 1,
+        do_report_values: bool = False, difficulty: float = 0.5, do_record_trace: bool = False, statistics_log_path: str = ""
+    ):
+        """
+        :param task: calcul à effectuer, "solve" (résolution) ou "generate" (génération d'une grille de même taille)
+        :param grid: grille de départ, copiée : la grille du jeu n'est jamais modifiée par le thread
+        :param workers_count: nombre de processus de résolution (1 = thread uniquement, 0 = tous les processeurs)
+        :param do_report_values: joint les valeurs de la grille aux messages d'avancement, pour les afficher
+        :param difficulty: difficulté de la génération (voir Solver.generate)
+        :param do_record_trace: enregistre toutes les cases modifiées par la résolution (voir Solver.record_trace),
+        disponibles dans "trace" à la fin du calcul pour être rejouées
+        :param statistics_log_path: fichier où les statistiques du calcul sont ajoutées (voir Solver.log_statistics),
+        "" pour ne pas les écrire
+        """
+        
+        # Test préconditions
+        assert task in all_worker_tasks, f'The "task" argument must be "solve" or "generate" (value : {task})'
+        test_errors(engine = engine, boolean = do_report_values)
+        test_errors(boolean = do_record_trace)
+        
+        self.task = task
+        self.grid = grid.copy() if task == "solve" else Grid(grid.size)
+        self.engine = engine
+        self.workers_count = workers_count
+        self.do_report_values = do_report_values
+        self.difficulty = difficulty
+        self.do_record_trace = do_record_trace
+        self.statistics_log_path = statistics_log_path
+        
+        # codes des valeurs de la grille au départ du calcul, point de départ de la trace
+        self.starting_values = bytes(self.grid.values)
+        # cases modifiées par la résolution (index puis code), lue par la boucle principale une fois le résultat reçu
+        self.trace = None
+        # statistiques du calcul (voir SolverStatistics), lues par la boucle principale une fois le résultat reçu
+        self.statistics = None
+        
+        # nombre de noeuds entre deux appels de la fonction de suivi, elle ne fait que vérifier l'heure et l'annulation
+        self.callback_interval = 64
+        # temps minimal (s) entre deux messages d'avancement
+        self.report_interval = 1 / 30
+        
+        self.messages = queue.Queue()
+        # évènement d'annulation, jeton d'annulation du cœur de résolution (voir Solver.set_limits)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        
+        self.solver = None
+        self.last_report_time = 0.0
+        self.starting_time = 0.0
+    
+    def start(self):
+        """
+        Démarre le calcul dans le thread
+        """
+        
+        self.starting_time = time.perf_counter()
+        self.thread.start()
+    
+    def is_running(self) -> bool:
+        """
+        Renvoi True si le thread n'est pas terminé
+        """
+        
+        return self.thread.is_alive()
+    
+    def get_executing_time(self) -> float:
+        """
+        Renvoi le temps écoulé depuis le démarrage du calcul, en secondes
+        """
+        
+        return time.perf_counter() - self.starting_time
+    
+    def cancel(self):
+        """
+        Annule le calcul et attend la fin du thread, les messages non lus sont ignorés
+        """
+        
+        self.stop_event.set()
+        
+        if self.thread.is_alive():
+            self.thread.join()
+    
+    def get_messages(self) -> list[tuple]:
+        """
+        Renvoi les messages envoyés par le thread depuis le dernier appel, sans attendre
+        """
+        
+        all_messages = []
+        
+        while True:
+            try:
+                all_messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return all_messages
+    
+    def progress_callback(self, coordinates: tuple[int, int]) -> bool:
+        """
+        Fonction de suivi du cœur de résolution, exécutée dans le thread
+        Envoi un message d'avancement au plus tous les "report_interval" secondes
+        Renvoi True si le calcul est annulé, l'évènement d'annulation est aussi vérifié par le cœur de résolution
+        """
+        
+        current_time = time.perf_counter()
+        
+        if current_time - self.last_report_time >= self.report_interval:
+            self.last_report_time = current_time
+            self.messages.put((
+                "progress", self.solver.nodes_count, bytes(self.grid.values) if self.do_report_values else None
+            ))
+        
+        return self.stop_event.is_set()
+    
+    def run(self):
+        """
+        Calcul exécuté dans le thread, envoi le résultat dans la file de messages :
+        - résolution : (grille résolue, codes des valeurs de la grille)
+        - génération : (nombre de cases retirées ou -1 si annulé, codes des valeurs, codes des états)
+        """
+        
+        # sans affichage, la recherche peut être répartie sur plusieurs processus
+        if self.workers_count != 1 and not self.do_report_values:
+            self.solver = ParallelSolver(self.grid, self.engine, self.progress_callback, self.callback_interval, self.workers_count)
+        else:
+            self.solver = Solver(self.grid, self.engine, self.progress_callback, self.callback_interval)
+            
+            if self.do_record_trace:
+                self.solver.record_trace()
+        
+        if self.statistics_log_path:
+            self.solver.log_statistics(self.statistics_log_path)
+        
+        try:
+            with self.solver:
+                if self.task == "solve":
+                    search_result = self.solver.run("solve", cancel_token = self.stop_event)
+                    result = (search_result.value, bytes(self.grid.values))
+                else:
+                    search_result = self.solver.run("generate", cancel_token = self.stop_event, difficulty = self.difficulty)
+                    result = (search_result.value, bytes(self.grid.values), bytes(self.grid.states))
+        
+        except Exception as error:
+            self.messages.put(("error", error))
+            return
+        
+        # la trace et les statistiques sont disponibles avant l'envoi du résultat
+        self.trace = self.solver.trace
+        self.statistics = search_result.statistics
+        self.messages.put(("result", result))
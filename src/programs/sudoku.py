@@ -1,10 +1,15 @@
 # import des libraires
-import random
 import time
 from tkinter.filedialog import askopenfilename, asksaveasfilename
 from tkinter.messagebox import askyesnocancel, showinfo
 # nos modules
 from src.programs.grid import Grid
+from src.programs.history import History
+from src.programs.parallel_solver import ParallelSolver
+from src.programs.puzzle_files import read_sdk_file
+from src.programs.solver import SearchResult, Solver, SolverStatistics
+from src.programs.solving_replay import SolvingReplay
+from src.programs.solving_worker import SolvingWorker
 from src.programs.test_errors import test_errors
 
 
@@ -32,18 +37,24 @@ class Sudoku:
         # Coordonnées de la case sélectionnée, (-1, -1) si aucune case
         self.selected_cell = (-1, -1)
         
-        # historique de la grille, permet de revenir en arrière, et/ou de rétablir
-        self.history: list[tuple[Grid, tuple[int, int]]] = [(self.grid.copy(), self.selected_cell)]
-        # indique à quel index on se situe dans l'historique
-        self.history_index = 0
+        # historique de la grille (modifications successives), permet de revenir en arrière, et/ou de rétablir
+        self.history = History(self.grid, self.selected_cell, self.game.history_max_depth)
         
         # dictionnaire permettant de convertir un état en en chiffre entre 0 et 2 pour l'enregistrement dans un fichier
         self.save_state_conversion = {"unlocked": "0", "locked": "1", "superlocked": "2"}
-        # dictionnaire permettant de convertir un chiffre entre 0 et 2 pour l'ouverture d'un fichier
-        self.load_state_conversion = {"0": "unlocked", "1": "locked", "2": "superlocked"}
         
-        # liste des cases en conflit, c'est à dire dont au moins une ligne, une colonne ou un carré admet deux valeurs identiques
-        self.conflicting_cells: list[tuple[int, int]] = list()
+        # nombre de cases modifiées par le solveur entre deux mises à jour de la fenêtre, lorsque la résolution n'est pas affichée
+        self.callback_interval = 256
+        
+        # calcul (résolution ou génération) en cours en arrière-plan, None si aucun calcul n'est en cours
+        self.worker: SolvingWorker | None = None
+        # indique si un message doit être affiché à la fin du calcul en cours
+        self.do_show_worker_messagebox = False
+        
+        # relecture de la dernière résolution affichée, None si aucune résolution n'a été enregistrée
+        self.solving_replay: SolvingReplay | None = None
+        # indique si la relecture est en cours
+        self.is_replay_running = False
     
     def reverse_game_mode(self):
         """
@@ -259,14 +270,8 @@ class Sudoku:
         Sauvegarde la grille courante dans l'historique
         """
         
-        # Si l'utilisateur est remonté dans l'historique, effacer les états de la grille qui ont été annulés
-        if self.history_index < len(self.history) - 1:
-            self.history = self.history[:self.history_index + 1]
-        
-        # copie la grille actuelle
-        self.history.append((self.grid.copy(), self.selected_cell))
-        # redefini l'index
-        self.history_index = len(self.history) - 1
+        # enregistre uniquement les cases modifiées depuis l'état courant de l'historique
+        self.history.save(self.selected_cell)
     
     def is_history_move_possible(self, move: str) -> bool:
         """
@@ -278,10 +283,10 @@ class Sudoku:
         test_errors(history_move=move)
         
         if move == "backward":
-            return self.history_index != 0  # boolean
+            return self.history.index != 0  # boolean
         
         elif move == "forward":
-            return self.history_index != len(self.history) - 1  # boolean
+            return self.history.index != self.history.get_length() - 1  # boolean
     
     def move_index_history(self, move: str):
         """
@@ -293,25 +298,16 @@ class Sudoku:
         # Test préconditions
         test_errors(history_move=move)
         
+        history_index = self.history.index
+        
         if move == "backward":
-            self.history_index -= 1
-            
-            if self.history_index < 0:
-                self.history_index = 0
+            history_index = max(history_index - 1, 0)
         
         elif move == "forward":
-            self.history_index += 1
-            
-            if self.history_index >= len(self.history):
-                self.history_index = len(self.history) - 1
+            history_index = min(history_index + 1, self.history.get_length() - 1)
         
-        # remplace la grille actuelle par la grille de l'historique
-        self.grid = self.history[self.history_index][0].copy()
-        self.selected_cell = self.history[self.history_index][1]
-        
-        # effectue la verification des cases en conflit
-        self.verify_grid()
-        self.update_cells_conflicting_state()
+        # applique à la grille actuelle les modifications jusqu'à l'état de l'historique
+        self.selected_cell = self.history.move_to(history_index)
     
     def move_to_history_index(self, index:int):
         """
@@ -320,19 +316,13 @@ class Sudoku:
         """
         
         assert type(index) is int
-        assert -1 <= index < len(self.history)
+        assert -1 <= index < self.history.get_length()
         
         if index == -1:
-            self.history_index = len(self.history) - 1
-        else:
-            self.history_index = index
-        # remplace la grille actuelle par la grille de l'historique
-        self.grid = self.history[self.history_index][0].copy()
-        self.selected_cell = self.history[self.history_index][1]
-
-        # effectue la verification des cases en conflit
-        self.verify_grid()
-        self.update_cells_conflicting_state()
+            index = self.history.get_length() - 1
+        
+        # applique à la grille actuelle les modifications jusqu'à l'état de l'historique
+        self.selected_cell = self.history.move_to(index)
     
     def clear_history(self):
         """
@@ -340,8 +330,9 @@ class Sudoku:
         Fonction utilisée lors du chargement / génération d'une nouvelle grille / ouverture d'une nouvelle grille
         """
         
-        self.history = [(self.grid.copy(), (-1, -1))]
-        self.history_index = 0
+        self.history = History(self.grid, (-1, -1), self.game.history_max_depth)
+        # la dernière résolution ne correspond plus à la grille
+        self.solving_replay = None
     
     def new_empty_grid(self, grid_size: int):
         """
@@ -367,10 +358,10 @@ class Sudoku:
             if do_save:
                 self.save_grid()
         
-        # supprimer l'historique
-        self.clear_history()
         # créé la nouvelle grille
         self.grid = Grid(grid_size)
+        # supprimer l'historique, la nouvelle grille devient son premier état
+        self.clear_history()
         return True
     
     def open_grid(self):
@@ -392,21 +383,8 @@ class Sudoku:
             print("No file selected")
             return
         
-        # Récupère le contenu du fichier sélectionné
-        with open(file_path, "r") as file:
-            file_content = file.read()
-        
-        # Formate le contenu du fichier dans les variables grid_size, all_values et all_states
-        
-        # sépare la partie avec la taille de la grille de la partie avec la valeur de la partie avec les états
-        file_content = file_content.split("\n\n")
-        # récupère la taille de la grille
-        grid_size = int(file_content[0])
-        
-        # récupère les valeurs
-        all_values = [[value for value in line] for line in file_content[1].split("\n")]
-        # récupère les états
-        all_states = [[self.load_state_conversion[state] for state in line] for line in file_content[2].split("\n")]
+        # Récupère la taille de la grille, les valeurs et les états contenus dans le fichier sélectionné
+        grid_size, all_values, all_states = read_sdk_file(file_path)
         
         # Test postconditions
         test_errors(grid_size, list_values=all_values, list_states=all_states)
@@ -418,8 +396,6 @@ class Sudoku:
         
         # indique que le contenu a étét enregistré
         self.is_grid_saved = True
-        # vérifie la validité de la grille
-        self.verify_grid()
         # supprime l'historique
         self.clear_history()
         # défini le mode a "joueur"
@@ -466,178 +442,58 @@ class Sudoku:
         Renvoie True si la grille ne comporte aucune erreurs, et False si elle en comporte au moins une
         """
         
-        # Pour toutes les organisations de grille possibles (en lignes, en colonnes et en carrés)
-        for all_values in [self.grid.get_all_values_as(format) for format in ["lines", "columns", "squares"]]:
-            
-            # Parcourir les sous-listes de cet ensemble de valeurs
-            for sub_all_values in all_values:
-                
-                # Pour toutes les valeurs de case possible
-                for value in self.game.possible_values[:self.grid.size]:
-                    
-                    # Si la valeur apparait plusieur fois dans la sous-liste
-                    if sub_all_values.count(value) > 1:
-                        return False
-        
-        # Si aucun doublon n'a été trouvé, renvoyer True
-        return True
-    
-    def verify_grid(self):
-        """
-        Enregistre dans la variable "self.conflicting_cells" l'ensemble des coordonnées des cases en conflit
-        """
-        
-        tmp_conflicting_cells = list()  # Liste temporaire dans laquelle seront stockées les coordonnées des cases en conflits
-        
-        # Pour tous les formats possibles
-        for format in ["lines", "columns", "squares"]:
-            all_values = self.grid.get_all_values_as(format)
-            all_coordinates = self.grid.get_all_coordinates_as(format)
-            
-            # Parcourir les coordonnées en x possibles
-            for x in range(self.grid.size):
-                
-                # Récupérer les groupes de valeurs et de coordonnées correspondant
-                group_values = all_values[x]
-                groupe_coordinates = all_coordinates[x]
-                
-                # Pour toutes les valeurs possibles
-                for value in self.game.possible_values[:self.grid.size]:
-                    
-                    # Si cette valeur apparait plusieur fois dans le groupe de valeurs
-                    if group_values.count(value) > 1:
-                        
-                        # Enregistrer dans "tmp_conflicting_cells" les coordonnées des cases ayant la valeur doublon
-                        for y in range(self.grid.size):
-                            if group_values[y] == value and not groupe_coordinates[y] in tmp_conflicting_cells:
-                                tmp_conflicting_cells.append(groupe_coordinates[y])
-                    
-                    # Si la valeur n'apparait pas plusieur fois dans le groupe de valeurs
-                    else:
-                        # Supprimer les coordonnées des cases ayant cette valeur de la variable "self.conflicting_cells"
-                        for y in range(self.grid.size):
-                            if group_values[y] == value and groupe_coordinates[y] in self.conflicting_cells:
-                                self.conflicting_cells.remove(groupe_coordinates[y])
-        
-        # Mise en commun de "tmp_conflicting_cells" et de "self.conflicting_cells"
-        for x in range(self.grid.size):
-            for y in range(self.grid.size):
-                
-                if (x, y) in tmp_conflicting_cells and not (x, y) in self.conflicting_cells:
-                    self.conflicting_cells.append((x, y))
-        
-        # met à jour les cases en conflit
-        self.update_cells_conflicting_state()
-    
-    def update_cells_conflicting_state(self):
-        """
-        Met à jour la variable "is_in_conflict" de toutes les cases de la grille
-        """
-        
-        for x in range(self.grid.size):
-            for y in range(self.grid.size):
-                # indique si la case est en conflit
-                is_in_conflict = (x, y) in self.conflicting_cells and self.grid.get_cell_value((x, y)) != "0"
-                self.grid.set_cell_conflicting_state(
-                    (x, y),
-                    is_in_conflict
-                )
+        # les compteurs de valeurs de la grille indiquent directement la présence d'un doublon
+        return self.grid.is_valid()
     
-    def generate_grid(self, frequency_cell_removed: float, do_show_messagebox: bool = True):
+    def generate_grid(self, difficulty: float, do_show_messagebox: bool = True, engine: str = "backtracking") -> bool:
         """
-        Génère une grille de sudoku
-        :param frequency_cell_removed: fréquence / proportion des cases a retirer à chaque boucle ne donnant pas de résultat
+        Prend une grille générée à l'avance si le stock de cette taille et de cette difficulté n'est pas vide,
+        sinon démarre la génération d'une grille de sudoku en arrière-plan, la grille est mise à jour à la fin de la génération
+        Renvoi False si l'action a été annulée
+        :param difficulty: difficulté de la grille, entre 0.3 et 0.7, détermine le nombre de cases retirées
         :param do_show_messagebox: afficher ou non un message à la fin pour indiquer et résumr la génération
-        met à jour self.grid
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
         """
         
         # Test préconditions
-        test_errors(frequency = frequency_cell_removed)
+        test_errors(frequency = difficulty, boolean = do_show_messagebox, engine = engine)
+        
+        # Génère une nouvelle grille vide, ne fait rien si l'action a été annulée
+        if not self.new_empty_grid(self.grid.size):
+            return False
         
         # message console
         print("generating...")
         
-        # mise à jour le titre de la fenêtre
-        self.game.update_title("Génération ...")
+        self.do_show_worker_messagebox = do_show_messagebox
         
-        # indique que la génération est en cours
-        self.game.is_processing = True
+        # grille générée à l'avance, affichée immédiatement
+        values = self.game.puzzle_pool.pop(self.grid.size, difficulty)
         
-        starting_time = time.time()
-        cell_frequency = frequency_cell_removed
-
-        # Génère une nouvelle grille vide, ne fait rien si l'action a été annulée
-        if not self.new_empty_grid(self.grid.size):
-            return False
+        if values is not None:
+            print("Puzzle taken from the pool")
+            states = bytes(self.grid.state_codes["superlocked" if code else "unlocked"] for code in values)
+            self.finish_generation(values.count(0), values, states, 0.0)
+            return True
         
-        # génère une grille complète et valide aléatoirement
-        self.backtracking_solving(False, do_choice_randomly=True)
+        # mise à jour le titre de la fenêtre
+        self.game.update_title("Génération ...")
         
-        if self.game.do_quit:
-            return
+        # génère une grille complète puis retire des cases tant que la solution reste unique
+        self.start_worker(SolvingWorker(
+            "generate", self.grid, engine, self.game.solving_workers, difficulty = difficulty,
+            statistics_log_path = self.game.solver_statistics_log
+        ))
         
-        # Pochoir (test plusieurs configuration jusqu'a en trouver une correct)
-        backup_grid = self.grid.get_all_values()  # copie la grille (sauvegarde)
-        # définir les cases à laisser
-        number_of_cells_to_remove = round((cell_frequency) * self.grid.cells_count)
-        resolved = False
-        # boucle qui attend la résolution de la grille
-        while not resolved:
-            # liste des cases modifiées
-            cells_to_remove_list = list()
-            cell = (0, 0)
-            start = True
-            # balaye sur le nombre de cases à balayer
-            for _ in range(number_of_cells_to_remove):
-                # start est la conditon pour démarrer le while, test si la case est déjà utilisée
-                while self.grid.get_cell_value(cell) == "0" or start:
-                    start = False
-                    # créé une case
-                    cell = (random.randint(0, self.grid.size - 1), random.randint(0, self.grid.size - 1))
-                
-                # place la valeur
-                self.grid.set_cell_value(cell, "0")
-                # met à jour l'affichage et la mise à jour de la fenêtre // empeche le gel de la fenêtre
-                self.game.cell_update(cell, False)
-                # ajoute la case à la liste des cases modifiées
-                cells_to_remove_list.append(cell)
-            
-            # verifie l'existance d'une seule solution
-            solutions_numbers = self.count_possible_solutions(True)
-            if self.game.do_quit:
-                return False
-            
-            # si il y a une seule solution
-            if solutions_numbers == 1:
-                # balaye sur toutes les solutions
-                for cell in self.grid.get_all_coordinates_simple_list():
-                    # si la case est dans la liste des cases moddifiées
-                    if cell in cells_to_remove_list:
-                        # mettre la valeur à 0
-                        self.grid.set_cell_value(cell, "0")
-                        # mettre à jour la fenetre
-                        self.game.cell_update(cell, False)
-                    
-                    else:
-                        # superveroruiller la case
-                        self.grid.set_cell_state(cell, "superlocked")
-                        # mettre à jour la fenetre
-                        self.game.cell_update(cell, False)
-                    # indique que la grille est résolu
-                    resolved = True
-            
-            else:
-                # restaure la grille
-                self.grid.set_content(
-                    backup_grid,
-                    list_states=[['unlocked' for _ in range(self.grid.size)] for _ in range(self.grid.size)]
-                )
-                self.game.update(False)
-                # définir les cases à laisser
-                # augmente de X% le taux de cases laissées (diminue le nombre de boucle nécessaire, accélère la génération)
-                cell_frequency -= 0.05
-                # calcul le nombre de case à supprimer
-                number_of_cells_to_remove = round((cell_frequency) * self.grid.cells_count)
+        return True
+    
+    def finish_generation(self, number_of_cells_to_remove: int, values: bytes, states: bytes, executing_time: float):
+        """
+        Termine la génération : place la grille générée, affiche le résumé et enregistre la grille dans l'historique
+        """
+        
+        # remplace le contenu de la grille par la grille générée
+        self.grid.set_values_codes(values, states)
         
         # defini le mode de jeu à joueur
         self.set_game_mode("playing")
@@ -648,11 +504,8 @@ class Sudoku:
         # met à jour l'affichage
         self.game.graphism.display_game_elements()
         
-        # indique que la génération est finie
-        self.game.is_processing = False
-        
         # calcul temps d'execution - informatif
-        executing_time = round(time.time() - starting_time, 2)
+        executing_time = round(executing_time, 2)
         # nombre de cases / cases restantes
         remaining_cells = self.grid.cells_count - number_of_cells_to_remove
         # pourcentaage de cases restantes
@@ -660,7 +513,7 @@ class Sudoku:
         # affichage console
         print(f"Temps de génération: {executing_time}s - {remaining_cells} cases restantes ({percentage}%)")
         # affichage d'un message indiquant la fin de la génération
-        if do_show_messagebox:
+        if self.do_show_worker_messagebox:
             showinfo(
                 "Génération terminée",
                 f"{' ' * 20}Génération effectué avec succès\n"
@@ -672,16 +525,16 @@ class Sudoku:
         # Sauvegarde de la grille dans l'historique
         self.save_grid_in_history()
     
-    def solve_grid(self, do_display: bool = True):
+    def solve_grid(self, do_display: bool = True, engine: str = "backtracking"):
         """
-        Résout le Sudoku, tient compte des valeurs entrées pas l'utilisateur, seulement les cases présentes originalement
+        Démarre la résolution du Sudoku en arrière-plan, tient compte des valeurs entrées pas l'utilisateur,
+        seulement les cases présentes originalement
+        :param do_display: affiche l'avancement de la résolution dans la grille, et un message à la fin de la résolution
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
         """
         
         # Test préconditions
-        test_errors(boolean = do_display)
-        
-        # enregistrmeent du temps de départ
-        starting_time = time.time()
+        test_errors(boolean = do_display, engine = engine)
         
         # mise à jour du titre
         self.game.update_title("Résolution ...")
@@ -696,19 +549,29 @@ class Sudoku:
         # reset la grille
         self.clear_inputs(False)
         
-        # met à jour les cases contradictoires
-        self.verify_grid()
-        self.update_cells_conflicting_state()
-        
         # indique si le sudoku est resolvable par un message dans la console
         if not self.is_valid():
             print("Invalid input, cannot solve the sudoku")
+            self.game.update_title()
             return
         
-        solving_result = self.backtracking_solving(do_display)
-        processing_time = time.time() - starting_time
+        self.do_show_worker_messagebox = do_display
+        # la recherche n'est jamais ralentie par l'affichage : la grille est affichée au plus 30 fois par seconde,
+        # et les cases modifiées sont enregistrées pour pouvoir rejouer la résolution à vitesse choisie
+        self.start_worker(SolvingWorker(
+            "solve", self.grid, engine, self.game.solving_workers, do_report_values = do_display, do_record_trace = do_display,
+            statistics_log_path = self.game.solver_statistics_log
+        ))
+    
+    def finish_solving(self, solving_result: bool, values: bytes, processing_time: float):
+        """
+        Termine la résolution : place les valeurs trouvées, affiche le résultat et enregistre la grille dans l'historique
+        """
+        
+        # place les valeurs trouvées par la résolution (valeurs de départ si la grille n'a pas de solution)
+        self.grid.set_values_codes(values)
         
-        if solving_result and do_display:
+        if solving_result and self.do_show_worker_messagebox:
             print("Sudoku solved successfully")
             print(f'Solving executing time: {round(processing_time, 2)}s')
             
@@ -718,9 +581,9 @@ class Sudoku:
                 f"Temps d'exécution : {round(processing_time, 2)}s"
             )
         
-        elif do_display:
+        elif self.do_show_worker_messagebox:
             print("Cannot solve the sudoku")
-            print(f'Solving executing time: {round(time.time() - starting_time, 2)}s')
+            print(f'Solving executing time: {round(processing_time, 2)}s')
             
             showinfo(
                 "Résolution échouée",
@@ -733,20 +596,148 @@ class Sudoku:
         # met à jour le titre
         self.game.update_title()
     
-    def solve_generated_grid(self):
+    def start_worker(self, worker: SolvingWorker):
+        """
+        Démarre un calcul en arrière-plan, ses messages sont lus à chaque image par update_worker
+        """
+        
+        self.worker = worker
+        # indique que le calcul est en cours
+        self.game.is_processing = True
+        
+        self.worker.start()
+    
+    def update_worker(self):
+        """
+        Lit les messages du calcul en arrière-plan : affiche l'avancement, et termine la résolution / génération à la fin du calcul
+        """
+        
+        if self.is_replay_running:
+            self.update_replay()
+        
+        if self.worker is None:
+            return
+        
+        for message in self.worker.get_messages():
+            if message[0] == "progress":
+                _, nodes_count, values = message
+                
+                # affiche l'état actuel de la recherche
+                if values is not None:
+                    self.grid.set_values_codes(values)
+                
+                self.game.update_title(f"{'Résolution' if self.worker.task == 'solve' else 'Génération'} ... ({nodes_count} noeuds)")
+            
+            elif message[0] == "error":
+                self.cancel_worker()
+                raise message[1]
+            
+            else:
+                worker = self.worker
+                self.worker = None
+                # indique que le calcul est fini
+                self.game.is_processing = False
+                
+                if worker.task == "solve":
+                    self.finish_solving(*message[1], worker.get_executing_time())
+                    
+                    if worker.trace:
+                        self.solving_replay = SolvingReplay(
+                            self.grid, worker.starting_values, worker.trace, bytes(self.grid.values), self.game.solving_replay_speed
+                        )
+                        print(f"{self.solving_replay.get_length()} cells changed, press Ctrl + R to replay the solving")
+                else:
+                    self.finish_generation(*message[1], worker.get_executing_time())
+                
+                # message console : statistiques du calcul, permet de repérer les grilles coûteuses
+                print(f"Solver statistics: {worker.statistics.to_dict()}")
+                
+                return
+    
+    def cancel_worker(self):
+        """
+        Annule le calcul en arrière-plan ou la relecture s'il y en a un, la grille revient dans son état avant le calcul
+        """
+        
+        if self.is_replay_running:
+            self.stop_replay()
+        
+        if self.worker is None:
+            return
+        
+        self.worker.cancel()
+        self.worker = None
+        # indique que le calcul est fini
+        self.game.is_processing = False
+        
+        # remet la grille dans l'état courant de l'historique (annule les valeurs affichées pendant le calcul)
+        self.move_to_history_index(self.history.index)
+        self.game.update_title()
+        
+        print("Processing cancelled")
+    
+    def replay_solving(self):
+        """
+        Rejoue la dernière résolution affichée à la vitesse "solving_replay_speed", cases modifiées par seconde
+        La relecture n'est possible que si la grille n'a pas été modifiée depuis la résolution
+        """
+        
+        if self.solving_replay is None or self.worker is not None or self.is_replay_running:
+            return
+        
+        # la grille a été modifiée depuis la résolution, la trace ne correspond plus
+        if bytes(self.grid.values) != self.solving_replay.final_values:
+            print("The grid was changed since the last solving, cannot replay it")
+            self.solving_replay = None
+            return
+        
+        self.is_replay_running = True
+        # la relecture bloque les actions de l'utilisateur, comme un calcul
+        self.game.is_processing = True
+        
+        self.solving_replay.start()
+    
+    def update_replay(self):
+        """
+        Avance la relecture jusqu'à l'instant présent, et la termine une fois la trace entièrement rejouée
+        """
+        
+        if self.solving_replay.update():
+            self.stop_replay()
+            return
+        
+        self.game.update_title(f"Relecture ... ({self.solving_replay.position} / {self.solving_replay.get_length()})")
+    
+    def stop_replay(self):
+        """
+        Arrête la relecture, la grille revient dans l'état courant de l'historique
+        """
+        
+        self.is_replay_running = False
+        self.game.is_processing = False
+        
+        self.move_to_history_index(self.history.index)
+        self.game.update_title()
+    
+    def solve_generated_grid(self, engine: str = "backtracking") -> SearchResult:
         """
         Résout le Sudoku, ne tient pas compte des valeurs entrées pas l'utilisateur, seulement les cases présentes originalement
+        Renvoi le résultat de la résolution (voir Solver.run), de statut "unsolvable" si la grille contient des erreurs
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
         """
         
-        # renvois False si la grille contient des erreurs
+        # Test préconditions
+        test_errors(engine = engine)
+        
+        # la grille contient des erreurs : aucune recherche n'est lancée
         if not self.is_valid():
-            return False
+            return SearchResult("solve", False, "", SolverStatistics())
         
         # indique que la résolution est en cours
         self.game.is_processing = True
         
-        # démarre la résolution (méthode récursive)
-        result = self.backtracking_solving(False)
+        # démarre la résolution
+        result = self.engine_solving(False, engine)
         
         # indique que la résolution est finie
         self.game.is_processing = False
@@ -813,236 +804,49 @@ class Sudoku:
             # indiquer qu'une modification a eu lieu depuis le dernier enregistrmeent
             self.is_grid_saved = False
     
-    def put_obvious_solutions(self, do_display: bool = True) -> list[tuple[int, int]]:
+    def get_solver(self, do_display: bool, engine: str = "backtracking") -> Solver:
         """
-        Met dans la grille les chiffres évidentes (les case où il n'y a qu'une valeur possible)
-        Renvoi la liste des coordonnées des cases modifiées
+        Renvoi un cœur de résolution travaillant sur la grille courante, relié à la fenêtre par une fonction de suivi
+        Sans affichage, la recherche est répartie sur plusieurs processus si "solving_workers" est différent de 1
+        :param do_display: affiche chaque case modifiée, sinon la fenêtre n'est mise à jour que tous les "callback_interval" noeuds
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
         """
-
-        # liste des cases modifiées
-        modified_cells = list()
-        # boucle infinie (arrêt par break)
-        while True:
-            # indique l'arret de l'algorithme
-            is_algorithm_finished = True
-
-            # liste des cases à vérifier
-            cells_to_check = self.grid.get_all_empty_cells()
-            
-            # balaye dans les cases à veéifier
-            for cell_coordinates in cells_to_check:
-                # récupère les valeurs possibles la case
-                cell_possible_values = self.grid.get_possible_values(cell_coordinates)
-                # test si lil n'y a qu'une solution
-                if len(cell_possible_values) == 1:
-                    # defini la valeur
-                    self.grid.set_cell_value(cell_coordinates, cell_possible_values[0])
-                    # met à jour l'affichage // anti-gel de la fenêtre
-                    self.game.cell_update(cell_coordinates, do_display=do_display)
-                    # ajoute les coordonnées à la liste des cases modifiées
-                    modified_cells.append(cell_coordinates)
-                    # inidque que l'algorithme n'est pas fini
-                    is_algorithm_finished = False
-            
-            # si l'algorithme est fini, quitte la boucle
-            if is_algorithm_finished:
-                break
         
-        # retourne la lliste des celllules modifiées
-        return modified_cells
+        def progress_callback(coordinates: tuple[int, int]) -> bool:
+            # affiche la valeur // anti freeze de la fenêtre
+            self.game.cell_update(coordinates, do_display)
+            # annule le calcul si l'utilisateur ferme la fenêtre
+            return self.game.do_quit
+        
+        if do_display:
+            return Solver(self.grid, engine, progress_callback, 1)
+        
+        if self.game.solving_workers != 1:
+            return ParallelSolver(self.grid, engine, progress_callback, self.callback_interval, self.game.solving_workers)
+        
+        return Solver(self.grid, engine, progress_callback, self.callback_interval)
     
-    def count_possible_solutions(self, do_stop_sup_1: bool = False) -> int:
+    def count_possible_solutions(self, do_stop_sup_1: bool = False, engine: str = "backtracking") -> SearchResult:
         """
-        Fonction récursive qui compte le nombre de solutions possibles dans le sudoku
-        Renvoi -1 si la fenêtre doit être fermée, et le nombre de solutions possibles dans les autres cas
+        Compte le nombre de solutions possibles dans le sudoku, la grille n'est pas modifiée
+        Renvoi le résultat du comptage (voir Solver.run), de valeur -1 et de statut "unknown" si la fenêtre doit être fermée
         :param: do_stop_sup_1: indique si le programme doit s'arreter si il dépasse 1 (indique rapidement si il y a plus d'une solution)
+        :param engine: moteur de résolution utilisé, "backtracking" ou "dancing_links"
         """
         
         # indique que la fenêtre doit être fermée
         if self.game.do_quit:
-            return -1
-        
-        # nombre de solutions trouvées
-        encountered_solutions = 0
-        
-        # récupère les valeurs possibles de toutes les cases [liste des valeurs possibles, coordonnées]
-        cells_to_fill = [
-            [self.grid.get_possible_values((x, y)), (x, y)]
-            if self.grid.get_cell_state((x, y)) != 'superlocked' and self.grid.get_cell_value((x, y)) == '0'
-            else []
-            for y in range(self.grid.size) for x in range(self.grid.size)
-        ]
-        
-        # supprime tous les éléments [] = cases superlocked ou cases avec déjà des valeurs
-        cells_to_fill = list(filter(lambda x: x != [], cells_to_fill))
-        
-        # si aucune solution n'est trouvée retourne 0, empeche des opération de tri inutiles
-        if len(cells_to_fill) == 0:
-            return 0
-        
-        # tri les cases de la liste en fonction du nombre de valeurs possibles
-        minimum = min([len(element[0]) for element in cells_to_fill])
-        cells_to_fill = list(filter(lambda x: len(x[0]) == minimum, cells_to_fill))
-        
-        # Récupère les coordonnées et valeurs possibles de la cases ayant le moins de valeurs possibles
-        cell_possible_values, cell_coordinates = cells_to_fill[0]
-        
-        # Pour chaque valeur possible de la case en question
-        for value in cell_possible_values:
-            # Mettre la valeur dans la case
-            self.grid.set_cell_value(cell_coordinates, value)
-            # mettre à jour l'affichage // empêche le frezze de la fenêtre
-            self.game.cell_update(cell_coordinates, False)
-            
-            # Si la grille est complète et valide, ajouter 1 au compteur des solutions rencontrées
-            if self.grid.is_full():
-                encountered_solutions += 1
-                # si la limitation à plus d'une réponse est passé en arguments, retourné le nombre de solutions
-                if do_stop_sup_1 and encountered_solutions > 1:
-                    return encountered_solutions
-            
-            else:
-                if do_stop_sup_1 and encountered_solutions > 1:
-                    return encountered_solutions
-                # ajouter le nombre de solutions trouvées par la méthode récursive
-                encountered_solutions += self.count_possible_solutions(do_stop_sup_1)
-                if self.game.do_quit:
-                    # Arrêter le programme
-                    return -1
-                
-                if do_stop_sup_1 and encountered_solutions > 1:
-                    return encountered_solutions
-            
-            # si aucun des tests précedent n'est positif, définir la valeur de la case à zéro
-            self.grid.set_cell_value(cell_coordinates, "0")
-            # mettre à jour l'affichage // anti-gel
-            self.game.cell_update(cell_coordinates, False)
+            return SearchResult("count", -1, "cancelled", SolverStatistics())
         
-        # retourner le nombre de solutions
-        return encountered_solutions
+        with self.get_solver(False, engine) as solver:
+            return solver.run("count", limit = 2 if do_stop_sup_1 else 0)
     
-    def backtracking_solving(
-        self, do_display: bool,
-        do_choice_randomly: bool = False,
-        last_cell_coordinates: tuple[int, int] = None,
-        grid_possibilities: list[list[list, tuple[int, int]]] = None
-    ) -> bool:
+    def engine_solving(self, do_display: bool, engine: str = "backtracking", do_choice_randomly: bool = False) -> SearchResult:
         """
-        Fonction récursive qui résout le Sudoku en testant toutes les possibilités
-        Renvoi True si la grille courante est possible à résoudre, et False si elle ne l'est pas
-        :param do_choice_randomly: choisi les valeurs de mannnière aléatoire parmi les cases ayant le moins de possibilité et les valeurs de manière aléatoire, ne ralenti pas la résolutionn
-        :param last_cell_coordinates: coordonnées de la dernière case modifiée
-        :param grid_possibilities: copie formatée de la grille pour avoir les possibilitées pour chaque case
+        Résout le Sudoku avec le moteur "engine", les valeurs trouvées sont placées dans la grille
+        Renvoi le résultat de la résolution (voir Solver.run), de statut "unknown" si la fenêtre doit être fermée
+        :param do_choice_randomly: choisi les cases et les valeurs de manière aléatoire, permet de générer une grille complète aléatoire
         """
         
-        # Si l'utilisateur ferme la fenêtre
-        if self.game.do_quit:
-            # Arrêter le programme
-            return False
-        
-        if self.grid.is_full():
-            # Si la grille est remplie, renvoyer True si elle est résolue, et False si la résolution n'est pas valide
-            return self.is_valid()
-        
-        # met les valeurs évidentes des cases
-        modified_cells_coordinates = self.put_obvious_solutions(do_display)
-        
-        # test si il s'agit du premier appel de la méthode OU que la grille fait neuf ou moins, si ce n'est pas le cas, utilise une méthode de résolution alternative (trop longue en 9x9
-        if not last_cell_coordinates or self.grid.size <= 9:
-            # récupère les valeurs possibles de toutes les cases [liste des valeurs possibles, coordonnées] si c'est la première itération
-            cells_to_fill = [
-                [self.grid.get_possible_values((x, y)), (x, y)]
-                if self.grid.get_cell_state((x, y)) != 'superlocked' and self.grid.get_cell_value((x, y)) == '0'
-                else []
-                for y in range(self.grid.size) for x in range(self.grid.size)
-            ]
-            # défini grid_possibilities
-            grid_possibilities = cells_to_fill
-        
-        else:
-            # récupère les valeurs possibles de toutes les cases qui sont sur la même ligne, colonne ou carré que la dernière case modifiée et/ou sur la même ligne, colonne, carrée que la dernière case modifiée (last_cell_coordinates)
-            # défini grid_possibilities
-            grid_possibilities = grid_possibilities.copy()
-            # liste des cases en cours de modification/ déjà modifiée par cette fonction
-            coordinates_list: list[tuple[int, int]] = list()
-            # balaye dans la dernière case + les cases modifiées par put_obvious_solutions
-            for actual_coordinates in [last_cell_coordinates] + modified_cells_coordinates:
-                # balaye dans les diférents formats, les lignes, les colonnes et les carrés
-                for format in ["columns", "lines", "squares"]:
-                    # ballaye dans les coordonnées des cases de ces formats
-                    for coordinates in self.grid.get_group_coordinates(actual_coordinates, format):
-                        # test si la coordonnée n'est PAS dans la liste des cases en cours de modification/ déjà modifiée
-                        if coordinates not in coordinates_list:
-                            # ajouter les coordonnées à cette lliste
-                            coordinates_list.append(coordinates)
-                            # récupérer les valeurs possible pour cette case
-                            possible_values = self.grid.get_possible_values(coordinates)
-                            # si la case n'est pas superverrouille et qu'elle est vide
-                            if self.grid.get_cell_state(coordinates) != 'superlocked' and self.grid.get_cell_value(
-                                    coordinates) == '0':
-                                # modifier les valeurs possible pour cette case
-                                grid_possibilities[coordinates[1] * self.grid.size + coordinates[0]] = [possible_values,
-                                                                                                        coordinates]
-                            else:
-                                # si la case est superverrouillé ou qu'elle contient déjà une valeur, aucune valeur n'est possible
-                                grid_possibilities[coordinates[1] * self.grid.size + coordinates[0]] = []
-            
-            # indique que les cases à rmeplir sont désormais les valeurs de grid_possibilities
-            cells_to_fill = grid_possibilities
-        
-        # supprime tous les éléments [] = cases superlocked ou cases avec déjà des valeurs
-        cells_to_fill = list(filter(lambda x: x != [], cells_to_fill))
-        
-        # Si il n'y a pas de case vide
-        if len(cells_to_fill) == 0:
-            # Renvoyer la validité du sudoku obtenu
-            return self.is_valid()
-        
-        # tri les cases de la liste en fonction du nombre de valeurs possibles
-        minimum = min([len(element[0]) for element in cells_to_fill])
-        cells_to_fill = list(filter(lambda x: len(x[0]) == minimum, cells_to_fill))
-        
-        # arrangement des cases aléatoires dans le nombre de solution minimales // n'impacte pas la vitesse de  résolution
-        if do_choice_randomly:
-            random.shuffle(cells_to_fill)
-        
-        # Récupère les coordonnées et valeurs possibles de la cases ayant le moins de valeurs possibles
-        cell_possible_values, cell_coordinates = cells_to_fill[0]
-        
-        # arrangement des valeurs aléatoires dans les valeurs possibles // n'impact pas la vitesse de résolution
-        if do_choice_randomly:
-            random.shuffle(cell_possible_values)
-        
-        # Pour toutes les valeurs possibles de la case
-        for value in cell_possible_values:
-            # Met la valeur de la case à "value"
-            self.grid.set_cell_value(cell_coordinates, value)
-            # indique que la case contient une valeur, et donc qu'il n'y a plus la possibilité de mettre une valeur pour cette case
-            grid_possibilities[cell_coordinates[1] * self.grid.size + cell_coordinates[0]] = []
-            
-            # affiche la valeur // anti freeze de lla fenêtre
-            self.game.cell_update(cell_coordinates, do_display)
-            
-            # s'appelle lui-meme (fonction récursive)
-            # Si la fonction récursive renvoi une réponse positive, alors faire remonter la réponse, cela signifie qu'un des appel d'une fonction inférieure a trouvé une solution
-            if self.backtracking_solving(do_display, last_cell_coordinates=cell_coordinates,
-                                         grid_possibilities=grid_possibilities):
-                return True
-            
-            # Sinon retirer les valeurs mise dans les cases
-            else:
-                if self.game.do_quit:
-                    # Arrêter le programme
-                    return False
-                
-                # remettre à zéro la case modifiée
-                self.grid.set_cell_value(cell_coordinates, '0')
-                # mettre à jour l'affichage // anti-freeze
-                self.game.cell_update(cell_coordinates, do_display)
-        
-        # Enlève toutes les valeurs "évidentes" mises au préalable
-        for coordinates in modified_cells_coordinates:
-            self.grid.set_cell_value(coordinates, '0')
-        
-        # Renvoyer False car cela signifie qu'aucune solution n'a été trouvé
-        return False
+        with self.get_solver(do_display, engine) as solver:
+            return solver.run("solve", do_choice_randomly = do_choice_randomly)
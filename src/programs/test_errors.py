@@ -1,23 +1,69 @@
 # import des libraires
 import os
 
+# niveaux de validation possibles :
+# "none" : aucune vérification
+# "boundaries" : vérifications complètes à l'entrée des méthodes publiques uniquement (valeur par défaut)
+# "debug" : vérifications partout, y compris dans les chemins rapides internes (solveur, génération, affichage)
+all_validation_levels = ["none", "boundaries", "debug"]
+validation_level = "boundaries"
+
+# symboles des valeurs des cases, dans l'ordre des codes (chiffres, lettres majuscules, puis lettres minuscules),
+# une grille de taille "size" utilise les "size" premiers symboles
+all_possible_values = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# tailles possibles pour le sudoku : tous les carrés n² (n >= 2) ayant assez de symboles, de 4x4 à 49x49
+all_sudoku_sizes = [square_size ** 2 for square_size in range(2, int(len(all_possible_values) ** 0.5) + 1)]
+
+
+def set_validation_level(level: str):
+    """
+    Défini le niveau de validation utilisé par test_errors et test_internal_errors
+    """
+    
+    global validation_level
+    
+    assert level in all_validation_levels, \
+        f'The validation level must be "none", "boundaries" or "debug" (value : {level})'
+    
+    validation_level = level
+
+
+def get_validation_level() -> str:
+    """
+    Renvoi le niveau de validation actuel
+    """
+    
+    return validation_level
+
+
+def test_internal_errors(sudoku_size = 0, **arguments):
+    """
+    Vérifications des chemins rapides internes, effectuées uniquement au niveau de validation "debug"
+    """
+    
+    if validation_level == "debug":
+        test_errors(sudoku_size, **arguments)
+
+
 def test_errors(sudoku_size = 0, **arguments):
     """
     Fonction permettant de gérer les erreures potentielles lors de l'exécution du programme
+    Ne vérifie rien si le niveau de validation est "none"
     """
     
-    # tailles possible pour le sudoku
-    possible_sudoku_sizes = [4, 9, 16]
+    if validation_level == "none":
+        return
+    
     # liste des valeurs possibles pour les sudokus (valeurs maximales)
-    possible_values = "123456789ABCDEFG"
+    possible_values = all_possible_values
     # listes de toutes les clés possible pour le fichier de configuration
-    all_config_keys = ["texture_pack", "generation_difficulty", "do_play_music", "do_display_conflicts", "do_display_during_solving"]
-
+    all_config_keys = ["texture_pack", "generation_difficulty", "do_play_music", "do_display_conflicts", "do_display_during_solving", "validation_level", "solving_engine", "solving_workers", "history_max_depth", "solving_replay_speed", "puzzle_pool_depth", "solver_statistics_log"]
+    
     # test taille sudoku
     assert type(sudoku_size) == int, f'The "sudoku_size" argument must be an integer (type : {type(sudoku_size)})'
     if sudoku_size != 0:
-        assert sudoku_size in possible_sudoku_sizes, \
-            f'The "sudoku_size" argument must be 4, 9 or 16 (value : {sudoku_size})'
+        assert sudoku_size in all_sudoku_sizes, \
+            f'The "sudoku_size" argument must be in {all_sudoku_sizes} (value : {sudoku_size})'
     
     # test si argument est un boolean
     if "boolean" in arguments:
@@ -78,7 +124,7 @@ def test_errors(sudoku_size = 0, **arguments):
         
         assert type(frequency) == float, f'The "frequency" argument must be a float (type : {type(frequency)})'
         assert 0 <= frequency <= 1, f'The "frequency" argument must be between 0 and 1 (value : {frequency})'
-
+    
     # test validité direction (gauche, droite, haut ou bas)
     if "direction" in arguments:
         direction = arguments["direction"]
@@ -93,6 +139,13 @@ def test_errors(sudoku_size = 0, **arguments):
         assert type(history_move) == str, f'The "history_move" argument must be a string (type : {type(history_move)})'
         assert history_move in ["forward", "backward"], f'The "history_move" argument must be "forward" or "backward" (value : {history_move})'
     
+    # test validité moteur de résolution (retour sur trace ou liens dansants)
+    if "engine" in arguments:
+        engine = arguments["engine"]
+        
+        assert type(engine) == str, f'The "engine" argument must be a string (type : {type(engine)})'
+        assert engine in ["backtracking", "dancing_links"], f'The "engine" argument must be "backtracking" or "dancing_links" (value : {engine})'
+    
     # test validité mode de jeu (editeur ou joueur)
     if "game_mode" in arguments:
         game_mode = arguments["game_mode"]
@@ -115,9 +168,14 @@ def test_errors(sudoku_size = 0, **arguments):
             assert type(sub_list_values) == list, f'The "list_values" argument must contains lists (value : {list_values})'
             assert len(sub_list_values) == sudoku_size, \
                 f'The "list_values" argument must contains lists with lengths of {sudoku_size} (value : {list_values})'
-            
-            for value in sub_list_values:
-                test_errors(sudoku_size, value=value)
+        
+        # vérification de toutes les valeurs en une seule fois (plutôt qu'un appel récursif par valeur)
+        all_values = {value for sub_list_values in list_values for value in sub_list_values}
+        
+        assert all(type(value) == str for value in all_values), \
+            f'The "list_values" argument must contains strings (value : {list_values})'
+        assert all_values <= set("0" + possible_values[:sudoku_size]), \
+            f'The "list_values" argument must contains values in "possible_values" (values : {all_values - set("0" + possible_values[:sudoku_size])}, possible values : {possible_values[:sudoku_size]})'
     
     # test validité liste états, correpsond à une liste sous format [colonne, colonne, ...] (colonne est une liste d'états)
     # nécessite "sudoku_size"
@@ -134,9 +192,12 @@ def test_errors(sudoku_size = 0, **arguments):
             assert type(sub_list_values) == list, f'The "list_states" argument must contains lists (value : {list_states})'
             assert len(sub_list_values) == sudoku_size, \
                 f'The "list_states" argument must contains lists that have lengths of {sudoku_size} (value : {list_states})'
-            
-            for state in sub_list_values:
-                test_errors(state=state)
+        
+        # vérification de tous les états en une seule fois (plutôt qu'un appel récursif par état)
+        all_states = {state for sub_list_values in list_states for state in sub_list_values}
+        
+        assert all_states <= {"unlocked", "locked", "superlocked"}, \
+            f'The "list_states" argument must contains "unlocked", "locked" or "superlocked" (values : {all_states})'
     
     # test validité liste coordonnées, correpsond à une liste sous format [colonne, colonne, ...] (colonne est une liste de coordonnées)
     # nécessite "sudoku_size"
@@ -156,10 +217,10 @@ def test_errors(sudoku_size = 0, **arguments):
         
         assert type(config_file) == dict, f'The "config_file" argument must be a dict (type : {type(config_file)})'
         
+        # seules les clés présentes sont vérifiées : un ancien fichier ne contient pas les paramètres ajoutés depuis
         for config_key in all_config_keys:
-            assert config_key in config_file, f'The "config_file" argument must contains the "{config_key}" key (value : {config_file})'
-
-            test_errors(config_key=config_key, config_value=config_file[config_key])
+            if config_key in config_file:
+                test_errors(config_key=config_key, config_value=config_file[config_key])
     
     # test validité clé du fichier de configuration
     if "config_key" in arguments:
@@ -167,8 +228,8 @@ def test_errors(sudoku_size = 0, **arguments):
         
         assert type(config_key) == str, f'The "config_key" argument must be a string (type : {type(config_key)})'
         assert config_key in all_config_keys, \
-            f'The "config_key" argument must be "texture_pack", "do_play_music", "do_display_conflicts" or "do_display_during_solvings" (value : {config_key})'
-
+            f'The "config_key" argument must be in {all_config_keys} (value : {config_key})'
+    
     # test validité valeur du fichier de configuration - nécessite "config_key"
     if "config_value" in arguments:
         assert "config_key" in arguments, 'You must pass a value for the "config_key" argument in order to verify "config_value"'
@@ -198,7 +259,42 @@ def test_errors(sudoku_size = 0, **arguments):
             case "do_display_conflicts":
                 assert type(config_value) == bool, \
                     f'The "do_display_conflicts" value of the configuration file must be a boolean (type : {type(config_value)})'
-                
+            
             case "do_display_during_solvings":
                 assert type(config_value) == bool, \
-                    f'The "do_display_during_solvings" value of the configuration file must be a boolean (type : {type(config_value)})'
\ No newline at end of file
+                    f'The "do_display_during_solvings" value of the configuration file must be a boolean (type : {type(config_value)})'
+            
+            case "validation_level":
+                assert config_value in all_validation_levels, \
+                    f'The "validation_level" value of the configuration file must be "none", "boundaries" or "debug" (value : {config_value})'
+            
+            case "solving_engine":
+                test_errors(engine=config_value)
+            
+            case "solving_workers":
+                assert type(config_value) == int, \
+                    f'The "solving_workers" value of the configuration file must be an integer (type : {type(config_value)})'
+                assert config_value >= 0, \
+                    f'The "solving_workers" value of the configuration file must be positive (value : {config_value})'
+            
+            case "history_max_depth":
+                assert type(config_value) == int, \
+                    f'The "history_max_depth" value of the configuration file must be an integer (type : {type(config_value)})'
+                assert config_value >= 1, \
+                    f'The "history_max_depth" value of the configuration file must be strictly positive (value : {config_value})'
+            
+            case "solving_replay_speed":
+                assert type(config_value) == int, \
+                    f'The "solving_replay_speed" value of the configuration file must be an integer (type : {type(config_value)})'
+                assert config_value >= 1, \
+                    f'The "solving_replay_speed" value of the configuration file must be strictly positive (value : {config_value})'
+            
+            case "puzzle_pool_depth":
+                assert type(config_value) == int, \
+                    f'The "puzzle_pool_depth" value of the configuration file must be an integer (type : {type(config_value)})'
+                assert config_value >= 0, \
+                    f'The "puzzle_pool_depth" value of the configuration file must be positive (value : {config_value})'
+            
+            case "solver_statistics_log":
+                assert type(config_value) == str, \
+                    f'The "solver_statistics_log" value of the configuration file must be a string (type : {type(config_value)})'
\ No newline at end of file
@@ -0,0 +1,119 @@
+# import des librairies
+import argparse
+import random
+import sys
+from operator import itemgetter
+
+# nos modules
+from src.programs.grid import Grid
+from src.programs.puzzle_files import iter_puzzles
+
+
+def get_random_lines_order(size: int) -> list[int]:
+    """
+    Renvoi un nouvel ordre aléatoire des lignes (ou des colonnes) d'une grille de taille "size" qui conserve les carrés :
+    les bandes de lignes sont permutées entre elles, et les lignes de chaque bande sont permutées à l'intérieur de la bande
+    """
+    
+    square_size = int(size ** 0.5)
+    all_bands = random.sample(range(square_size), square_size)
+    
+    return [band * square_size + line for band in all_bands for line in random.sample(range(square_size), square_size)]
+
+
+def get_random_transformation(size: int) -> tuple[list[int], bytes]:
+    """
+    Renvoi une transformation aléatoire d'une grille de taille "size" conservant ses solutions :
+    - index de la case d'origine de chaque case de la grille transformée (permutations des lignes dans les bandes,
+      des bandes, des colonnes dans les piles, des piles, et transposition, ce qui inclut les rotations et symétries)
+    - table de conversion des codes des valeurs (renommage des valeurs, 0 = case vide est conservé), pour bytes.translate
+    La grille transformée a le même nombre de solutions et la même difficulté que la grille d'origine
+    """
+    
+    # index de la première case de chaque ligne d'origine, dans le nouvel ordre
+    all_lines_starts = [line * size for line in get_random_lines_order(size)]
+    columns_order = get_random_lines_order(size)
+    
+    if random.random() < 0.5:
+        # transposition : les lignes de la grille transformée sont les colonnes de la grille d'origine
+        all_source_indexes = [line_start + column for column in columns_order for line_start in all_lines_starts]
+    else:
+        all_source_indexes = [line_start + column for line_start in all_lines_starts for column in columns_order]
+    
+    codes_table = bytes([0] + random.sample(range(1, size + 1), size)) + bytes(range(size + 1, 256))
+    
+    return all_source_indexes, codes_table
+
+
+def apply_transformation(codes: bytes, transformation: tuple[list[int], bytes], do_convert_values: bool = True) -> bytes:
+    """
+    Applique une transformation (voir get_random_transformation) aux codes des cases d'une grille
+    :param codes: codes des valeurs (ou des états) des cases
+    :param do_convert_values: renomme les valeurs, à désactiver pour les codes des états qui ne font que suivre leurs cases
+    """
+    
+    all_source_indexes, codes_table = transformation
+    transformed_codes = bytes(itemgetter(*all_source_indexes)(codes))
+    
+    if do_convert_values:
+        return transformed_codes.translate(codes_table)
+    
+    return transformed_codes
+
+
+def get_random_variant(values: bytes, size: int) -> bytes:
+    """
+    Renvoi une grille équivalente à la grille "values" (codes des valeurs), obtenue par une transformation aléatoire
+    """
+    
+    return apply_transformation(values, get_random_transformation(size))
+
+
+def main(all_arguments: list[str] = None):
+    """
+    Point d'entrée en ligne de commande : python -m src.programs.transformations [options] chemins...
+    Écrit des variantes des grilles lues, une grille par ligne, utilisables par exemple par batch_solve
+    """
+    
+    parser = argparse.ArgumentParser(
+        prog="python -m src.programs.transformations",
+        description="Write random equivalent variants of sudoku puzzles, one puzzle per line"
+    )
+    parser.add_argument(
+        "paths", nargs="+",
+        help='.sdk files, one-puzzle-per-line text files, directories (.sdk and .txt files) or "-" for standard input'
+    )
+    parser.add_argument("-n", "--variants", type=int, default=10, help="number of variants per puzzle (default : 10)")
+    parser.add_argument("-s", "--seed", type=int, help="random seed, to write the same variants again")
+    arguments = parser.parse_args(all_arguments)
+    
+    if arguments.seed is not None:
+        random.seed(arguments.seed)
+    
+    invalid_count = 0
+    
+    for name, puzzle, error in iter_puzzles(arguments.paths):
+        if puzzle is None:
+            print(f"{name} : {error}", file=sys.stderr)
+            invalid_count += 1
+            continue
+        
+        grid_size, all_values, all_states = puzzle
+        
+        try:
+            grid = Grid(grid_size)
+            grid.set_content(all_values, all_states)
+        except (AssertionError, KeyError) as error:
+            print(f"{name} : {str(error) or repr(error)}", file=sys.stderr)
+            invalid_count += 1
+            continue
+        
+        for _ in range(arguments.variants):
+            print("".join(grid.symbols[code] for code in get_random_variant(grid.values, grid_size)))
+    
+    # code de sortie non nul si au moins une grille n'a pas pu être lue
+    return 1 if invalid_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
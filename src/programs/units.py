@@ -0,0 +1,116 @@
+# nos modules
+from src.programs.test_errors import test_errors
+
+
+class UnitTables:
+    """
+    La classe "UnitTables" contient les tables (immuables) des groupes et des voisins des cases pour une taille de grille
+    Elles sont calculées une seule fois par taille, puis partagées par la grille, le solveur et l'affichage
+    Les cases sont repérées par leurs coordonnées (x, y) ou par leur index "x * size + y"
+    """
+    
+    def __init__(self, size: int):
+        
+        # Test préconditions
+        test_errors(size)
+        
+        self.size = size
+        self.square_size = int(size ** 0.5)
+        self.cells_count = size ** 2
+        
+        # coordonnées de toutes les cases, rangées par index
+        self.all_coordinates: tuple[tuple[int, int], ...] = tuple(
+            (x, y) for x in range(size) for y in range(size)
+        )
+        
+        # numéro de la ligne, de la colonne et du carré de chaque case, rangés par index
+        self.cell_groups: tuple[tuple[int, int, int], ...] = tuple(
+            (x, y, (x // self.square_size) * self.square_size + y // self.square_size) for x, y in self.all_coordinates
+        )
+        
+        # position (x, y) du carré de chaque case dans la grille des carrés, rangée par index
+        self.square_positions: tuple[tuple[int, int], ...] = tuple(
+            (x // self.square_size, y // self.square_size) for x, y in self.all_coordinates
+        )
+        
+        # coordonnées des cases de chaque groupe, pour chaque format : groups_coordinates[format][groupe][position]
+        self.groups_coordinates: dict[str, tuple[tuple[tuple[int, int], ...], ...]] = {
+            "lines": tuple(
+                tuple((x, y) for y in range(size)) for x in range(size)
+            ),
+            "columns": tuple(
+                tuple((x, y) for x in range(size)) for y in range(size)
+            ),
+            "squares": tuple(
+                tuple(
+                    (
+                        (square // self.square_size) * self.square_size + position // self.square_size,
+                        (square % self.square_size) * self.square_size + position % self.square_size
+                    ) for position in range(size)
+                ) for square in range(size)
+            )
+        }
+        
+        # même table que "groups_coordinates" mais avec les index des cases
+        self.groups_indexes: dict[str, tuple[tuple[int, ...], ...]] = {
+            format: tuple(
+                tuple(x * size + y for x, y in group) for group in groups
+            ) for format, groups in self.groups_coordinates.items()
+        }
+        
+        # index des cases de tous les groupes, numérotés : lignes (0 à size - 1), colonnes (size à 2 * size - 1), puis carrés
+        self.all_units: tuple[tuple[int, ...], ...] = (
+            self.groups_indexes["lines"] + self.groups_indexes["columns"] + self.groups_indexes["squares"]
+        )
+        
+        # numéros dans "all_units" de la ligne, de la colonne et du carré de chaque case, rangés par index
+        self.cell_units: tuple[tuple[int, int, int], ...] = tuple(
+            (line, size + column, 2 * size + square) for line, column, square in self.cell_groups
+        )
+        
+        # coordonnées de chaque case exprimées dans chaque format, (groupe, position dans le groupe), rangées par index
+        self.formated_coordinates: dict[str, tuple[tuple[int, int], ...]] = dict()
+        
+        for format, groups in self.groups_coordinates.items():
+            formated_coordinates = [(0, 0)] * self.cells_count
+            
+            for group_number, group in enumerate(groups):
+                for position, (x, y) in enumerate(group):
+                    formated_coordinates[x * size + y] = (group_number, position)
+            
+            self.formated_coordinates[format] = tuple(formated_coordinates)
+        
+        # index des voisins de chaque case (cases de la même ligne, colonne ou carré, sans la case elle-même)
+        # 3 * (size - 1) - 2 * (square_size - 1) voisins par case : 20 en 9x9, 39 en 16x16
+        self.peers: tuple[tuple[int, ...], ...] = tuple(
+            tuple(sorted(
+                (
+                    set(self.groups_indexes["lines"][line])
+                    | set(self.groups_indexes["columns"][column])
+                    | set(self.groups_indexes["squares"][square])
+                ) - {index}
+            )) for index, (line, column, square) in enumerate(self.cell_groups)
+        )
+        
+        # même table que "peers" mais avec les coordonnées des cases
+        self.peers_coordinates: tuple[tuple[tuple[int, int], ...], ...] = tuple(
+            tuple(self.all_coordinates[peer] for peer in peers) for peers in self.peers
+        )
+
+
+# tables calculées une seule fois pour chaque taille de grille, lors de la première demande
+all_unit_tables: dict[int, UnitTables] = {}
+
+
+def get_unit_tables(size: int) -> UnitTables:
+    """
+    Renvoi les tables des groupes et des voisins pour une grille de taille "size"
+    """
+    
+    # Test préconditions
+    test_errors(size)
+    
+    if size not in all_unit_tables:
+        all_unit_tables[size] = UnitTables(size)
+    
+    return all_unit_tables[size]